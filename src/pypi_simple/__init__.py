@@ -26,6 +26,12 @@ PYPI_SIMPLE_ENDPOINT: str = "https://pypi.org/simple/"
 #: The maximum supported simple repository version (See :pep:`629`)
 SUPPORTED_REPOSITORY_VERSION: str = "1.0"
 
+#: The default size in bytes above which `PyPISimple.download_package()`
+#: downloads a file in multiple segments when ``segments`` is greater than 1
+#:
+#: .. versionadded:: 1.1.0
+SEGMENT_THRESHOLD: int = 64 * 1024 * 1024
+
 #: :mailheader:`Accept` header value for accepting either the HTML or JSON
 #: serialization without a preference
 ACCEPT_ANY: str = ", ".join(
@@ -67,40 +73,76 @@ ACCEPT_HTML_PREFERRED = ", ".join(
     ]
 )
 
+from .async_client import AsyncPyPISimple
+from .cache import CachedPage, DirectoryPageCache, MemoryPageCache, PageCache
 from .classes import DistributionPackage, IndexPage, ProjectPage
 from .client import NoSuchProjectError, PyPISimple
+from .columnar import ColumnarProjectPage
+from .compact import (
+    CompactDistributionPackage,
+    CompactIndexPage,
+    CompactLink,
+    CompactProjectPage,
+)
 from .errors import (
     DigestMismatchError,
+    DownloadTooLargeError,
     NoDigestsError,
+    NoMetadataError,
     UnexpectedRepoVersionWarning,
     UnparsableFilenameError,
     UnsupportedContentTypeError,
     UnsupportedRepoVersionError,
 )
-from .filenames import parse_filename
+from .filenames import ParsedFilenames, parse_filename, parse_filenames
 from .html import Link, RepositoryPage
 from .html_stream import parse_links_stream, parse_links_stream_response
+from .local import FileAdapter
+from .metadata import parse_metadata
+from .mirror import Mirror, SyncReport
 from .progress import ProgressTracker, tqdm_progress_factory
+from .snapshot import IndexSnapshot, SnapshotDiff
 
 __all__ = [
+    "AsyncPyPISimple",
+    "CachedPage",
+    "ColumnarProjectPage",
+    "CompactDistributionPackage",
+    "CompactIndexPage",
+    "CompactLink",
+    "CompactProjectPage",
     "DigestMismatchError",
+    "DirectoryPageCache",
     "DistributionPackage",
+    "DownloadTooLargeError",
+    "FileAdapter",
     "IndexPage",
+    "IndexSnapshot",
     "Link",
+    "MemoryPageCache",
+    "Mirror",
     "NoDigestsError",
+    "NoMetadataError",
     "NoSuchProjectError",
     "PYPI_SIMPLE_ENDPOINT",
+    "PageCache",
+    "ParsedFilenames",
     "ProgressTracker",
     "ProjectPage",
     "PyPISimple",
     "RepositoryPage",
+    "SEGMENT_THRESHOLD",
     "SUPPORTED_REPOSITORY_VERSION",
+    "SnapshotDiff",
+    "SyncReport",
     "UnexpectedRepoVersionWarning",
     "UnparsableFilenameError",
     "UnsupportedContentTypeError",
     "UnsupportedRepoVersionError",
     "parse_filename",
+    "parse_filenames",
     "parse_links_stream",
     "parse_links_stream_response",
+    "parse_metadata",
     "tqdm_progress_factory",
 ]
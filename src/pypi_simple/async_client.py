@@ -0,0 +1,411 @@
+from __future__ import annotations
+from codecs import getincrementaldecoder
+from collections.abc import AsyncIterator, Callable
+import json
+import os
+from pathlib import Path
+import platform
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, AnyStr, Optional
+from mailbits import ContentType
+from packaging.utils import canonicalize_name as normalize
+from . import ACCEPT_ANY, PYPI_SIMPLE_ENDPOINT, __url__, __version__
+from .classes import DistributionPackage, IndexPage, ProjectPage
+from .client import NoSuchProjectError
+from .errors import UnsupportedContentTypeError
+from .html import Link
+from .html_stream import LinkParser, detect_html_encoding
+from .json_stream import ProjectNamesParser
+from .progress import ProgressTracker, null_progress_tracker
+from .util import AbstractDigestChecker, DigestChecker, NullDigestChecker
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncPyPISimple:
+    """
+    .. versionadded:: 1.1.0
+
+    An asynchronous client for fetching package information from a Python
+    simple package repository, built on top of httpx_.  Using this class
+    requires httpx to be installed alongside ``pypi-simple``, which can be done
+    by installing with the ``async`` extra.
+
+    .. _httpx: https://www.python-httpx.org
+
+    The methods of this class mirror those of `PyPISimple`, except that they
+    are coroutines (or, in the case of `stream_project_names()`, an
+    asynchronous generator), and HTTP errors are reported by raising
+    `httpx.HTTPStatusError` instead of `requests.HTTPError`.  Responses are
+    parsed using the same code as `PyPISimple`.
+
+    An `AsyncPyPISimple` instance can be used as an asynchronous context
+    manager that will automatically close its client on exit, regardless of
+    where the client object came from.
+
+    :param str endpoint: The base URL of the simple API instance to query;
+        defaults to the base URL for PyPI's simple API
+
+    :param auth: Optional login/authentication details for the repository;
+        either a ``(username, password)`` pair or another authentication
+        object accepted by httpx
+
+    :param session: Optional `httpx.AsyncClient` object to use instead of
+        creating a fresh one
+
+    :param str accept:
+        The :mailheader:`Accept` header to send in requests in order to specify
+        what serialization format the server should return; defaults to
+        `ACCEPT_ANY`
+
+    :param str parser:
+        Which parser to use for HTML pages fetched with `get_index_page()` and
+        `get_project_page()`, either ``"bs4"`` (the default) or ``"fast"``;
+        see `RepositoryPage.from_html()`
+    """
+
+    def __init__(
+        self,
+        endpoint: str = PYPI_SIMPLE_ENDPOINT,
+        auth: Any = None,
+        session: Optional[httpx.AsyncClient] = None,
+        accept: str = ACCEPT_ANY,
+        parser: str = "bs4",
+    ) -> None:
+        import httpx
+
+        self.endpoint: str = endpoint.rstrip("/") + "/"
+        self.s: httpx.AsyncClient
+        if session is not None:
+            self.s = session
+        else:
+            self.s = httpx.AsyncClient(
+                headers={
+                    "User-Agent": "pypi-simple/{} ({}) httpx/{} {}/{}".format(
+                        __version__,
+                        __url__,
+                        httpx.__version__,
+                        platform.python_implementation(),
+                        platform.python_version(),
+                    )
+                },
+                follow_redirects=True,
+                timeout=None,
+            )
+        if auth is not None:
+            self.s.auth = auth
+        self.accept = accept
+        self.parser = parser
+
+    async def __aenter__(self) -> AsyncPyPISimple:
+        return self
+
+    async def __aexit__(
+        self,
+        _exc_type: Optional[type[BaseException]],
+        _exc_val: Optional[BaseException],
+        _exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying `httpx.AsyncClient`"""
+        await self.s.aclose()
+
+    async def get_index_page(
+        self,
+        timeout: float | tuple[float, float] | None = None,
+        accept: Optional[str] = None,
+        parser: Optional[str] = None,
+    ) -> IndexPage:
+        """
+        Fetches the index/root page from the simple repository and returns an
+        `IndexPage` instance.
+
+        :param timeout: optional timeout for the request, either a single
+            value or a ``(connect, read)`` pair
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[str] parser:
+            Which parser to use if the server returns HTML, either ``"bs4"`` or
+            ``"fast"``; defaults to the value supplied on client instantiation
+        :rtype: IndexPage
+        :raises httpx.HTTPStatusError: if the repository responds with an HTTP
+            error code
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        r = await self.s.get(
+            self.endpoint,
+            timeout=_mktimeout(timeout),
+            headers={"Accept": accept or self.accept},
+        )
+        r.raise_for_status()
+        ct = ContentType.parse(r.headers.get("content-type", "text/html"))
+        if ct.content_type == "application/vnd.pypi.simple.v1+json":
+            page = IndexPage.from_json_data(json.loads(r.content))
+        elif (
+            ct.content_type == "application/vnd.pypi.simple.v1+html"
+            or ct.content_type == "text/html"
+        ):
+            page = IndexPage.from_html(
+                html=r.content,
+                from_encoding=ct.params.get("charset"),
+                parser=parser or self.parser,
+            )
+        else:
+            raise UnsupportedContentTypeError(str(r.url), str(ct))
+        if page.last_serial is None:
+            page.last_serial = r.headers.get("X-PyPI-Last-Serial")
+        return page
+
+    async def stream_project_names(
+        self,
+        chunk_size: int = 65535,
+        timeout: float | tuple[float, float] | None = None,
+        accept: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Returns an asynchronous generator of names of projects available in the
+        repository.  The names are not normalized.
+
+        As with `PyPISimple.stream_project_names()`, the response is parsed in
+        chunks as it is received.
+
+        :param int chunk_size: how many bytes to read from the response at a
+            time
+        :param timeout: optional timeout for the request, either a single
+            value or a ``(connect, read)`` pair
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :rtype: AsyncIterator[str]
+        :raises httpx.HTTPStatusError: if the repository responds with an HTTP
+            error code
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        async with self.s.stream(
+            "GET",
+            self.endpoint,
+            timeout=_mktimeout(timeout),
+            headers={"Accept": accept or self.accept},
+        ) as r:
+            r.raise_for_status()
+            ct = ContentType.parse(r.headers.get("content-type", "text/html"))
+            if ct.content_type == "application/vnd.pypi.simple.v1+json":
+                parser = ProjectNamesParser()
+                decoder = getincrementaldecoder("utf-8-sig")()
+                async for blob in r.aiter_bytes(chunk_size):
+                    for name in parser.feed(decoder.decode(blob)):
+                        yield name
+                for name in parser.feed(decoder.decode(b"", True)) + parser.close():
+                    yield name
+            elif (
+                ct.content_type == "application/vnd.pypi.simple.v1+html"
+                or ct.content_type == "text/html"
+            ):
+                async for link in aparse_links_stream(
+                    r.aiter_bytes(chunk_size),
+                    base_url=str(r.url),
+                    http_charset=ct.params.get("charset"),
+                ):
+                    yield link.text
+            else:
+                raise UnsupportedContentTypeError(str(r.url), str(ct))
+
+    async def get_project_page(
+        self,
+        project: str,
+        timeout: float | tuple[float, float] | None = None,
+        accept: Optional[str] = None,
+        parser: Optional[str] = None,
+    ) -> ProjectPage:
+        """
+        Fetches the page for the given project from the simple repository and
+        returns a `ProjectPage` instance.  Raises `NoSuchProjectError` if the
+        repository responds with a 404.  All other HTTP errors cause an
+        `httpx.HTTPStatusError` to be raised.
+
+        :param str project: The name of the project to fetch information on.
+            The name does not need to be normalized.
+        :param timeout: optional timeout for the request, either a single
+            value or a ``(connect, read)`` pair
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[str] parser:
+            Which parser to use if the server returns HTML, either ``"bs4"`` or
+            ``"fast"``; defaults to the value supplied on client instantiation
+        :rtype: ProjectPage
+        :raises NoSuchProjectError: if the repository responds with a 404 error
+            code
+        :raises httpx.HTTPStatusError: if the repository responds with an HTTP
+            error code other than 404
+        :raises UnsupportedContentTypeError: if the repository responds with an
+            unsupported :mailheader:`Content-Type`
+        :raises UnsupportedRepoVersionError: if the repository version has a
+            greater major component than the supported repository version
+        """
+        url = self.get_project_url(project)
+        r = await self.s.get(
+            url, timeout=_mktimeout(timeout), headers={"Accept": accept or self.accept}
+        )
+        if r.status_code == 404:
+            raise NoSuchProjectError(project, url)
+        r.raise_for_status()
+        ct = ContentType.parse(r.headers.get("content-type", "text/html"))
+        if ct.content_type == "application/vnd.pypi.simple.v1+json":
+            page = ProjectPage.from_json_data(json.loads(r.content), str(r.url))
+        elif (
+            ct.content_type == "application/vnd.pypi.simple.v1+html"
+            or ct.content_type == "text/html"
+        ):
+            page = ProjectPage.from_html(
+                project=project,
+                html=r.content,
+                base_url=str(r.url),
+                from_encoding=ct.params.get("charset"),
+                parser=parser or self.parser,
+            )
+        else:
+            raise UnsupportedContentTypeError(str(r.url), str(ct))
+        if page.last_serial is None:
+            page.last_serial = r.headers.get("X-PyPI-Last-Serial")
+        return page
+
+    def get_project_url(self, project: str) -> str:
+        """
+        Returns the URL for the given project's page in the repository.
+
+        :param str project: The name of the project to build a URL for.  The
+            name does not need to be normalized.
+        :rtype: str
+        """
+        return self.endpoint + normalize(project) + "/"
+
+    async def download_package(
+        self,
+        pkg: DistributionPackage,
+        path: AnyStr | os.PathLike[AnyStr],
+        verify: bool = True,
+        keep_on_error: bool = False,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]] = None,
+        timeout: float | tuple[float, float] | None = None,
+    ) -> None:
+        """
+        Download the given `DistributionPackage` to the given path.  See
+        `PyPISimple.download_package()` for details on the arguments.
+
+        :param DistributionPackage pkg: the distribution package to download
+        :param path:
+            the path at which to save the downloaded file; any parent
+            directories of this path will be created as needed
+        :param bool verify:
+            whether to verify the package's digests against the downloaded file
+        :param bool keep_on_error:
+            whether to keep (true) or delete (false) the downloaded file if an
+            error occurs
+        :param progress: a callable for constructing a progress tracker
+        :param timeout: optional timeout for the request, either a single
+            value or a ``(connect, read)`` pair
+        :type timeout: float | tuple[float,float] | None
+        :raises httpx.HTTPStatusError: if the repository responds with an HTTP
+            error code
+        :raises NoDigestsError:
+            if ``verify`` is true and the given package does not have any
+            digests with known algorithms
+        :raises DigestMismatchError:
+            if ``verify`` is true and the digest of the downloaded file does
+            not match the expected value
+        """
+        target = Path(os.fsdecode(path))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        digester: AbstractDigestChecker
+        if verify:
+            digester = DigestChecker(pkg.digests)
+        else:
+            digester = NullDigestChecker()
+        async with self.s.stream("GET", pkg.url, timeout=_mktimeout(timeout)) as r:
+            r.raise_for_status()
+            try:
+                content_length = int(r.headers["Content-Length"])
+            except (ValueError, KeyError):
+                content_length = None
+            if progress is None:
+                progress = null_progress_tracker()
+            try:
+                with progress(content_length) as p:
+                    with target.open("wb") as fp:
+                        async for chunk in r.aiter_bytes(65535):
+                            fp.write(chunk)
+                            digester.update(chunk)
+                            p.update(len(chunk))
+                digester.finalize()
+            except Exception:
+                if not keep_on_error:
+                    try:
+                        target.unlink()
+                    except FileNotFoundError:
+                        pass
+                raise
+
+
+async def aparse_links_stream(
+    htmlseq: AsyncIterator[bytes],
+    base_url: Optional[str] = None,
+    http_charset: Optional[str] = None,
+    scan_window: int = 1024,
+) -> AsyncIterator[Link]:
+    """
+    Asynchronous counterpart to `parse_links_stream()` for an HTML page given
+    as an asynchronous iterable of `bytes`
+
+    :meta private:
+    """
+    initblob = b""
+    async for blob in htmlseq:
+        initblob += blob
+        if len(initblob) >= scan_window:
+            break
+    initblob, enc = detect_html_encoding(initblob, http_charset)
+    decoder = getincrementaldecoder(enc)(errors="replace")
+    parser = LinkParser(base_url=base_url)
+    parser.feed(decoder.decode(initblob))
+    for link in parser.fetch_links():
+        yield link
+    async for blob in htmlseq:
+        parser.feed(decoder.decode(blob))
+        for link in parser.fetch_links():
+            yield link
+    parser.feed(decoder.decode(b"", True))
+    parser.close()
+    for link in parser.fetch_links():
+        yield link
+
+
+def _mktimeout(timeout: float | tuple[float, float] | None) -> Any:
+    # Convert a requests-style timeout into an httpx-style timeout; no timeout
+    # means the client's own default, so that a timeout configured on a
+    # user-supplied `httpx.AsyncClient` is not overridden
+    import httpx
+
+    if timeout is None:
+        return httpx.USE_CLIENT_DEFAULT
+    elif isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    else:
+        return timeout
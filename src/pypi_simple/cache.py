@@ -0,0 +1,314 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import re
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, AnyStr, Optional
+from .classes import DistributionPackage, IndexPage, ProjectPage
+
+if sys.version_info[:2] >= (3, 8):
+    from typing import Protocol, runtime_checkable
+else:
+    from typing_extensions import Protocol, runtime_checkable
+
+#: The key under which the repository's index page is cached.  Project pages
+#: are cached under their normalized project names, which can never be equal
+#: to this value.
+INDEX_KEY = ":index:"
+
+
+@dataclass
+class CachedPage:
+    """
+    .. versionadded:: 1.1.0
+
+    A parsed page stored in a page cache along with the HTTP validators
+    returned by the server when the page was fetched
+    """
+
+    #: The parsed page
+    page: IndexPage | ProjectPage
+
+    #: The value of the :mailheader:`ETag` response header, if any
+    etag: Optional[str]
+
+    #: The value of the :mailheader:`Last-Modified` response header, if any
+    last_modified: Optional[str]
+
+    #: The URL from which the page was requested.  `PyPISimple` ignores
+    #: cached entries whose URL differs from that of the page being fetched,
+    #: so that clients for different repositories can safely share a cache.
+    url: Optional[str] = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        Return the headers to send in order to revalidate the cached page
+        with a conditional request
+
+        :rtype: dict[str, str]
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@runtime_checkable
+class PageCache(Protocol):
+    """
+    .. versionadded:: 1.1.0
+
+    A `typing.Protocol` for page caches that can be passed as the
+    ``page_cache`` argument to `PyPISimple`.  A page cache maps keys to
+    `CachedPage` instances.  Project pages are stored under the normalized
+    names of their projects, and the index page is stored under a special key
+    that is never equal to a normalized project name.
+
+    Keys do not identify the repository that a page came from; instead, each
+    `CachedPage` records the URL from which it was requested, and `PyPISimple`
+    only uses entries whose URL matches the page it is fetching.  A cache
+    shared by clients for different repositories therefore holds only the
+    most recently stored repository's copy of each page, so it is more
+    efficient to give each repository its own cache.
+    """
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """
+        Return the page cached under ``key``, or `None` if there is no such
+        page
+        """
+        ...
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        """Store ``entry`` in the cache under ``key``"""
+        ...
+
+
+class MemoryPageCache:
+    """
+    .. versionadded:: 1.1.0
+
+    An in-memory implementation of `PageCache`.  It is safe to use from
+    multiple threads at once.
+
+    :param Optional[int] maxsize: the maximum number of pages to keep; when
+        the cache is full, the least recently used page is discarded.  If
+        `None` (the default), the cache is unbounded.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.data: OrderedDict[str, CachedPage] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """
+        Return the page cached under ``key``, or `None` if there is no such
+        page
+
+        :param str key: the cache key to look up
+        :rtype: Optional[CachedPage]
+        """
+        with self.lock:
+            try:
+                entry = self.data[key]
+            except KeyError:
+                return None
+            self.data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        """
+        Store ``entry`` in the cache under ``key``, replacing any previous
+        entry
+
+        :param str key: the cache key to store the page under
+        :param CachedPage entry: the page & validators to store
+        """
+        with self.lock:
+            self.data[key] = entry
+            self.data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self.data) > self.maxsize:
+                    self.data.popitem(last=False)
+
+
+class DirectoryPageCache:
+    """
+    .. versionadded:: 1.1.0
+
+    An implementation of `PageCache` that stores pages as files in a
+    directory so that they persist across processes.  Each project page is
+    stored in a file named after its normalized project name inside the
+    :file:`projects/` subdirectory, and the index page is stored in
+    :file:`index.json`.  Entries are written atomically, so a single
+    directory can be shared by multiple concurrent processes.
+
+    The first line of each file is a small JSON header recording the page's
+    `~ProjectPage.last_serial`, HTTP validators, and source URL; the serial can be read
+    without loading the rest of the entry via `get_last_serial()`.
+
+    Entries that were last stored more than ``max_age`` seconds ago are treated
+    as missing by `get()`.  Entries are only evicted in order to keep the
+    cache's total size under ``max_size`` bytes when `prune()` is called, which
+    should be done periodically.
+
+    :param path: the directory in which to store pages; it will be created if
+        it does not already exist
+    :param Optional[int] max_size: the maximum total size in bytes of the
+        cached entries, enforced by `prune()`
+    :param Optional[float] max_age: the maximum age in seconds of cached
+        entries
+    """
+
+    def __init__(
+        self,
+        path: AnyStr | os.PathLike[AnyStr],
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        #: The directory in which pages are stored
+        self.path = Path(os.fsdecode(path))
+        self.max_size = max_size
+        self.max_age = max_age
+        (self.path / "projects").mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """
+        Return the page cached under ``key``, or `None` if there is no such
+        page or it is older than ``max_age``
+
+        :param str key: the cache key to look up
+        :rtype: Optional[CachedPage]
+        """
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return None
+        try:
+            if self._expired(entry_path.stat().st_mtime):
+                entry_path.unlink()
+                return None
+            with entry_path.open("r", encoding="utf-8") as fp:
+                header = json.loads(fp.readline())
+                page = _load_page(header["type"], json.loads(fp.readline()))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # Corrupt or incompatible entry
+            return None
+        return CachedPage(
+            page=page,
+            etag=header["etag"],
+            last_modified=header["last_modified"],
+            url=header.get("url"),
+        )
+
+    def get_last_serial(self, key: str) -> Optional[str]:
+        """
+        Return the `~ProjectPage.last_serial` of the page cached under ``key``
+        without loading the page itself.  Returns `None` if there is no such
+        page or if the page does not have a serial.
+
+        :param str key: the cache key to look up
+        :rtype: Optional[str]
+        """
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return None
+        try:
+            with entry_path.open("r", encoding="utf-8") as fp:
+                serial = json.loads(fp.readline())["last_serial"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            return None
+        assert serial is None or isinstance(serial, str)
+        return serial
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        """
+        Store ``entry`` in the cache under ``key``, replacing any previous
+        entry.  If ``key`` is not a valid normalized project name (or the
+        index key), nothing is stored.
+
+        :param str key: the cache key to store the page under
+        :param CachedPage entry: the page & validators to store
+        """
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return
+        header = {
+            "type": "index" if isinstance(entry.page, IndexPage) else "project",
+            "last_serial": entry.page.last_serial,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "url": entry.url,
+        }
+        fd, tmpname = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as fp:
+                print(json.dumps(header), file=fp)
+                print(json.dumps(asdict(entry.page)), file=fp)
+            os.replace(tmpname, entry_path)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+    def prune(self) -> None:
+        """
+        Delete all entries older than ``max_age`` and then, if the total size
+        of the remaining entries exceeds ``max_size``, delete the least
+        recently stored entries until it does not
+        """
+        entries: list[tuple[float, int, Path]] = []
+        for p in [self.path / "index.json", *(self.path / "projects").glob("*.json")]:
+            try:
+                st = p.stat()
+                if self._expired(st.st_mtime):
+                    p.unlink()
+                else:
+                    entries.append((st.st_mtime, st.st_size, p))
+            except FileNotFoundError:
+                pass
+        if self.max_size is not None:
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, p in entries:
+                if total <= self.max_size:
+                    break
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def _entry_path(self, key: str) -> Optional[Path]:
+        # Returns `None` for keys that cannot safely be used as filenames,
+        # which are then never cached
+        if key == INDEX_KEY:
+            return self.path / "index.json"
+        elif re.fullmatch(r"[A-Za-z0-9][-A-Za-z0-9._]*", key):
+            return self.path / "projects" / (key + ".json")
+        else:
+            return None
+
+    def _expired(self, mtime: float) -> bool:
+        return self.max_age is not None and time.time() - mtime > self.max_age
+
+
+def _load_page(page_type: str, data: Any) -> IndexPage | ProjectPage:
+    if page_type == "index":
+        return IndexPage(**data)
+    elif page_type == "project":
+        packages = [DistributionPackage(**pkg) for pkg in data.pop("packages")]
+        return ProjectPage(packages=packages, **data)
+    else:
+        raise ValueError(f"Unknown page type: {page_type!r}")
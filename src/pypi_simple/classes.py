@@ -1,16 +1,31 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from enum import Enum
 import re
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 from urllib.parse import urlparse, urlunparse
 from mailbits import ContentType
 import requests
 from .errors import UnparsableFilenameError, UnsupportedContentTypeError
 from .filenames import parse_filename
 from .html import Link, RepositoryPage
-from .pep691 import File, Project, ProjectList
+from .pep691 import (
+    File,
+    Project,
+    ProjectList,
+    require,
+    validate_dict,
+    validate_list,
+    validate_meta,
+    validate_optional_str,
+    validate_str,
+    validate_str_dict,
+)
 from .util import basejoin, check_repo_version
 
+if TYPE_CHECKING:
+    from .columnar import ColumnarProjectPage
+
 
 @dataclass
 class DistributionPackage:
@@ -21,6 +36,12 @@ class DistributionPackage:
     .. versionchanged:: 1.0.0
 
         ``yanked`` field replaced with `is_yanked` and `yanked_reason`
+
+    .. versionchanged:: 1.1.0
+
+        When a `DistributionPackage` is constructed by one of the ``from_*()``
+        classmethods, the filename is not parsed until one of `project`,
+        `version`, or `package_type` is first accessed
     """
 
     #: The basename of the package file
@@ -81,6 +102,28 @@ class DistributionPackage:
     #: otherwise, it is `None`
     metadata_digests: Optional[dict[str, str]] = None
 
+    # The hint to pass to `parse_filename()` once the filename fields are
+    # accessed.  This is shadowed by an instance attribute (never removed, so
+    # that concurrent first accesses all parse with the same hint) rather than
+    # being a dataclass field.
+    _project_hint: ClassVar[Optional[str]] = None
+
+    def _with_project_hint(self, project_hint: Optional[str]) -> DistributionPackage:
+        self.__dict__["_project_hint"] = project_hint
+        return self
+
+    def _parse_filename(self) -> None:
+        parsed: tuple[Optional[str], Optional[str], Optional[str]]
+        try:
+            parsed = parse_filename(self.filename, self._project_hint)
+        except UnparsableFilenameError:
+            parsed = (None, None, None)
+        # Parsing is deterministic, so if multiple threads get here at once,
+        # they all store the same values.
+        for name, value in zip(FILENAME_FIELDS, parsed):
+            if self.__dict__[name] is UNPARSED:
+                self.__dict__[name] = value
+
     @property
     def sig_url(self) -> str:
         """
@@ -112,12 +155,6 @@ class DistributionPackage:
             link was found).  The name does not need to be normalized.
         :rtype: DistributionPackage
         """
-        try:
-            project, version, pkg_type = parse_filename(link.text, project_hint)
-        except UnparsableFilenameError:
-            project = None
-            version = None
-            pkg_type = None
         urlbits = urlparse(link.url)
         dgst_name, _, dgst_value = urlbits.fragment.partition("=")
         digests = {dgst_name: dgst_value} if dgst_value else {}
@@ -143,15 +180,15 @@ class DistributionPackage:
             url=url,
             has_sig=has_sig,
             requires_python=link.get_str_attrib("data-requires-python"),
-            project=project,
-            version=version,
-            package_type=pkg_type,
+            project=UNPARSED,
+            version=UNPARSED,
+            package_type=UNPARSED,
             is_yanked=yanked_reason is not None,
             yanked_reason=yanked_reason,
             digests=digests,
             metadata_digests=metadata_digests,
             has_metadata=metadata_digests is not None,
-        )
+        )._with_project_hint(project_hint)
 
     @classmethod
     def from_json_data(
@@ -159,21 +196,90 @@ class DistributionPackage:
         data: Any,
         project_hint: Optional[str] = None,
         base_url: Optional[str] = None,
+        use_pydantic: bool = False,
     ) -> DistributionPackage:
         """
         Construct a `DistributionPackage` from an object taken from the
         ``"files"`` field of a :pep:`691` project detail JSON response.
 
+        .. versionchanged:: 1.1.0
+
+            ``data`` is now validated without pydantic by default;
+            ``use_pydantic`` parameter added
+
         :param data: a file dictionary
         :param Optional[str] project_hint: Optionally, the expected value for
             the project name (usually the name of the project page on which the
             link was found).  The name does not need to be normalized.
         :param Optional[str] base_url: an optional URL to join to the front of
             a relative file URL (usually the URL of the page being parsed)
+        :param bool use_pydantic: If true, validate ``data`` with the pydantic
+            models used by previous versions of this library.  The same inputs
+            are accepted either way, but pydantic's errors are more detailed.
         :rtype: DistributionPackage
-        :raises ValueError: if ``data`` is not a `dict`
+        :raises ValueError: if ``data`` is not a valid file dictionary
         """
-        return cls.from_file(File.parse_obj(data), project_hint, base_url)
+        if use_pydantic:
+            return cls.from_file(File.parse_obj(data), project_hint, base_url)
+        else:
+            return cls._from_json_fast(data, project_hint, base_url)
+
+    @classmethod
+    def _from_json_fast(
+        cls,
+        data: Any,
+        project_hint: Optional[str] = None,
+        base_url: Optional[str] = None,
+        loc: str = "file",
+    ) -> DistributionPackage:
+        # Equivalent to `from_file(File.parse_obj(data), ...)` without
+        # constructing a pydantic model for every file
+        obj = validate_dict(data, loc)
+        try:
+            filename = validate_str(require(obj, "filename"), "filename")
+            url = validate_str(require(obj, "url"), "url")
+            hashes = validate_str_dict(require(obj, "hashes"), "hashes")
+            requires_python = validate_optional_str(
+                obj.get("requires-python"), "requires-python"
+            )
+            dist_info_metadata = obj.get("dist-info-metadata")
+            metadata_digests: Optional[dict[str, str]]
+            if dist_info_metadata is None or dist_info_metadata is False:
+                metadata_digests = None
+            elif dist_info_metadata is True:
+                metadata_digests = {}
+            else:
+                metadata_digests = validate_str_dict(
+                    dist_info_metadata, "dist-info-metadata"
+                )
+            gpg_sig = obj.get("gpg-sig")
+            if gpg_sig is not None and not isinstance(gpg_sig, bool):
+                raise ValueError("gpg-sig: value is not a valid boolean")
+            yanked = obj.get("yanked", False)
+            yanked_reason: Optional[str]
+            if isinstance(yanked, bool):
+                yanked_reason = None
+            else:
+                yanked_reason = validate_str(yanked, "yanked")
+                yanked = True
+        except ValueError as e:
+            raise ValueError(f"{loc}.{e}") from None
+        return cls(
+            filename=filename,
+            url=basejoin(base_url, url),
+            has_sig=gpg_sig,
+            requires_python=requires_python,
+            project=UNPARSED,
+            version=UNPARSED,
+            package_type=UNPARSED,
+            is_yanked=yanked,
+            yanked_reason=yanked_reason,
+            digests=hashes,
+            metadata_digests=metadata_digests,
+            has_metadata=(
+                None if dist_info_metadata is None else metadata_digests is not None
+            ),
+        )._with_project_hint(project_hint)
 
     @classmethod
     def from_file(
@@ -183,26 +289,61 @@ class DistributionPackage:
         base_url: Optional[str] = None,
     ) -> DistributionPackage:
         """:meta private:"""
-        try:
-            project, version, pkg_type = parse_filename(file.filename, project_hint)
-        except UnparsableFilenameError:
-            project = None
-            version = None
-            pkg_type = None
         return cls(
             filename=file.filename,
             url=basejoin(base_url, file.url),
             has_sig=file.gpg_sig,
             requires_python=file.requires_python,
-            project=project,
-            version=version,
-            package_type=pkg_type,
+            project=UNPARSED,
+            version=UNPARSED,
+            package_type=UNPARSED,
             is_yanked=file.is_yanked,
             yanked_reason=file.yanked_reason,
             digests=file.hashes,
             metadata_digests=file.metadata_digests,
             has_metadata=file.has_metadata,
-        )
+        )._with_project_hint(project_hint)
+
+
+class Unparsed(Enum):
+    UNPARSED = "UNPARSED"
+
+
+#: Placeholder value for the `DistributionPackage` fields that are derived
+#: from the filename, indicating that the filename has not been parsed yet
+UNPARSED: Any = Unparsed.UNPARSED
+
+FILENAME_FIELDS = ("project", "version", "package_type")
+
+
+class LazyFilenameField:
+    """
+    Data descriptor for the `DistributionPackage` fields that are derived from
+    the filename.  The values are stored in the instance ``__dict__`` under the
+    fields' names; if a value is `UNPARSED`, the filename is parsed when the
+    field is first read.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            # Raising AttributeError here keeps `dataclass` from treating the
+            # descriptor as a default value.
+            raise AttributeError(self.name)
+        value = obj.__dict__[self.name]
+        if value is UNPARSED:
+            obj._parse_filename()
+            value = obj.__dict__[self.name]
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.name] = value
+
+
+for fieldname in FILENAME_FIELDS:
+    setattr(DistributionPackage, fieldname, LazyFilenameField(fieldname))
 
 
 @dataclass
@@ -223,6 +364,20 @@ class ProjectPage:
     #: returned when fetching the page, or `None` if not specified
     last_serial: Optional[str]
 
+    def to_columns(self, use_numpy: Optional[bool] = None) -> ColumnarProjectPage:
+        """
+        .. versionadded:: 1.1.0
+
+        Convert the page to a `ColumnarProjectPage` for fast filtering
+
+        :param Optional[bool] use_numpy: whether to store the columns as
+            NumPy arrays; the default is to do so if NumPy is installed
+        :rtype: ColumnarProjectPage
+        """
+        from .columnar import ColumnarProjectPage
+
+        return ColumnarProjectPage.from_page(self, use_numpy=use_numpy)
+
     @classmethod
     def from_html(
         cls,
@@ -230,6 +385,7 @@ class ProjectPage:
         html: str | bytes,
         base_url: Optional[str] = None,
         from_encoding: Optional[str] = None,
+        parser: str = "bs4",
     ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
@@ -237,6 +393,10 @@ class ProjectPage:
         Parse an HTML project page from a simple repository into a
         `ProjectPage`.  Note that the `last_serial` attribute will be `None`.
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param str project: The name of the project whose page is being parsed
         :param html: the HTML to parse
         :type html: str or bytes
@@ -247,12 +407,14 @@ class ProjectPage:
             an optional hint to Beautiful Soup as to the encoding of ``html``
             when it is `bytes` (usually the ``charset`` parameter of the
             response's :mailheader:`Content-Type` header)
+        :param str parser: which HTML parser to use, either ``"bs4"`` (the
+            default) or ``"fast"``; see `RepositoryPage.from_html()`
         :rtype: ProjectPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
         """
-        page = RepositoryPage.from_html(html, base_url, from_encoding)
+        page = RepositoryPage.from_html(html, base_url, from_encoding, parser)
         return cls(
             project=project,
             packages=[
@@ -263,7 +425,9 @@ class ProjectPage:
         )
 
     @classmethod
-    def from_json_data(cls, data: Any, base_url: Optional[str] = None) -> ProjectPage:
+    def from_json_data(
+        cls, data: Any, base_url: Optional[str] = None, use_pydantic: bool = False
+    ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
 
@@ -272,30 +436,57 @@ class ProjectPage:
         :pep:`691`) into a `ProjectPage`.  The `last_serial` attribute will be
         set to the value of the ``.meta._last-serial`` field, if any.
 
+        .. versionchanged:: 1.1.0
+
+            ``data`` is now validated without pydantic by default, which is
+            considerably faster for projects with many files;
+            ``use_pydantic`` parameter added
+
         :param data: The decoded body of the JSON response
         :param Optional[str] base_url:
             an optional URL to join to the front of any relative file URLs
             (usually the URL of the page being parsed)
+        :param bool use_pydantic: If true, validate ``data`` with the pydantic
+            models used by previous versions of this library.  The same inputs
+            are accepted either way, but pydantic's errors are more detailed.
         :rtype: ProjectPage
-        :raises ValueError: if ``data`` is not a `dict`
+        :raises ValueError: if ``data`` is not a valid project detail response
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
         """
-        project = Project.parse_obj(data)
-        check_repo_version(project.meta.api_version)
+        if use_pydantic:
+            project = Project.parse_obj(data)
+            check_repo_version(project.meta.api_version)
+            return ProjectPage(
+                project=project.name,
+                packages=[
+                    DistributionPackage.from_file(f, project.name, base_url)
+                    for f in project.files
+                ],
+                repository_version=project.meta.api_version,
+                last_serial=project.meta.last_serial,
+            )
+        obj = validate_dict(data, "project")
+        name = validate_str(require(obj, "name"), "name")
+        files = validate_list(require(obj, "files"), "files")
+        api_version, last_serial = validate_meta(require(obj, "meta"))
+        packages = [
+            DistributionPackage._from_json_fast(f, name, base_url, f"files.{i}")
+            for i, f in enumerate(files)
+        ]
+        check_repo_version(api_version)
         return ProjectPage(
-            project=project.name,
-            packages=[
-                DistributionPackage.from_file(f, project.name, base_url)
-                for f in project.files
-            ],
-            repository_version=project.meta.api_version,
-            last_serial=project.meta.last_serial,
+            project=name,
+            packages=packages,
+            repository_version=api_version,
+            last_serial=last_serial,
         )
 
     @classmethod
-    def from_response(cls, r: requests.Response, project: str) -> ProjectPage:
+    def from_response(
+        cls, r: requests.Response, project: str, parser: str = "bs4"
+    ) -> ProjectPage:
         """
         .. versionadded:: 1.0.0
 
@@ -303,8 +494,15 @@ class ProjectPage:
         (non-streaming) request to a simple repository, and return a
         `ProjectPage`.
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param requests.Response r: the response object to parse
         :param str project: the name of the project whose page is being parsed
+        :param str parser: which HTML parser to use for HTML responses, either
+            ``"bs4"`` (the default) or ``"fast"``; see
+            `RepositoryPage.from_html()`
         :rtype: ProjectPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
@@ -324,6 +522,7 @@ class ProjectPage:
                 html=r.content,
                 base_url=r.url,
                 from_encoding=ct.params.get("charset"),
+                parser=parser,
             )
         else:
             raise UnsupportedContentTypeError(r.url, str(ct))
@@ -348,7 +547,10 @@ class IndexPage:
 
     @classmethod
     def from_html(
-        cls, html: str | bytes, from_encoding: Optional[str] = None
+        cls,
+        html: str | bytes,
+        from_encoding: Optional[str] = None,
+        parser: str = "bs4",
     ) -> IndexPage:
         """
         .. versionadded:: 1.0.0
@@ -356,18 +558,26 @@ class IndexPage:
         Parse an HTML index/root page from a simple repository into an
         `IndexPage`.  Note that the `last_serial` attribute will be `None`.
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param html: the HTML to parse
         :type html: str or bytes
         :param Optional[str] from_encoding:
             an optional hint to Beautiful Soup as to the encoding of ``html``
             when it is `bytes` (usually the ``charset`` parameter of the
             response's :mailheader:`Content-Type` header)
+        :param str parser: which HTML parser to use, either ``"bs4"`` (the
+            default) or ``"fast"``; see `RepositoryPage.from_html()`
         :rtype: IndexPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
         """
-        page = RepositoryPage.from_html(html, from_encoding=from_encoding)
+        page = RepositoryPage.from_html(
+            html, from_encoding=from_encoding, parser=parser
+        )
         return cls(
             projects=[link.text for link in page.links],
             repository_version=page.repository_version,
@@ -375,7 +585,7 @@ class IndexPage:
         )
 
     @classmethod
-    def from_json_data(cls, data: Any) -> IndexPage:
+    def from_json_data(cls, data: Any, use_pydantic: bool = False) -> IndexPage:
         """
         .. versionadded:: 1.0.0
 
@@ -384,23 +594,48 @@ class IndexPage:
         :pep:`691`) into an `IndexPage`.  The `last_serial` attribute will be
         set to the value of the ``.meta._last-serial`` field, if any.
 
+        .. versionchanged:: 1.1.0
+
+            ``data`` is now validated without pydantic by default;
+            ``use_pydantic`` parameter added
+
         :param data: The decoded body of the JSON response
+        :param bool use_pydantic: If true, validate ``data`` with the pydantic
+            models used by previous versions of this library.  The same inputs
+            are accepted either way, but pydantic's errors are more detailed.
         :rtype: IndexPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
             supported repository version
-        :raises ValueError: if ``data`` is not a `dict`
+        :raises ValueError: if ``data`` is not a valid project list response
         """
-        plist = ProjectList.parse_obj(data)
-        check_repo_version(plist.meta.api_version)
+        if use_pydantic:
+            plist = ProjectList.parse_obj(data)
+            check_repo_version(plist.meta.api_version)
+            return IndexPage(
+                projects=[p.name for p in plist.projects],
+                repository_version=plist.meta.api_version,
+                last_serial=plist.meta.last_serial,
+            )
+        obj = validate_dict(data, "project list")
+        projects = validate_list(require(obj, "projects"), "projects")
+        api_version, last_serial = validate_meta(require(obj, "meta"))
+        names: list[str] = []
+        for i, p in enumerate(projects):
+            item = validate_dict(p, f"projects.{i}")
+            try:
+                names.append(validate_str(require(item, "name"), "name"))
+            except ValueError as e:
+                raise ValueError(f"projects.{i}.{e}") from None
+        check_repo_version(api_version)
         return IndexPage(
-            projects=[p.name for p in plist.projects],
-            repository_version=plist.meta.api_version,
-            last_serial=plist.meta.last_serial,
+            projects=names,
+            repository_version=api_version,
+            last_serial=last_serial,
         )
 
     @classmethod
-    def from_response(cls, r: requests.Response) -> IndexPage:
+    def from_response(cls, r: requests.Response, parser: str = "bs4") -> IndexPage:
         """
         .. versionadded:: 1.0.0
 
@@ -408,7 +643,14 @@ class IndexPage:
         (non-streaming) request to a simple repository, and return an
         `IndexPage`.
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param requests.Response r: the response object to parse
+        :param str parser: which HTML parser to use for HTML responses, either
+            ``"bs4"`` (the default) or ``"fast"``; see
+            `RepositoryPage.from_html()`
         :rtype: IndexPage
         :raises UnsupportedRepoVersionError:
             if the repository version has a greater major component than the
@@ -423,7 +665,9 @@ class IndexPage:
             ct.content_type == "application/vnd.pypi.simple.v1+html"
             or ct.content_type == "text/html"
         ):
-            page = cls.from_html(html=r.content, from_encoding=ct.params.get("charset"))
+            page = cls.from_html(
+                html=r.content, from_encoding=ct.params.get("charset"), parser=parser
+            )
         else:
             raise UnsupportedContentTypeError(r.url, str(ct))
         if page.last_serial is None:
@@ -1,19 +1,54 @@
 from __future__ import annotations
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import copy
+from io import BytesIO
 import os
 from pathlib import Path
 import platform
+import threading
 from types import TracebackType
-from typing import Any, AnyStr, Optional
+from typing import IO, Any, AnyStr, Optional, TypeVar
 from mailbits import ContentType
 from packaging.utils import canonicalize_name as normalize
 import requests
-from . import ACCEPT_ANY, PYPI_SIMPLE_ENDPOINT, __url__, __version__
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from . import (
+    ACCEPT_ANY,
+    PYPI_SIMPLE_ENDPOINT,
+    SEGMENT_THRESHOLD,
+    __url__,
+    __version__,
+)
+from .cache import INDEX_KEY, CachedPage, PageCache
 from .classes import DistributionPackage, IndexPage, ProjectPage
-from .errors import UnsupportedContentTypeError
+from .errors import (
+    DownloadTooLargeError,
+    NoMetadataError,
+    UnsupportedContentTypeError,
+)
 from .html_stream import parse_links_stream_response
+from .json_stream import parse_project_names_stream
+from .local import FileAdapter, local_path
+from .metadata import parse_metadata
 from .progress import ProgressTracker, null_progress_tracker
-from .util import AbstractDigestChecker, DigestChecker, NullDigestChecker
+from .remote_wheel import read_wheel_metadata
+from .sdist import read_sdist_pkg_info
+from .util import (
+    AbstractDigestChecker,
+    CappedBytesIO,
+    DigestChecker,
+    NullDigestChecker,
+    copy_file_data,
+    digest_file,
+    file_matches_digests,
+    parse_content_range,
+    pipeline,
+    preallocate,
+)
+
+T = TypeVar("T")
+U = TypeVar("U")
 
 #: The User-Agent header used for requests; not used when the user provides eir
 #: own session object
@@ -45,12 +80,37 @@ class PyPISimple:
     automatically close its session on exit, regardless of where the session
     object came from.
 
+    If a ``page_cache`` is given, pages fetched with `get_index_page()` and
+    `get_project_page()` are stored in it along with the :mailheader:`ETag`
+    and :mailheader:`Last-Modified` headers of the responses.  Later requests
+    for the same pages are then sent as conditional requests, and if the
+    server responds with a 304, the cached page is returned without
+    downloading or parsing anything.
+
+    A repository stored on a local or network-mounted disk (such as one
+    written by `Mirror`) can be used without an HTTP server by passing a
+    :samp:`file://{path}` URL or a plain directory path as the ``endpoint``.
+    Such URLs are served by a `FileAdapter`, which is mounted on the session
+    for the ``file://`` prefix unless another adapter is already mounted
+    there, and packages with ``file://`` URLs are copied by
+    `download_package()` without going through the adapter.  For a remote
+    endpoint, the session is left without a ``file://`` adapter and packages
+    are never copied from local paths, so a remote repository cannot cause
+    local files to be read by redirecting to them or linking to them.
+
     .. versionchanged:: 1.0.0
 
         ``accept`` parameter added
 
-    :param str endpoint: The base URL of the simple API instance to query;
+    .. versionchanged:: 1.1.0
+
+        ``page_cache`` and ``parser`` parameters added; ``endpoint`` may now
+        be a local directory
+
+    :param endpoint: The base URL of the simple API instance to query, or
+        the path to a local directory containing a simple repository;
         defaults to the base URL for PyPI's simple API
+    :type endpoint: str | os.PathLike[str]
 
     :param auth: Optional login/authentication details for the repository;
         either a ``(username, password)`` pair or `another authentication
@@ -64,25 +124,50 @@ class PyPISimple:
         The :mailheader:`Accept` header to send in requests in order to specify
         what serialization format the server should return; defaults to
         `ACCEPT_ANY`
+
+    :param Optional[PageCache] page_cache:
+        Optional cache (e.g., a `MemoryPageCache` or `DirectoryPageCache`) in
+        which to store parsed pages for revalidation with conditional requests
+
+    :param str parser:
+        Which parser to use for HTML pages fetched with `get_index_page()` and
+        `get_project_page()`, either ``"bs4"`` (the default) or ``"fast"``;
+        see `RepositoryPage.from_html()`
     """
 
     def __init__(
         self,
-        endpoint: str = PYPI_SIMPLE_ENDPOINT,
+        endpoint: str | os.PathLike[str] = PYPI_SIMPLE_ENDPOINT,
         auth: Any = None,
         session: Optional[requests.Session] = None,
         accept: str = ACCEPT_ANY,
+        page_cache: Optional[PageCache] = None,
+        parser: str = "bs4",
     ) -> None:
-        self.endpoint: str = endpoint.rstrip("/") + "/"
+        if isinstance(endpoint, str) and "://" in endpoint:
+            self.endpoint: str = endpoint.rstrip("/") + "/"
+        else:
+            self.endpoint = (
+                Path(os.fsdecode(endpoint)).absolute().as_uri().rstrip("/") + "/"
+            )
         self.s: requests.Session
         if session is not None:
             self.s = session
         else:
             self.s = requests.Session()
             self.s.headers["User-Agent"] = USER_AGENT
+        # Local file access is only enabled for local repositories so that a
+        # remote repository cannot redirect to or link to local files.
+        self._local = local_path(self.endpoint) is not None
+        if self._local and "file://" not in self.s.adapters:
+            self.s.mount("file://", FileAdapter())
         if auth is not None:
             self.s.auth = auth
         self.accept = accept
+        self.page_cache = page_cache
+        self.parser = parser
+        # Parsed Core Metadata, keyed by the SHA256 digest of the package file
+        self._metadata_cache: dict[str, dict[str, Any]] = {}
 
     def __enter__(self) -> PyPISimple:
         return self
@@ -99,6 +184,7 @@ class PyPISimple:
         self,
         timeout: float | tuple[float, float] | None = None,
         accept: Optional[str] = None,
+        parser: Optional[str] = None,
     ) -> IndexPage:
         """
         Fetches the index/root page from the simple repository and returns an
@@ -113,12 +199,19 @@ class PyPISimple:
 
             ``accept`` parameter added
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param timeout: optional timeout to pass to the ``requests`` call
         :type timeout: float | tuple[float,float] | None
         :param Optional[str] accept:
             The :mailheader:`Accept` header to send in order to
             specify what serialization format the server should return;
             defaults to the value supplied on client instantiation
+        :param Optional[str] parser:
+            Which parser to use if the server returns HTML, either ``"bs4"`` or
+            ``"fast"``; defaults to the value supplied on client instantiation
         :rtype: IndexPage
         :raises requests.HTTPError: if the repository responds with an HTTP
             error code
@@ -127,11 +220,15 @@ class PyPISimple:
         :raises UnsupportedRepoVersionError: if the repository version has a
             greater major component than the supported repository version
         """
-        r = self.s.get(
-            self.endpoint, timeout=timeout, headers={"Accept": accept or self.accept}
+        r, cached = self._get_cached(
+            self.endpoint, INDEX_KEY, timeout=timeout, accept=accept or self.accept
         )
+        if cached is not None and isinstance(cached.page, IndexPage):
+            return cached.page
         r.raise_for_status()
-        return IndexPage.from_response(r)
+        page = IndexPage.from_response(r, parser=parser or self.parser)
+        self._store_cached(INDEX_KEY, self.endpoint, r, page)
+        return page
 
     def stream_project_names(
         self,
@@ -144,9 +241,9 @@ class PyPISimple:
         The names are not normalized.
 
         Unlike `get_index_page()`, this function makes a streaming request to
-        the server and parses the document in chunks.  It is intended to be
-        faster than the other methods, especially when the complete document is
-        very large.
+        the server and parses the document in chunks, whether it is HTML or
+        JSON.  It is intended to be faster than the other methods, especially
+        when the complete document is very large.
 
         .. warning::
 
@@ -154,16 +251,14 @@ class PyPISimple:
             support for web encodings, encoding detection, or handling invalid
             HTML.
 
-        .. note::
-
-            If the server responds with a JSON representation of the Simple API
-            rather than an HTML representation, the response body will be
-            loaded & parsed in its entirety before yielding anything.
-
         .. versionchanged:: 1.0.0
 
             ``accept`` parameter added
 
+        .. versionchanged:: 1.1.0
+
+            JSON responses are now parsed incrementally as well
+
         :param int chunk_size: how many bytes to read from the response at a
             time
         :param timeout: optional timeout to pass to the ``requests`` call
@@ -189,8 +284,7 @@ class PyPISimple:
             r.raise_for_status()
             ct = ContentType.parse(r.headers.get("content-type", "text/html"))
             if ct.content_type == "application/vnd.pypi.simple.v1+json":
-                page = IndexPage.from_json_data(r.json())
-                yield from page.projects
+                yield from parse_project_names_stream(r.iter_content(chunk_size))
             elif (
                 ct.content_type == "application/vnd.pypi.simple.v1+html"
                 or ct.content_type == "text/html"
@@ -205,6 +299,7 @@ class PyPISimple:
         project: str,
         timeout: float | tuple[float, float] | None = None,
         accept: Optional[str] = None,
+        parser: Optional[str] = None,
     ) -> ProjectPage:
         """
         Fetches the page for the given project from the simple repository and
@@ -219,6 +314,10 @@ class PyPISimple:
 
             - ``accept`` parameter added
 
+        .. versionchanged:: 1.1.0
+
+            ``parser`` parameter added
+
         :param str project: The name of the project to fetch information on.
             The name does not need to be normalized.
         :param timeout: optional timeout to pass to the ``requests`` call
@@ -227,6 +326,9 @@ class PyPISimple:
             The :mailheader:`Accept` header to send in order to
             specify what serialization format the server should return;
             defaults to the value supplied on client instantiation
+        :param Optional[str] parser:
+            Which parser to use if the server returns HTML, either ``"bs4"`` or
+            ``"fast"``; defaults to the value supplied on client instantiation
         :rtype: ProjectPage
         :raises NoSuchProjectError: if the repository responds with a 404 error
             code
@@ -238,11 +340,180 @@ class PyPISimple:
             greater major component than the supported repository version
         """
         url = self.get_project_url(project)
-        r = self.s.get(url, timeout=timeout, headers={"Accept": accept or None})
+        key = normalize(project)
+        r, cached = self._get_cached(url, key, timeout=timeout, accept=accept or None)
+        if cached is not None and isinstance(cached.page, ProjectPage):
+            return cached.page
         if r.status_code == 404:
             raise NoSuchProjectError(project, url)
         r.raise_for_status()
-        return ProjectPage.from_response(r, project)
+        page = ProjectPage.from_response(r, project, parser=parser or self.parser)
+        self._store_cached(key, url, r, page)
+        return page
+
+    def _get_cached(
+        self,
+        url: str,
+        key: str,
+        timeout: float | tuple[float, float] | None,
+        accept: Optional[str],
+    ) -> tuple[requests.Response, Optional[CachedPage]]:
+        """
+        Perform a GET request for the page at ``url``, sending a conditional
+        request if the page is stored in the page cache under ``key``.
+        Returns the response along with the cache entry if the server reported
+        that the cached page is still valid.
+
+        Entries that were fetched from a different URL (e.g., by a client for
+        another repository sharing the same cache) are ignored, as the server
+        at ``url`` cannot vouch for them.
+        """
+        headers: dict[str, Optional[str]] = {"Accept": accept}
+        cache = self.page_cache
+        cached: Optional[CachedPage] = None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None and cached.url != url:
+                cached = None
+            if cached is not None:
+                headers.update(cached.conditional_headers())
+        r = self.s.get(url, timeout=timeout, headers=headers)
+        if r.status_code == 304 and cache is not None and cached is not None:
+            if "ETag" in r.headers or "Last-Modified" in r.headers:
+                cached.etag = r.headers.get("ETag", cached.etag)
+                cached.last_modified = r.headers.get(
+                    "Last-Modified", cached.last_modified
+                )
+                cache.set(key, cached)
+            return (r, cached)
+        return (r, None)
+
+    def _store_cached(
+        self,
+        key: str,
+        url: str,
+        r: requests.Response,
+        page: IndexPage | ProjectPage,
+    ) -> None:
+        """
+        Store ``page``, requested from ``url``, in the page cache under
+        ``key`` if the response it was parsed from has any validators
+        """
+        if self.page_cache is not None:
+            etag = r.headers.get("ETag")
+            last_modified = r.headers.get("Last-Modified")
+            if etag is not None or last_modified is not None:
+                self.page_cache.set(
+                    key,
+                    CachedPage(
+                        page=page, etag=etag, last_modified=last_modified, url=url
+                    ),
+                )
+
+    def get_project_pages(
+        self,
+        projects: Iterable[str],
+        max_workers: int = 10,
+        timeout: float | tuple[float, float] | None = None,
+        accept: Optional[str] = None,
+        parser: Optional[str] = None,
+    ) -> Iterator[tuple[str, ProjectPage | Exception]]:
+        """
+        .. versionadded:: 1.1.0
+
+        Fetch the pages for multiple projects concurrently using a pool of
+        ``max_workers`` threads that share the client's session, and yield a
+        ``(project, result)`` pair for each project in the order in which the
+        requests complete.  ``result`` is either the `ProjectPage` for the
+        project or the exception raised while fetching it (e.g., a
+        `NoSuchProjectError` if the repository responds with a 404); errors for
+        individual projects do not stop the remaining requests.
+
+        The connection pool of the session's HTTP adapters is enlarged to
+        ``max_workers`` connections per host if it is smaller than that; only
+        plain `requests.adapters.HTTPAdapter` instances are adjusted.
+
+        At most ``2 * max_workers`` requests are queued at any one time, so
+        ``projects`` may be a lazy iterable of arbitrary length.
+
+        :param Iterable[str] projects: The names of the projects to fetch
+            information on.  The names do not need to be normalized.
+        :param int max_workers: the number of requests to make concurrently
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[str] accept:
+            The :mailheader:`Accept` header to send in order to
+            specify what serialization format the server should return;
+            defaults to the value supplied on client instantiation
+        :param Optional[str] parser:
+            Which parser to use if the server returns HTML, either ``"bs4"`` or
+            ``"fast"``; defaults to the value supplied on client instantiation
+        :rtype: Iterator[tuple[str, ProjectPage | Exception]]
+        """
+
+        def fetch(project: str) -> ProjectPage:
+            return self.get_project_page(
+                project, timeout=timeout, accept=accept, parser=parser
+            )
+
+        return self._map_concurrently(fetch, projects, max_workers)
+
+    def _map_concurrently(
+        self,
+        func: Callable[[T], U],
+        items: Iterable[T],
+        max_workers: int,
+    ) -> Iterator[tuple[T, U | Exception]]:
+        """
+        Call ``func`` on each element of ``items`` in a thread pool and yield
+        each element along with its result or exception in completion order
+        """
+        self._ensure_pool_size(max_workers)
+        iterator = iter(items)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: dict[Future[U], T] = {}
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < 2 * max_workers:
+                    try:
+                        x = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                    else:
+                        pending[executor.submit(func, x)] = x
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    x = pending.pop(fut)
+                    result: U | Exception
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        result = e
+                    yield (x, result)
+
+    def _ensure_pool_size(self, size: int) -> None:
+        """
+        Ensure that the plain `HTTPAdapter`\\s mounted on the session can hold
+        at least ``size`` connections per host
+        """
+        for prefix, adapter in list(self.s.adapters.items()):
+            if (
+                type(adapter) is HTTPAdapter
+                and getattr(adapter, "_pool_maxsize", size) < size
+            ):
+                self.s.mount(
+                    prefix,
+                    HTTPAdapter(
+                        pool_connections=getattr(
+                            adapter, "_pool_connections", DEFAULT_POOLSIZE
+                        ),
+                        pool_maxsize=size,
+                        max_retries=adapter.max_retries,
+                        pool_block=getattr(adapter, "_pool_block", DEFAULT_POOLBLOCK),
+                    ),
+                )
 
     def get_project_url(self, project: str) -> str:
         """
@@ -254,6 +525,224 @@ class PyPISimple:
         """
         return self.endpoint + normalize(project) + "/"
 
+    def get_package_metadata_bytes(
+        self,
+        pkg: DistributionPackage,
+        verify: bool = True,
+        timeout: float | tuple[float, float] | None = None,
+        range_fallback: bool = True,
+    ) -> bytes:
+        """
+        .. versionadded:: 1.1.0
+
+        Retrieve the raw contents of the Core Metadata file for the given
+        `DistributionPackage` from its `~DistributionPackage.metadata_url` (see
+        :pep:`658`).
+
+        If the package is a wheel whose `~DistributionPackage.has_metadata` is
+        not true (i.e., the repository does not report serving a Core Metadata
+        file for it) and ``range_fallback`` is true, the :file:`METADATA` file
+        is instead extracted from the wheel itself by using HTTP range requests
+        to read the zip archive's central directory and then just the
+        compressed :file:`METADATA` member.  As there are no digests for the
+        metadata in this case, ``verify`` is ignored; the member's CRC is
+        still checked.
+
+        :param DistributionPackage pkg:
+            the distribution package to retrieve the metadata of
+        :param bool verify:
+            whether to verify the metadata file's digests against the retrieved
+            data
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param bool range_fallback: whether to extract the metadata of wheels
+            lacking a Core Metadata file using range requests
+        :rtype: bytes
+        :raises NoMetadataError:
+            if the repository responds with a 404 error code, or if a wheel
+            read with ``range_fallback`` does not contain a :file:`METADATA`
+            file
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises NoDigestsError:
+            if ``verify`` is true and the given package's metadata does not
+            have any digests with known algorithms
+        :raises DigestMismatchError:
+            if ``verify`` is true and the digest of the retrieved data does not
+            match the expected value
+        :raises ValueError:
+            if reading a wheel with ``range_fallback`` and the server does not
+            honor range requests
+        """
+        if (
+            range_fallback
+            and pkg.has_metadata is not True
+            and pkg.package_type == "wheel"
+        ):
+            return read_wheel_metadata(self.s, pkg.url, pkg.filename, timeout)
+        digester: AbstractDigestChecker
+        if verify:
+            digester = DigestChecker(pkg.metadata_digests or {})
+        else:
+            digester = NullDigestChecker()
+        r = self.s.get(pkg.metadata_url, timeout=timeout)
+        if r.status_code == 404:
+            raise NoMetadataError(pkg.filename)
+        r.raise_for_status()
+        digester.update(r.content)
+        digester.finalize()
+        return r.content
+
+    def get_sdist_pkg_info_bytes(
+        self,
+        pkg: DistributionPackage,
+        timeout: float | tuple[float, float] | None = None,
+    ) -> bytes:
+        """
+        .. versionadded:: 1.1.0
+
+        Retrieve the raw contents of the :file:`PKG-INFO` file from the given
+        sdist `DistributionPackage` without downloading the whole archive.
+
+        For tar-based sdists (e.g., :file:`.tar.gz`), the archive is
+        decompressed as it is downloaded, and the transfer is aborted as soon
+        as the top-level :file:`PKG-INFO` has been read; as this file is
+        usually at the front of the archive, only a small part of the sdist is
+        typically transferred.  (If there is no top-level :file:`PKG-INFO`,
+        one inside an :file:`*.egg-info` directory is used instead, which
+        requires reading the whole archive.)  Zip sdists are read using HTTP
+        range requests in the same way as wheels in
+        `get_package_metadata_bytes()`.
+
+        As only part of the file is downloaded, the package's digests are not
+        verified.  The result can be parsed with `parse_metadata()`.
+
+        :param DistributionPackage pkg: the sdist to read
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :rtype: bytes
+        :raises ValueError:
+            if ``pkg`` is not an sdist, or if it is a zip file and the server
+            does not honor range requests
+        :raises NoMetadataError:
+            if the sdist does not contain a :file:`PKG-INFO` file
+        :raises DownloadTooLargeError:
+            if the :file:`PKG-INFO` file is larger than 1 MiB
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code
+        """
+        if pkg.package_type != "sdist":
+            raise ValueError(f"{pkg.filename} is not an sdist")
+        return read_sdist_pkg_info(self.s, pkg.url, pkg.filename, timeout)
+
+    def get_package_metadata(
+        self,
+        pkg: DistributionPackage,
+        verify: bool = True,
+        timeout: float | tuple[float, float] | None = None,
+        range_fallback: bool = True,
+    ) -> dict[str, Any]:
+        """
+        .. versionadded:: 1.1.0
+
+        Retrieve the Core Metadata file for the given `DistributionPackage`
+        (see :pep:`658`) and return it parsed into a `dict` as described by
+        `parse_metadata()`.
+
+        If ``range_fallback`` is true, wheels without a Core Metadata file
+        have their :file:`METADATA` extracted via HTTP range requests instead;
+        see `get_package_metadata_bytes()`.
+
+        Results verified against digests are cached on the client, keyed by
+        the SHA256 digest of the package file, so that subsequent requests for
+        the metadata of the same file (even if listed under a different URL)
+        are served without making any requests.  Packages without a SHA256
+        digest and metadata extracted via range requests are not cached.
+
+        :param DistributionPackage pkg:
+            the distribution package to retrieve the metadata of
+        :param bool verify:
+            whether to verify the metadata file's digests against the retrieved
+            data
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param bool range_fallback: whether to extract the metadata of wheels
+            lacking a Core Metadata file using range requests
+        :rtype: dict[str, Any]
+        :raises NoMetadataError:
+            if the repository responds with a 404 error code, or if a wheel
+            read with ``range_fallback`` does not contain a :file:`METADATA`
+            file
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code other than 404
+        :raises NoDigestsError:
+            if ``verify`` is true and the given package's metadata does not
+            have any digests with known algorithms
+        :raises DigestMismatchError:
+            if ``verify`` is true and the digest of the retrieved data does not
+            match the expected value
+        :raises ValueError:
+            if reading a wheel with ``range_fallback`` and the server does not
+            honor range requests
+        """
+        key = pkg.digests.get("sha256")
+        if key is not None and key in self._metadata_cache:
+            return copy.deepcopy(self._metadata_cache[key])
+        blob = self.get_package_metadata_bytes(
+            pkg, verify=verify, timeout=timeout, range_fallback=range_fallback
+        )
+        md = parse_metadata(blob.decode("utf-8", errors="replace"))
+        ranged = (
+            range_fallback
+            and pkg.has_metadata is not True
+            and pkg.package_type == "wheel"
+        )
+        if key is not None and verify and not ranged:
+            self._metadata_cache[key] = copy.deepcopy(md)
+        return md
+
+    def get_packages_metadata(
+        self,
+        pkgs: Iterable[DistributionPackage],
+        max_workers: int = 10,
+        verify: bool = True,
+        timeout: float | tuple[float, float] | None = None,
+        range_fallback: bool = True,
+    ) -> Iterator[tuple[DistributionPackage, dict[str, Any] | Exception]]:
+        """
+        .. versionadded:: 1.1.0
+
+        Retrieve the Core Metadata for multiple `DistributionPackage`\\s
+        concurrently by calling `get_package_metadata()` in a pool of
+        ``max_workers`` threads that share the client's session, and yield a
+        ``(pkg, result)`` pair for each package in the order in which the
+        requests complete.  ``result`` is either the parsed metadata or the
+        exception raised while retrieving it; errors for individual packages
+        do not stop the remaining requests.
+
+        As with `get_project_pages()`, the session's connection pools are
+        enlarged as needed, and ``pkgs`` may be a lazy iterable.
+
+        :param Iterable[DistributionPackage] pkgs: the packages to retrieve
+            the metadata of
+        :param int max_workers: the number of requests to make concurrently
+        :param bool verify:
+            whether to verify each metadata file's digests against the
+            retrieved data
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param bool range_fallback: whether to extract the metadata of wheels
+            lacking a Core Metadata file using range requests
+        :rtype: Iterator[tuple[DistributionPackage, dict[str, Any] | Exception]]
+        """
+
+        def fetch(pkg: DistributionPackage) -> dict[str, Any]:
+            return self.get_package_metadata(
+                pkg, verify=verify, timeout=timeout, range_fallback=range_fallback
+            )
+
+        return self._map_concurrently(fetch, pkgs, max_workers)
+
     def download_package(
         self,
         pkg: DistributionPackage,
@@ -262,6 +751,12 @@ class PyPISimple:
         keep_on_error: bool = False,
         progress: Optional[Callable[[Optional[int]], ProgressTracker]] = None,
         timeout: float | tuple[float, float] | None = None,
+        resume: bool = False,
+        segments: int = 1,
+        segment_threshold: int = SEGMENT_THRESHOLD,
+        if_exists: str = "overwrite",
+        pipelined: bool = False,
+        hardlink: bool = False,
     ) -> None:
         """
         Download the given `DistributionPackage` to the given path.
@@ -269,6 +764,58 @@ class PyPISimple:
         If an error occurs while downloading or verifying digests, and
         ``keep_on_error`` is not true, the downloaded file is not saved.
 
+        If ``resume`` is true, the file is first downloaded to a :file:`.part`
+        file next to ``path``, which is renamed to ``path`` once the download
+        is complete and verified.  If the :file:`.part` file already exists
+        (e.g., because a previous download was interrupted), only the
+        remaining bytes are requested from the server using a
+        :mailheader:`Range` header, and the digests are computed over the
+        existing contents followed by the new data.  If the server does not
+        honor the range request, the download starts over.  When a transfer
+        fails partway through, the :file:`.part` file is left in place for a
+        later resumption regardless of ``keep_on_error``; if the completed
+        file fails verification, it is deleted (or, if ``keep_on_error`` is
+        true, saved at ``path``).
+
+        If ``segments`` is greater than 1, a ``HEAD`` request is
+        first made for the package URL, and if the server advertises support
+        for byte ranges via :mailheader:`Accept-Ranges` and reports a
+        :mailheader:`Content-Length` greater than ``segment_threshold``, the
+        file is split into ``segments`` byte ranges that are fetched
+        concurrently over separate connections and written directly into
+        their positions in a preallocated file.  The digests are then verified
+        over the assembled file.  Otherwise, the file is downloaded over a
+        single connection as usual.  ``segments`` is ignored when ``resume``
+        is true.
+
+        If ``if_exists`` is ``"verify"`` and ``path`` already exists, the
+        existing file is hashed (via a memory map) and compared against the
+        package's digests; if they all match, the function returns without
+        making any requests.  Otherwise (including when the package has no
+        digests with known algorithms), the file is downloaded again as if
+        ``if_exists`` were ``"overwrite"``, the default.
+
+        If ``pipelined`` is true, reading from the network, writing to disk,
+        and computing digests are performed concurrently on separate threads
+        that pass chunks of the file through small bounded queues.  This
+        allows faster connections to be saturated at the cost of two extra
+        threads per download.  ``pipelined`` does not affect segmented
+        downloads.
+
+        If the client's endpoint is a local directory and the package's URL is
+        a ``file://`` URL served by a `FileAdapter`, the file is copied
+        directly instead of being requested, using
+        :func:`os.copy_file_range` or :func:`os.sendfile` where available so
+        that the data is moved by the kernel (or by the file server, for
+        filesystems that support server-side copies) without passing through
+        Python.  If ``hardlink`` is true, a hard link to the file is created
+        at ``path`` instead, falling back to copying if the link cannot be
+        made (e.g., because the paths are on different filesystems); note
+        that modifying a hard-linked file modifies the repository's copy as
+        well.  Digests are then verified by hashing the new file via a memory
+        map.  ``resume``, ``segments``, and ``pipelined`` have no effect on
+        local files.
+
         Download progress can be tracked (e.g., for display by a progress bar)
         by passing an appropriate callable as the ``progress`` argument.  This
         callable will be passed the length of the downloaded file, if known,
@@ -288,6 +835,18 @@ class PyPISimple:
         :param progress: a callable for constructing a progress tracker
         :param timeout: optional timeout to pass to the ``requests`` call
         :type timeout: float | tuple[float,float] | None
+        :param bool resume: whether to download via a resumable :file:`.part`
+            file
+        :param int segments: the number of byte ranges to fetch concurrently
+            for large files
+        :param int segment_threshold: the minimum size in bytes above which
+            a file is downloaded in segments
+        :param str if_exists: what to do if ``path`` already exists, either
+            ``"overwrite"`` or ``"verify"``
+        :param bool pipelined: whether to read, write, and hash the file on
+            separate threads
+        :param bool hardlink: whether to hard-link packages with local
+            ``file://`` URLs instead of copying them
         :raises requests.HTTPError: if the repository responds with an HTTP
             error code
         :raises NoDigestsError:
@@ -296,30 +855,70 @@ class PyPISimple:
         :raises DigestMismatchError:
             if ``verify`` is true and the digest of the downloaded file does
             not match the expected value
+        :raises ValueError:
+            if the server does not honor a byte range request made while
+            downloading in segments, or if ``if_exists`` is not a recognized
+            value
+        :raises OSError: if a local package file cannot be copied
+
+        .. versionchanged:: 1.1.0
+
+            ``resume``, ``segments``, ``segment_threshold``, ``if_exists``,
+            ``pipelined``, and ``hardlink`` parameters added; packages with
+            local ``file://`` URLs are now copied directly
         """
+        if if_exists not in ("overwrite", "verify"):
+            raise ValueError(f"Unknown if_exists value: {if_exists!r}")
         target = Path(os.fsdecode(path))
+        if (
+            if_exists == "verify"
+            and target.is_file()
+            and file_matches_digests(target, pkg.digests)
+        ):
+            return
         target.parent.mkdir(parents=True, exist_ok=True)
         digester: AbstractDigestChecker
         if verify:
             digester = DigestChecker(pkg.digests)
         else:
             digester = NullDigestChecker()
+        source = local_path(pkg.url)
+        if (
+            self._local
+            and source is not None
+            and isinstance(self.s.get_adapter(pkg.url), FileAdapter)
+        ):
+            self._copy_local(
+                source, target, digester, keep_on_error, progress, hardlink
+            )
+            return
+        if resume:
+            self._download_resumable(
+                pkg, target, digester, keep_on_error, progress, timeout, pipelined
+            )
+            return
+        if segments > 1:
+            ranged = self._head_for_ranges(pkg.url, segment_threshold, timeout)
+            if ranged is not None:
+                url, size = ranged
+                self._download_segmented(
+                    url,
+                    size,
+                    target,
+                    digester,
+                    keep_on_error,
+                    progress,
+                    timeout,
+                    segments,
+                )
+                return
         with self.s.get(pkg.url, stream=True, timeout=timeout) as r:
             r.raise_for_status()
             try:
-                content_length = int(r.headers["Content-Length"])
-            except (ValueError, KeyError):
-                content_length = None
-            if progress is None:
-                progress = null_progress_tracker()
-            try:
-                with progress(content_length) as p:
-                    with target.open("wb") as fp:
-                        for chunk in r.iter_content(65535):
-                            fp.write(chunk)
-                            digester.update(chunk)
-                            p.update(len(chunk))
-                digester.finalize()
+                with target.open("wb") as fp:
+                    self._write_package(
+                        r, fp, digester, progress, pipelined, allocate=True
+                    )
             except Exception:
                 if not keep_on_error:
                     try:
@@ -328,6 +927,499 @@ class PyPISimple:
                         pass
                 raise
 
+    @staticmethod
+    def _copy_local(
+        source: Path,
+        target: Path,
+        digester: AbstractDigestChecker,
+        keep_on_error: bool,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]],
+        hardlink: bool,
+    ) -> None:
+        """
+        Copy or hard-link the local package file ``source`` to ``target`` and
+        verify the result
+        """
+        size = source.stat().st_size
+        if progress is None:
+            progress = null_progress_tracker()
+        if target.exists() and os.path.samefile(source, target):
+            # The target is already the repository's file (or a link to it);
+            # there is nothing to copy, and it must not be deleted.
+            with progress(size) as p:
+                p.update(size)
+            digest_file(target, digester)
+            digester.finalize()
+            return
+        try:
+            with progress(size) as p:
+                linked = False
+                if hardlink:
+                    # Link to a temporary name first so that an existing
+                    # target is replaced atomically.
+                    tmp = target.with_name(f".{target.name}.{os.getpid()}.link")
+                    try:
+                        os.link(source, tmp)
+                    except OSError:
+                        pass
+                    else:
+                        os.replace(tmp, target)
+                        linked = True
+                        p.update(size)
+                if not linked:
+                    with source.open("rb") as infp, target.open("wb") as outfp:
+                        copy_file_data(infp, outfp, p.update)
+            digest_file(target, digester)
+            digester.finalize()
+        except Exception:
+            if not keep_on_error:
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    pass
+            raise
+
+    def download_package_fileobj(
+        self,
+        pkg: DistributionPackage,
+        fp: IO[bytes],
+        verify: bool = True,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]] = None,
+        timeout: float | tuple[float, float] | None = None,
+        pipelined: bool = False,
+    ) -> None:
+        """
+        .. versionadded:: 1.1.0
+
+        Download the given `DistributionPackage` and write its contents to the
+        given writable binary file-like object, starting at the object's
+        current position.  Digests are verified and progress is reported as
+        for `download_package()`; however, since there is no file to delete,
+        any data already written to ``fp`` before an error occurs is left in
+        place.
+
+        :param DistributionPackage pkg: the distribution package to download
+        :param IO[bytes] fp: the binary file-like object to write to
+        :param bool verify:
+            whether to verify the package's digests against the downloaded
+            file
+        :param progress: a callable for constructing a progress tracker; see
+            `download_package()`
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param bool pipelined: whether to read, write, and hash the file on
+            separate threads
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code
+        :raises NoDigestsError:
+            if ``verify`` is true and the given package does not have any
+            digests with known algorithms
+        :raises DigestMismatchError:
+            if ``verify`` is true and the digest of the downloaded file does
+            not match the expected value
+        """
+        digester: AbstractDigestChecker
+        if verify:
+            digester = DigestChecker(pkg.digests)
+        else:
+            digester = NullDigestChecker()
+        with self.s.get(pkg.url, stream=True, timeout=timeout) as r:
+            r.raise_for_status()
+            self._write_package(r, fp, digester, progress, pipelined)
+
+    def download_package_bytes(
+        self,
+        pkg: DistributionPackage,
+        verify: bool = True,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]] = None,
+        timeout: float | tuple[float, float] | None = None,
+        max_size: Optional[int] = None,
+    ) -> bytes:
+        """
+        .. versionadded:: 1.1.0
+
+        Download the given `DistributionPackage` into memory and return its
+        contents, verifying digests and reporting progress as for
+        `download_package()`.
+
+        If ``max_size`` is given, the download is aborted with a
+        `DownloadTooLargeError` as soon as the file is known to be larger than
+        that many bytes, either from the response's
+        :mailheader:`Content-Length` or from the amount of data received.
+
+        :param DistributionPackage pkg: the distribution package to download
+        :param bool verify:
+            whether to verify the package's digests against the downloaded
+            file
+        :param progress: a callable for constructing a progress tracker; see
+            `download_package()`
+        :param timeout: optional timeout to pass to the ``requests`` call
+        :type timeout: float | tuple[float,float] | None
+        :param Optional[int] max_size: the maximum number of bytes to download
+        :rtype: bytes
+        :raises requests.HTTPError: if the repository responds with an HTTP
+            error code
+        :raises NoDigestsError:
+            if ``verify`` is true and the given package does not have any
+            digests with known algorithms
+        :raises DigestMismatchError:
+            if ``verify`` is true and the digest of the downloaded file does
+            not match the expected value
+        :raises DownloadTooLargeError:
+            if the file is larger than ``max_size``
+        """
+        digester: AbstractDigestChecker
+        if verify:
+            digester = DigestChecker(pkg.digests)
+        else:
+            digester = NullDigestChecker()
+        with self.s.get(pkg.url, stream=True, timeout=timeout) as r:
+            r.raise_for_status()
+            buf: BytesIO
+            if max_size is not None:
+                try:
+                    content_length = int(r.headers["Content-Length"])
+                except (ValueError, KeyError):
+                    pass
+                else:
+                    if content_length > max_size:
+                        raise DownloadTooLargeError(pkg.url, max_size)
+                buf = CappedBytesIO(max_size, pkg.url)
+            else:
+                buf = BytesIO()
+            self._write_package(r, buf, digester, progress, False)
+            return buf.getvalue()
+
+    def _write_package(
+        self,
+        r: requests.Response,
+        fp: IO[bytes],
+        digester: AbstractDigestChecker,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]],
+        pipelined: bool,
+        allocate: bool = False,
+    ) -> None:
+        """
+        Write the body of the package download response ``r`` to ``fp`` with
+        progress reporting, and then verify its digests
+        """
+        try:
+            content_length = int(r.headers["Content-Length"])
+        except (ValueError, KeyError):
+            content_length = None
+        if progress is None:
+            progress = null_progress_tracker()
+        with progress(content_length) as p:
+            self._write_response(r, fp, digester, p, pipelined, allocate)
+        digester.finalize()
+
+    @staticmethod
+    def _write_response(
+        r: requests.Response,
+        fp: IO[bytes],
+        digester: AbstractDigestChecker,
+        p: ProgressTracker,
+        pipelined: bool,
+        allocate: bool = False,
+    ) -> None:
+        """
+        Write the body of ``r`` to ``fp`` (starting at its current position)
+        while feeding it to ``digester`` and reporting progress to ``p``.
+
+        If ``allocate`` is true and the response has a
+        :mailheader:`Content-Length`, the space for the body is preallocated,
+        and the file is truncated to the amount actually written afterwards in
+        case the body turns out to be shorter.  This must only be done for
+        files opened by the library itself, as it would discard any data after
+        the written region (or, in append mode, write the body after the
+        preallocated space) in a caller's file.
+        """
+        try:
+            length: Optional[int] = int(r.headers["Content-Length"])
+        except (ValueError, KeyError):
+            length = None
+        allocated = allocate and length is not None and preallocate(fp, length)
+        try:
+            if pipelined:
+
+                def write(chunk: bytes) -> None:
+                    fp.write(chunk)
+                    p.update(len(chunk))
+
+                if isinstance(digester, NullDigestChecker):
+                    pipeline(r.iter_content(65535), write)
+                else:
+                    pipeline(r.iter_content(65535), write, digester.update)
+            else:
+                for chunk in r.iter_content(65535):
+                    fp.write(chunk)
+                    digester.update(chunk)
+                    p.update(len(chunk))
+        finally:
+            if allocated:
+                fp.truncate(fp.tell())
+
+    def _download_resumable(
+        self,
+        pkg: DistributionPackage,
+        target: Path,
+        digester: AbstractDigestChecker,
+        keep_on_error: bool,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]],
+        timeout: float | tuple[float, float] | None,
+        pipelined: bool,
+    ) -> None:
+        part = target.with_name(target.name + ".part")
+        try:
+            offset = part.stat().st_size
+        except FileNotFoundError:
+            offset = 0
+
+        def request(start: int) -> requests.Response:
+            headers = {"Range": f"bytes={start}-"} if start else None
+            return self.s.get(pkg.url, stream=True, timeout=timeout, headers=headers)
+
+        r: Optional[requests.Response] = request(offset)
+        try:
+            assert r is not None
+            if offset:
+                crange = parse_content_range(r.headers.get("Content-Range"))
+                if r.status_code == 416 and crange is not None and crange[2] == offset:
+                    # The .part file already contains the whole file.
+                    r.close()
+                    r = None
+                elif (
+                    r.status_code == 206 and crange is not None and crange[0] == offset
+                ):
+                    pass
+                elif r.status_code in (206, 416):
+                    # The server didn't return the range we asked for; start
+                    # over.
+                    r.close()
+                    r = request(0)
+                    offset = 0
+                else:
+                    # The server ignored the Range header (or failed).
+                    offset = 0
+            if r is not None:
+                r.raise_for_status()
+                try:
+                    total: Optional[int] = offset + int(r.headers["Content-Length"])
+                except (ValueError, KeyError):
+                    total = None
+            else:
+                total = offset
+            if offset:
+                with part.open("rb") as infp:
+                    for blob in iter(lambda: infp.read(65535), b""):
+                        digester.update(blob)
+            if progress is None:
+                progress = null_progress_tracker()
+            with progress(total) as p:
+                if offset:
+                    p.update(offset)
+                if r is not None:
+                    # Opening in append mode would write after any space
+                    # preallocated past the end of the file, so seek instead.
+                    with part.open("r+b" if offset else "wb") as fp:
+                        fp.seek(offset)
+                        self._write_response(
+                            r, fp, digester, p, pipelined, allocate=True
+                        )
+        finally:
+            if r is not None:
+                r.close()
+        try:
+            digester.finalize()
+        except Exception:
+            if keep_on_error:
+                os.replace(part, target)
+            else:
+                part.unlink()
+            raise
+        os.replace(part, target)
+
+    def _head_for_ranges(
+        self,
+        url: str,
+        threshold: int,
+        timeout: float | tuple[float, float] | None,
+    ) -> Optional[tuple[str, int]]:
+        """
+        Make a ``HEAD`` request for ``url``, and, if the server
+        supports byte ranges and the file is larger than ``threshold``, return
+        the final URL after redirects and the size of the file
+        """
+        r = self.s.head(url, allow_redirects=True, timeout=timeout)
+        if not r.ok:
+            return None
+        accept_ranges = r.headers.get("Accept-Ranges", "")
+        if "bytes" not in [u.strip().lower() for u in accept_ranges.split(",")]:
+            return None
+        try:
+            size = int(r.headers["Content-Length"])
+        except (ValueError, KeyError):
+            return None
+        if size <= threshold:
+            return None
+        return (r.url, size)
+
+    def _download_segmented(
+        self,
+        url: str,
+        size: int,
+        target: Path,
+        digester: AbstractDigestChecker,
+        keep_on_error: bool,
+        progress: Optional[Callable[[Optional[int]], ProgressTracker]],
+        timeout: float | tuple[float, float] | None,
+        segments: int,
+    ) -> None:
+        bounds = [
+            (i * size // segments, (i + 1) * size // segments) for i in range(segments)
+        ]
+        if progress is None:
+            progress = null_progress_tracker()
+        lock = threading.Lock()
+        failed = threading.Event()
+        try:
+            with target.open("wb") as fp:
+                if not preallocate(fp, size):
+                    fp.truncate(size)
+            with progress(size) as p:
+
+                def fetch(span: tuple[int, int]) -> None:
+                    start, end = span
+                    headers = {"Range": f"bytes={start}-{end - 1}"}
+                    with self.s.get(
+                        url, stream=True, timeout=timeout, headers=headers
+                    ) as r:
+                        r.raise_for_status()
+                        crange = parse_content_range(r.headers.get("Content-Range"))
+                        if (
+                            r.status_code != 206
+                            or crange is None
+                            or crange[:2] != (start, end - 1)
+                        ):
+                            raise ValueError(
+                                f"Server did not honor range request for {url}"
+                            )
+                        # Each segment gets its own file handle so that writes
+                        # are positional and don't contend for a shared offset.
+                        with target.open("r+b") as fp:
+                            fp.seek(start)
+                            pos = start
+                            for chunk in r.iter_content(65535):
+                                if failed.is_set():
+                                    return
+                                if pos + len(chunk) > end:
+                                    raise ValueError(
+                                        f"Server sent too much data for range"
+                                        f" request for {url}"
+                                    )
+                                fp.write(chunk)
+                                pos += len(chunk)
+                                with lock:
+                                    p.update(len(chunk))
+                        if pos != end:
+                            raise ValueError(
+                                f"Server sent too little data for range request"
+                                f" for {url}"
+                            )
+
+                for _, e in self._map_concurrently(
+                    fetch, [b for b in bounds if b[0] < b[1]], segments
+                ):
+                    if e is not None:
+                        failed.set()
+                        raise e
+            if not isinstance(digester, NullDigestChecker):
+                with target.open("rb") as infp:
+                    for blob in iter(lambda: infp.read(65535), b""):
+                        digester.update(blob)
+            digester.finalize()
+        except Exception:
+            if not keep_on_error:
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    pass
+            raise
+
+    def download_packages(
+        self,
+        pkgs: Iterable[DistributionPackage],
+        dest_dir: AnyStr | os.PathLike[AnyStr],
+        max_workers: int = 10,
+        verify: bool = True,
+        keep_on_error: bool = False,
+        timeout: float | tuple[float, float] | None = None,
+        resume: bool = False,
+        if_exists: str = "overwrite",
+        hardlink: bool = False,
+    ) -> Iterator[tuple[DistributionPackage, Path | Exception]]:
+        """
+        .. versionadded:: 1.1.0
+
+        Download multiple `DistributionPackage`\\s concurrently into the
+        directory ``dest_dir`` using a pool of ``max_workers`` threads that
+        share the client's session.  Each package is saved under its
+        `~DistributionPackage.filename` by calling `download_package()`, and
+        a ``(pkg, result)`` pair is yielded for each package in the order in
+        which the downloads complete.  ``result`` is either the path to which
+        the package was saved or the exception raised while downloading it;
+        errors for individual packages do not stop the remaining downloads.
+
+        As with `get_project_pages()`, the session's connection pools are
+        enlarged as needed, and ``pkgs`` may be a lazy iterable.
+
+        :param Iterable[DistributionPackage] pkgs: the packages to download
+        :param dest_dir: the directory in which to save the packages; it will
+            be created if it does not already exist
+        :param int max_workers: the number of downloads to run concurrently
+        :param bool verify:
+            whether to verify each package's digests against the downloaded
+            file
+        :param bool keep_on_error:
+            whether to keep (true) or delete (false) each downloaded file if an
+            error occurs
+        :param timeout: optional timeout to pass to the ``requests`` calls
+        :type timeout: float | tuple[float,float] | None
+        :param bool resume: whether to download via resumable :file:`.part`
+            files; see `download_package()`
+        :param str if_exists: what to do about packages that already exist
+            in ``dest_dir``; see `download_package()`
+        :param bool hardlink: whether to hard-link packages with local
+            ``file://`` URLs instead of copying them; see
+            `download_package()`
+        :rtype: Iterator[tuple[DistributionPackage, pathlib.Path | Exception]]
+        """
+        dest = Path(os.fsdecode(dest_dir))
+
+        def download(pkg: DistributionPackage) -> Path:
+            if (
+                pkg.filename in ("", ".", "..")
+                or os.path.basename(pkg.filename) != pkg.filename
+                or "/" in pkg.filename
+            ):
+                raise ValueError(
+                    f"Refusing to save to unsafe filename {pkg.filename!r}"
+                )
+            target = dest / pkg.filename
+            self.download_package(
+                pkg,
+                target,
+                verify=verify,
+                keep_on_error=keep_on_error,
+                timeout=timeout,
+                resume=resume,
+                if_exists=if_exists,
+                hardlink=hardlink,
+            )
+            return target
+
+        return self._map_concurrently(download, pkgs, max_workers)
+
 
 class NoSuchProjectError(Exception):
     """
@@ -0,0 +1,295 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional, cast
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import Version
+from .classes import DistributionPackage, ProjectPage
+
+#: The names of the columns of a `ColumnarProjectPage`
+COLUMNS = (
+    "packages",
+    "filenames",
+    "urls",
+    "versions",
+    "package_types",
+    "requires_python",
+    "is_yanked",
+    "sha256",
+)
+
+
+def have_numpy() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    else:
+        return True
+
+
+@dataclass
+class ColumnarProjectPage:
+    """
+    .. versionadded:: 1.1.0
+
+    A `ProjectPage` with its packages' most commonly-used attributes stored as
+    parallel columns, for fast filtering of pages with many packages.
+    Instances are created by `ProjectPage.to_columns()`.
+
+    If NumPy is in use (the default when it is installed), the columns are
+    NumPy arrays (with `is_yanked` having a `bool` dtype and the others having
+    an `object` dtype), and masks are NumPy `bool` arrays.  Otherwise, the
+    columns are `list`\\s and masks are `list`\\s of `bool`\\s.
+
+    Filtering a `ColumnarProjectPage` returns another `ColumnarProjectPage`
+    containing only the selected rows, without constructing any new
+    `DistributionPackage`\\s; the original `DistributionPackage` for each row
+    remains available in the `packages` column.
+    """
+
+    #: The name of the project the page is for
+    project: str
+
+    #: The repository version reported by the page, or `None` if not specified
+    repository_version: Optional[str]
+
+    #: The value of the :mailheader:`X-PyPI-Last-Serial` response header
+    #: returned when fetching the page, or `None` if not specified
+    last_serial: Optional[str]
+
+    #: The `DistributionPackage` from which each row was created
+    packages: Sequence[DistributionPackage]
+
+    #: The `~DistributionPackage.filename` of each package
+    filenames: Sequence[str]
+
+    #: The `~DistributionPackage.url` of each package
+    urls: Sequence[str]
+
+    #: The `~DistributionPackage.version` of each package
+    versions: Sequence[Optional[str]]
+
+    #: The `~DistributionPackage.package_type` of each package
+    package_types: Sequence[Optional[str]]
+
+    #: The `~DistributionPackage.requires_python` of each package
+    requires_python: Sequence[Optional[str]]
+
+    #: The `~DistributionPackage.is_yanked` of each package
+    is_yanked: Sequence[bool]
+
+    #: The SHA256 digest of each package, or `None` if not known
+    sha256: Sequence[Optional[str]]
+
+    #: Whether the columns are NumPy arrays
+    use_numpy: bool = False
+
+    @classmethod
+    def from_page(
+        cls, page: ProjectPage, use_numpy: Optional[bool] = None
+    ) -> ColumnarProjectPage:
+        """
+        Construct a `ColumnarProjectPage` from a `ProjectPage`
+
+        :param ProjectPage page: the page to convert
+        :param Optional[bool] use_numpy: whether to store the columns as
+            NumPy arrays; the default is to do so if NumPy is installed
+        :rtype: ColumnarProjectPage
+        """
+        if use_numpy is None:
+            use_numpy = have_numpy()
+        pkgs = page.packages
+        columns: dict[str, list] = {
+            "packages": list(pkgs),
+            "filenames": [p.filename for p in pkgs],
+            "urls": [p.url for p in pkgs],
+            "versions": [p.version for p in pkgs],
+            "package_types": [p.package_type for p in pkgs],
+            "requires_python": [p.requires_python for p in pkgs],
+            "is_yanked": [p.is_yanked for p in pkgs],
+            "sha256": [p.digests.get("sha256") for p in pkgs],
+        }
+        if use_numpy:
+            import numpy as np
+
+            arrays: dict[str, Any] = {}
+            for name, values in columns.items():
+                if name == "is_yanked":
+                    arrays[name] = np.array(values, dtype=bool)
+                else:
+                    arrays[name] = np.empty(len(values), dtype=object)
+                    arrays[name][:] = values
+            return cls(
+                project=page.project,
+                repository_version=page.repository_version,
+                last_serial=page.last_serial,
+                use_numpy=True,
+                **arrays,
+            )
+        else:
+            return cls(
+                project=page.project,
+                repository_version=page.repository_version,
+                last_serial=page.last_serial,
+                use_numpy=False,
+                **columns,
+            )
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __iter__(self) -> Iterator[DistributionPackage]:
+        return iter(self.packages)
+
+    def to_page(self) -> ProjectPage:
+        """
+        Convert back to a `ProjectPage` containing the `DistributionPackage`
+        for each row
+
+        :rtype: ProjectPage
+        """
+        return ProjectPage(
+            project=self.project,
+            packages=list(self.packages),
+            repository_version=self.repository_version,
+            last_serial=self.last_serial,
+        )
+
+    def select(self, *columns: str) -> tuple[Sequence, ...]:
+        """
+        Return the given columns, in order
+
+        :param str columns: names of columns; see `COLUMNS`
+        :rtype: tuple
+        :raises ValueError: if an unknown column name is given
+        """
+        for c in columns:
+            if c not in COLUMNS:
+                raise ValueError(f"Unknown column: {c!r}")
+        return tuple(getattr(self, c) for c in columns)
+
+    def mask(
+        self,
+        package_types: Optional[Iterable[str]] = None,
+        yanked: Optional[bool] = None,
+        python_version: Optional[str] = None,
+    ) -> Sequence[bool]:
+        """
+        Return a mask of the rows matching all of the given criteria
+
+        :param package_types: if given, only match packages whose
+            `~DistributionPackage.package_type` is one of these values
+        :type package_types: Optional[Iterable[str]]
+        :param Optional[bool] yanked: if given, only match packages whose
+            `~DistributionPackage.is_yanked` equals this value
+        :param Optional[str] python_version: if given, only match packages
+            whose `~DistributionPackage.requires_python` is either unset,
+            invalid, or satisfied by this Python version
+        :rtype: Sequence[bool]
+        """
+        n = len(self)
+        conds: list[Any] = []
+        if package_types is not None:
+            types = set(package_types)
+            conds.append(self._mask_map(self.package_types, types.__contains__))
+        if yanked is not None:
+            if self.use_numpy:
+                import numpy as np
+
+                conds.append(
+                    self.is_yanked if yanked else np.logical_not(self.is_yanked)
+                )
+            else:
+                conds.append([y is yanked for y in self.is_yanked])
+        if python_version is not None:
+            pyver = Version(python_version)
+            # The set of distinct requires_python values on a page is small,
+            # so evaluate each one only once.
+            compat: dict[Optional[str], bool] = {}
+            for rp in set(self.requires_python):
+                if rp is None:
+                    compat[rp] = True
+                else:
+                    try:
+                        compat[rp] = SpecifierSet(rp).contains(pyver, prereleases=True)
+                    except InvalidSpecifier:
+                        compat[rp] = True
+            conds.append(self._mask_map(self.requires_python, compat.__getitem__))
+        if self.use_numpy:
+            import numpy as np
+
+            result = np.ones(n, dtype=bool)
+            for c in conds:
+                result &= c
+            return cast("Sequence[bool]", result)
+        elif not conds:
+            return [True] * n
+        else:
+            return [all(row) for row in zip(*conds)]
+
+    def where(self, mask: Sequence[bool]) -> ColumnarProjectPage:
+        """
+        Return a `ColumnarProjectPage` containing only the rows for which
+        ``mask`` is true
+
+        :param Sequence[bool] mask: a sequence of booleans with the same length
+            as the page, such as one returned by `mask()`
+        :rtype: ColumnarProjectPage
+        :raises ValueError: if ``mask`` has the wrong length
+        """
+        if len(mask) != len(self):
+            raise ValueError(
+                f"Mask length ({len(mask)}) does not match number of rows"
+                f" ({len(self)})"
+            )
+        columns: dict[str, Any] = {}
+        if self.use_numpy:
+            import numpy as np
+
+            bmask = np.asarray(mask, dtype=bool)
+            for c in COLUMNS:
+                columns[c] = getattr(self, c)[bmask]
+        else:
+            indices = [i for i, m in enumerate(mask) if m]
+            for c in COLUMNS:
+                col = getattr(self, c)
+                columns[c] = [col[i] for i in indices]
+        return type(self)(
+            project=self.project,
+            repository_version=self.repository_version,
+            last_serial=self.last_serial,
+            use_numpy=self.use_numpy,
+            **columns,
+        )
+
+    def filter(
+        self,
+        package_types: Optional[Iterable[str]] = None,
+        yanked: Optional[bool] = None,
+        python_version: Optional[str] = None,
+    ) -> ColumnarProjectPage:
+        """
+        Return a `ColumnarProjectPage` containing only the rows matching all
+        of the given criteria.  The parameters are the same as for `mask()`.
+
+        :rtype: ColumnarProjectPage
+        """
+        return self.where(
+            self.mask(
+                package_types=package_types,
+                yanked=yanked,
+                python_version=python_version,
+            )
+        )
+
+    def _mask_map(self, column: Sequence, func: Any) -> Sequence[bool]:
+        if self.use_numpy:
+            import numpy as np
+
+            return cast(
+                "Sequence[bool]",
+                np.fromiter(map(func, column), dtype=bool, count=len(column)),
+            )
+        else:
+            return list(map(func, column))
@@ -0,0 +1,347 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, fields
+import sys
+from typing import Any, Optional, TypeVar, cast
+from urllib.parse import urlparse, urlunparse
+from .classes import DistributionPackage, IndexPage, ProjectPage
+from .html import Link
+
+T = TypeVar("T")
+
+
+def slotted(cls: type[T]) -> type[T]:
+    """
+    Recreate a dataclass so that it stores its fields in ``__slots__`` instead
+    of an instance ``__dict__``.  This is equivalent to
+    ``@dataclass(slots=True)``, which is only available on Python 3.10+.
+    """
+    names = tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+    ns = dict(cls.__dict__)
+    for name in names:
+        # Remove field defaults, which would otherwise conflict with the
+        # slots; the generated `__init__` already knows about them.
+        ns.pop(name, None)
+    ns.pop("__dict__", None)
+    ns.pop("__weakref__", None)
+    ns["__slots__"] = names
+    # Frozen dataclasses can't be unpickled with the default `__setstate__`,
+    # which uses `setattr()`.
+    ns["__getstate__"] = _getstate
+    ns["__setstate__"] = _setstate
+    metaclass: Any = type(cls)
+    return cast("type[T]", metaclass(cls.__name__, cls.__bases__, ns))
+
+
+def _getstate(self: Any) -> tuple:
+    return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _setstate(self: Any, state: tuple) -> None:
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+def intern_keys(d: dict[str, T]) -> dict[str, T]:
+    return {sys.intern(k): v for k, v in d.items()}
+
+
+def intern_opt(s: Optional[str]) -> Optional[str]:
+    return None if s is None else sys.intern(s)
+
+
+@slotted
+@dataclass(frozen=True)
+class CompactLink:
+    """
+    .. versionadded:: 1.1.0
+
+    An immutable, slotted equivalent of `Link` with the same attributes.
+    Attribute names are interned so that they are shared between instances.
+    Instances are hashable, though `attrs` does not contribute to the hash.
+    """
+
+    #: The text inside the link tag, with leading & trailing whitespace removed
+    #: and with any tags nested inside the link tags ignored
+    text: str
+
+    #: The URL that the link points to, resolved relative to the URL of the
+    #: source HTML page and relative to the page's ``<base>`` href value, if
+    #: any
+    url: str
+
+    #: A dictionary of attributes set on the link tag; see `Link.attrs`
+    attrs: dict[str, str | list[str]] = field(hash=False)
+
+    @classmethod
+    def from_link(cls, link: Link) -> CompactLink:
+        """
+        Construct a `CompactLink` from a `Link`
+
+        :param Link link: the link to convert
+        :rtype: CompactLink
+        """
+        return cls(text=link.text, url=link.url, attrs=intern_keys(link.attrs))
+
+    def to_link(self) -> Link:
+        """
+        Convert back to a `Link`
+
+        :rtype: Link
+        """
+        return Link(text=self.text, url=self.url, attrs=dict(self.attrs))
+
+
+@slotted
+@dataclass(frozen=True)
+class CompactDistributionPackage:
+    """
+    .. versionadded:: 1.1.0
+
+    An immutable, slotted equivalent of `DistributionPackage` with the same
+    attributes and properties.  Project names, package types,
+    ``requires_python`` strings, and hash algorithm names are interned so that
+    they are shared between instances.  Instead of a per-instance `dict`, the
+    file's digests are stored as `sha256` and `other_digests`, from which
+    `digests` is built when accessed.  Instances are hashable, though
+    `metadata_digests` does not contribute to the hash.
+    """
+
+    #: The basename of the package file
+    filename: str
+
+    #: The URL from which the package file can be downloaded, with any hash
+    #: digest fragment removed
+    url: str
+
+    #: The name of the project (as extracted from the filename), or `None` if
+    #: the filename cannot be parsed
+    project: Optional[str]
+
+    #: The project version (as extracted from the filename), or `None` if the
+    #: filename cannot be parsed
+    version: Optional[str]
+
+    #: The type of the package, or `None` if the filename cannot be parsed;
+    #: see `DistributionPackage.package_type`
+    package_type: Optional[str]
+
+    #: The hex-encoded SHA256 digest of the file, or `None` if not known
+    sha256: Optional[str]
+
+    #: An optional version specifier string declaring the Python version(s) in
+    #: which the package can be installed
+    requires_python: Optional[str]
+
+    #: Whether the package file is accompanied by a PGP signature file.  This
+    #: is `None` if the package repository does not report such information.
+    has_sig: Optional[bool]
+
+    #: Whether the package file has been "yanked" from the package repository
+    is_yanked: bool = False
+
+    #: If the package file has been "yanked" and a reason is given, this
+    #: attribute will contain that (possibly empty) reason
+    yanked_reason: Optional[str] = None
+
+    #: Whether the package file is accompanied by a Core Metadata file.  This
+    #: is `None` if the package repository does not report such information.
+    has_metadata: Optional[bool] = None
+
+    #: If the package repository provides a Core Metadata file for the package,
+    #: this is a (possibly empty) `dict` of digests of the file; otherwise, it
+    #: is `None`
+    metadata_digests: Optional[dict[str, str]] = field(default=None, hash=False)
+
+    #: Any digests of the file using algorithms other than SHA256, as a tuple
+    #: of ``(algorithm, hex digest)`` pairs sorted by algorithm name
+    other_digests: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def digests(self) -> dict[str, str]:
+        """
+        A collection of hash digests for the file as a `dict` mapping hash
+        algorithm names to hex-encoded digest strings.  A new `dict` is
+        constructed on each access.
+        """
+        digests = dict(self.other_digests)
+        if self.sha256 is not None:
+            digests["sha256"] = self.sha256
+        return digests
+
+    @property
+    def sig_url(self) -> str:
+        """
+        The URL of the package file's PGP signature file, if it exists; cf.
+        `has_sig`
+        """
+        u = urlparse(self.url)
+        return urlunparse((u[0], u[1], u[2] + ".asc", "", "", ""))
+
+    @property
+    def metadata_url(self) -> str:
+        """
+        The URL of the package file's Core Metadata file, if it exists; cf.
+        `has_metadata`
+        """
+        u = urlparse(self.url)
+        return urlunparse((u[0], u[1], u[2] + ".metadata", "", "", ""))
+
+    @classmethod
+    def from_package(cls, pkg: DistributionPackage) -> CompactDistributionPackage:
+        """
+        Construct a `CompactDistributionPackage` from a `DistributionPackage`
+
+        :param DistributionPackage pkg: the package to convert
+        :rtype: CompactDistributionPackage
+        """
+        return cls(
+            filename=pkg.filename,
+            url=pkg.url,
+            project=intern_opt(pkg.project),
+            version=pkg.version,
+            package_type=intern_opt(pkg.package_type),
+            sha256=pkg.digests.get("sha256"),
+            requires_python=intern_opt(pkg.requires_python),
+            has_sig=pkg.has_sig,
+            is_yanked=pkg.is_yanked,
+            yanked_reason=pkg.yanked_reason,
+            has_metadata=pkg.has_metadata,
+            metadata_digests=(
+                intern_keys(pkg.metadata_digests)
+                if pkg.metadata_digests is not None
+                else None
+            ),
+            other_digests=tuple(
+                sorted(
+                    (sys.intern(alg), value)
+                    for alg, value in pkg.digests.items()
+                    if alg != "sha256"
+                )
+            ),
+        )
+
+    def to_package(self) -> DistributionPackage:
+        """
+        Convert back to a `DistributionPackage`
+
+        :rtype: DistributionPackage
+        """
+        return DistributionPackage(
+            filename=self.filename,
+            url=self.url,
+            project=self.project,
+            version=self.version,
+            package_type=self.package_type,
+            digests=self.digests,
+            requires_python=self.requires_python,
+            has_sig=self.has_sig,
+            is_yanked=self.is_yanked,
+            yanked_reason=self.yanked_reason,
+            has_metadata=self.has_metadata,
+            metadata_digests=(
+                dict(self.metadata_digests)
+                if self.metadata_digests is not None
+                else None
+            ),
+        )
+
+
+@slotted
+@dataclass(frozen=True)
+class CompactProjectPage:
+    """
+    .. versionadded:: 1.1.0
+
+    An immutable, slotted, hashable equivalent of `ProjectPage` in which
+    `packages` is a `tuple` of `CompactDistributionPackage`\\s
+    """
+
+    #: The name of the project the page is for
+    project: str
+
+    #: A tuple of packages listed on the project page
+    packages: tuple[CompactDistributionPackage, ...]
+
+    #: The repository version reported by the page, or `None` if not specified
+    repository_version: Optional[str]
+
+    #: The value of the :mailheader:`X-PyPI-Last-Serial` response header
+    #: returned when fetching the page, or `None` if not specified
+    last_serial: Optional[str]
+
+    @classmethod
+    def from_page(cls, page: ProjectPage) -> CompactProjectPage:
+        """
+        Construct a `CompactProjectPage` from a `ProjectPage`
+
+        :param ProjectPage page: the page to convert
+        :rtype: CompactProjectPage
+        """
+        return cls(
+            project=sys.intern(page.project),
+            packages=tuple(
+                CompactDistributionPackage.from_package(pkg) for pkg in page.packages
+            ),
+            repository_version=intern_opt(page.repository_version),
+            last_serial=page.last_serial,
+        )
+
+    def to_page(self) -> ProjectPage:
+        """
+        Convert back to a `ProjectPage`
+
+        :rtype: ProjectPage
+        """
+        return ProjectPage(
+            project=self.project,
+            packages=[pkg.to_package() for pkg in self.packages],
+            repository_version=self.repository_version,
+            last_serial=self.last_serial,
+        )
+
+
+@slotted
+@dataclass(frozen=True)
+class CompactIndexPage:
+    """
+    .. versionadded:: 1.1.0
+
+    An immutable, slotted, hashable equivalent of `IndexPage` in which
+    `projects` is a `tuple` of interned project names
+    """
+
+    #: The project names listed in the index
+    projects: tuple[str, ...]
+
+    #: The repository version reported by the page, or `None` if not specified
+    repository_version: Optional[str]
+
+    #: The value of the :mailheader:`X-PyPI-Last-Serial` response header
+    #: returned when fetching the page, or `None` if not specified
+    last_serial: Optional[str]
+
+    @classmethod
+    def from_page(cls, page: IndexPage) -> CompactIndexPage:
+        """
+        Construct a `CompactIndexPage` from an `IndexPage`
+
+        :param IndexPage page: the page to convert
+        :rtype: CompactIndexPage
+        """
+        return cls(
+            projects=tuple(sys.intern(name) for name in page.projects),
+            repository_version=intern_opt(page.repository_version),
+            last_serial=page.last_serial,
+        )
+
+    def to_page(self) -> IndexPage:
+        """
+        Convert back to an `IndexPage`
+
+        :rtype: IndexPage
+        """
+        return IndexPage(
+            projects=list(self.projects),
+            repository_version=self.repository_version,
+            last_serial=self.last_serial,
+        )
@@ -52,8 +52,9 @@ class UnsupportedContentTypeError(ValueError):
 
 class NoDigestsError(ValueError):
     """
-    Raised by `PyPISimple.download_package()` with ``verify=True`` when the
-    given package does not have any digests with known algorithms
+    Raised by `PyPISimple.download_package()` and related methods with
+    ``verify=True`` when the given package does not have any digests with
+    known algorithms
     """
 
     pass
@@ -61,8 +62,9 @@ class NoDigestsError(ValueError):
 
 class DigestMismatchError(ValueError):
     """
-    Raised by `PyPISimple.download_package()` with ``verify=True`` when the
-    digest of the downloaded file does not match the expected value
+    Raised by `PyPISimple.download_package()` and related methods with
+    ``verify=True`` when the digest of the downloaded file does not match the
+    expected value
     """
 
     def __init__(
@@ -82,6 +84,43 @@ class DigestMismatchError(ValueError):
         )
 
 
+class DownloadTooLargeError(ValueError):
+    """
+    .. versionadded:: 1.1.0
+
+    Raised by `PyPISimple.download_package_bytes()` when the package file is
+    larger than the given ``max_size``, and by
+    `PyPISimple.get_sdist_pkg_info_bytes()` when the sdist's :file:`PKG-INFO`
+    file is larger than 1 MiB
+    """
+
+    def __init__(self, url: str, max_size: int) -> None:
+        #: The URL of the package file
+        self.url = url
+        #: The maximum size in bytes that was allowed
+        self.max_size = max_size
+
+    def __str__(self) -> str:
+        return f"File at {self.url} exceeds maximum size of {self.max_size} bytes"
+
+
+class NoMetadataError(Exception):
+    """
+    .. versionadded:: 1.1.0
+
+    Raised by `PyPISimple.get_package_metadata()` and related methods when a
+    request for a distribution package's Core Metadata file fails with a 404
+    error code
+    """
+
+    def __init__(self, filename: str) -> None:
+        #: The filename of the package whose metadata was requested
+        self.filename = filename
+
+    def __str__(self) -> str:
+        return f"No distribution metadata found for {self.filename}"
+
+
 class UnparsableFilenameError(ValueError):
     """
     .. versionadded:: 1.0.0
@@ -1,6 +1,9 @@
 from __future__ import annotations
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Optional
+from typing import List, Optional, Tuple
 from .errors import UnparsableFilenameError
 
 PROJECT_NAME = r"[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?"
@@ -78,6 +81,68 @@ BAD_PACKAGE_RGXN = [
     for pkg_type, rgx in BAD_PACKAGE_BASES
 ]
 
+#: The final filename suffixes that can be matched by `ARCHIVE_EXT`
+ARCHIVE_SUFFIXES = [
+    ".tar",
+    ".bz2",
+    ".gz",
+    ".lz",
+    ".lzma",
+    ".xz",
+    ".Z",
+    ".tbz",
+    ".tgz",
+    ".tlz",
+    ".txz",
+    ".zip",
+]
+
+#: Mapping from final filename suffixes to the types of packages that can have
+#: that suffix
+SUFFIX_TYPES = {
+    ".egg": ["egg"],
+    ".rpm": ["rpm"],
+    ".whl": ["wheel"],
+    ".msi": ["msi"],
+    ".exe": ["wininst"],
+    **{sfx: ["dumb", "sdist"] for sfx in ARCHIVE_SUFFIXES},
+}
+
+RegexList = List[Tuple[str, "re.Pattern[str]"]]
+
+#: Mapping from final filename suffixes to the subsets of `GOOD_PACKAGE_RGXN`,
+#: `BAD_PACKAGE_BASES`, and `BAD_PACKAGE_RGXN` (in that order) that can match a
+#: filename with that suffix.  The relative order of the regexes in each list
+#: is preserved so that dispatching on the suffix does not change the result.
+SUFFIX_GRAMMARS: dict[str, tuple[RegexList, RegexList, RegexList]] = {
+    sfx: (
+        [(t, rgx) for t, rgx in GOOD_PACKAGE_RGXN if t in types],
+        [(t, rgx) for t, rgx in BAD_PACKAGE_BASES if t in types],
+        [(t, rgx) for t, rgx in BAD_PACKAGE_RGXN if t in types],
+    )
+    for sfx, types in SUFFIX_TYPES.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def project_hint_regex(project_hint: str) -> re.Pattern[str]:
+    """
+    Return a compiled regex that matches the spelling of ``project_hint`` (or
+    any name that normalizes to the same value) at the start of a package
+    filename, followed by a hyphen.
+
+    As all of the filenames on a project page are usually parsed with the same
+    hint, the compiled regexes are cached.  Statistics on the cache can be
+    obtained via ``project_hint_regex.cache_info()``.
+    """
+    proj_rgx = re.sub(r"[^A-Za-z0-9]+", "[-_.]+", project_hint)
+    proj_rgx = re.sub(
+        r"([A-Za-z])",
+        lambda m: "[" + m.group(1).upper() + m.group(1).lower() + "]",
+        proj_rgx,
+    )
+    return re.compile(proj_rgx + r"(?=-)")
+
 
 def parse_filename(
     filename: str, project_hint: Optional[str] = None
@@ -119,27 +184,111 @@ def parse_filename(
     :rtype: tuple[str, str, str]
     :raises UnparsableFilenameError: if the filename cannot be parsed
     """
-    for pkg_type, rgx in GOOD_PACKAGE_RGXN:
+    hint_rgx = project_hint_regex(project_hint) if project_hint is not None else None
+    parsed = _parse_filename(filename, hint_rgx)
+    if parsed is None:
+        raise UnparsableFilenameError(filename)
+    return parsed
+
+
+def _parse_filename(
+    filename: str, hint_rgx: Optional[re.Pattern[str]]
+) -> Optional[tuple[str, str, str]]:
+    # `$` in the regexes also matches before a trailing newline, so ignore any
+    # such newline when determining the suffix.
+    _, _, ext = filename.rstrip("\n").rpartition(".")
+    try:
+        good_rgxn, bad_bases, bad_rgxn = SUFFIX_GRAMMARS["." + ext]
+    except KeyError:
+        return None
+    for pkg_type, rgx in good_rgxn:
         m = rgx.match(filename)
         if m:
             return (m.group("project"), m.group("version"), pkg_type)
-    if project_hint is not None:
-        proj_rgx = re.sub(r"[^A-Za-z0-9]+", "[-_.]+", project_hint)
-        proj_rgx = re.sub(
-            r"([A-Za-z])",
-            lambda m: "[" + m.group(1).upper() + m.group(1).lower() + "]",
-            proj_rgx,
-        )
-        m = re.match(proj_rgx + r"(?=-)", filename)
+    if hint_rgx is not None:
+        m = hint_rgx.match(filename)
         if m:
             project = m.group(0)
             rest_of_name = filename[m.end(0) :]
-            for pkg_type, rgx in BAD_PACKAGE_BASES:
+            for pkg_type, rgx in bad_bases:
                 m = rgx.match(rest_of_name)
                 if m:
                     return (project, m.group("version"), pkg_type)
-    for pkg_type, rgx in BAD_PACKAGE_RGXN:
+    for pkg_type, rgx in bad_rgxn:
         m = rgx.match(filename)
         if m:
             return (m.group("project"), m.group("version"), pkg_type)
-    raise UnparsableFilenameError(filename)
+    return None
+
+
+@dataclass
+class ParsedFilenames:
+    """
+    .. versionadded:: 1.1.0
+
+    The results of parsing a sequence of filenames with `parse_filenames()`,
+    stored as parallel lists.  The entries for filenames that could not be
+    parsed are `None` in each of `projects`, `versions`, and `package_types`.
+    """
+
+    #: The filenames that were parsed
+    filenames: list[str]
+
+    #: The project names parsed from the filenames
+    projects: list[Optional[str]]
+
+    #: The versions parsed from the filenames
+    versions: list[Optional[str]]
+
+    #: The package types parsed from the filenames
+    package_types: list[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def __getitem__(self, i: int) -> Optional[tuple[str, str, str]]:
+        """
+        Return the project name, version, and package type for the ``i``-th
+        filename as a triple, or `None` if the filename could not be parsed
+        """
+        pkg_type = self.package_types[i]
+        if pkg_type is None:
+            return None
+        project = self.projects[i]
+        version = self.versions[i]
+        assert project is not None and version is not None
+        return (project, version, pkg_type)
+
+
+def parse_filenames(
+    filenames: Iterable[str], project_hint: Optional[str] = None
+) -> ParsedFilenames:
+    """
+    .. versionadded:: 1.1.0
+
+    Parse multiple package filenames at once, as though by calling
+    `parse_filename()` on each one with the same ``project_hint``, and return
+    the results in columnar form.  Filenames that cannot be parsed are
+    recorded with `None` values instead of causing an error.
+
+    :param Iterable[str] filenames: the package filenames to parse
+    :param Optional[str] project_hint: Optionally, the expected value for the
+        project name of every filename.  The name does not need to be
+        normalized.
+    :rtype: ParsedFilenames
+    """
+    hint_rgx = project_hint_regex(project_hint) if project_hint is not None else None
+    result = ParsedFilenames(filenames=[], projects=[], versions=[], package_types=[])
+    for filename in filenames:
+        parsed = _parse_filename(filename, hint_rgx)
+        result.filenames.append(filename)
+        if parsed is None:
+            result.projects.append(None)
+            result.versions.append(None)
+            result.package_types.append(None)
+        else:
+            project, version, pkg_type = parsed
+            result.projects.append(project)
+            result.versions.append(version)
+            result.package_types.append(pkg_type)
+    return result
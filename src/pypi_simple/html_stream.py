@@ -5,10 +5,11 @@ from html.parser import HTMLParser
 from itertools import chain
 from typing import AnyStr, Optional, cast
 from urllib.parse import urljoin
+from bs4.builder import HTMLTreeBuilder
 from bs4.dammit import EncodingDetector
 import requests
 from .html import Link
-from .util import check_repo_version
+from .util import basejoin, check_repo_version
 
 # List taken from BeautifulSoup4 source
 EMPTY_TAGS = {
@@ -38,6 +39,16 @@ EMPTY_TAGS = {
     "spacer",
 }
 
+#: Attributes of ``<a>`` tags that Beautiful Soup treats as "CDATA list
+#: attributes" and converts to lists of whitespace-separated values
+CDATA_LIST_ATTRIBUTES = frozenset(
+    HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES.get("*", [])
+) | frozenset(HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES.get("a", []))
+
+
+#: Elements whose contents Beautiful Soup omits from a tag's ``.strings``
+NON_TEXT_TAGS = frozenset(["script", "style", "template"])
+
 
 class LinkParser(HTMLParser):
     def __init__(self, base_url: Optional[str] = None) -> None:
@@ -108,6 +119,88 @@ class LinkParser(HTMLParser):
         super().close()
 
 
+class RepositoryPageParser(HTMLParser):
+    """
+    A parser for complete HTML documents that extracts the same information as
+    `RepositoryPage.from_html()` does with Beautiful Soup — the first
+    ``<base>`` href, the first :pep:`629` ``<meta>`` tag, and all ``<a>`` tags
+    with ``href`` attributes — in a single pass without building a tree
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base_href: Optional[str] = None
+        self.repository_version: Optional[str] = None
+        self.tag_stack: list[str] = []
+        #: Attributes & text fragments of each ``<a>`` tag, in document order
+        self.links: list[tuple[dict[str, str | list[str]], list[str]]] = []
+        #: Text fragment lists of the currently-open ``<a>`` tags
+        self.open_links: list[list[str]] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            self.tag_stack.append(tag)
+            attrdict: dict[str, str | list[str]] = {}
+            for k, v in attrs:
+                if k in CDATA_LIST_ATTRIBUTES:
+                    attrdict[k] = (v or "").split()
+                else:
+                    attrdict[k] = v or ""
+            text: list[str] = []
+            self.links.append((attrdict, text))
+            self.open_links.append(text)
+            return
+        if tag not in EMPTY_TAGS:
+            self.tag_stack.append(tag)
+        if tag == "base" and self.base_href is None:
+            for k, v in attrs:
+                if k == "href":
+                    self.base_href = v or ""
+        elif tag == "meta" and self.repository_version is None:
+            metaattrs = dict(attrs)
+            if (
+                metaattrs.get("name") == "pypi:repository-version"
+                and "content" in metaattrs
+            ):
+                self.repository_version = metaattrs["content"] or ""
+
+    def handle_endtag(self, tag: str) -> None:
+        for i in range(len(self.tag_stack) - 1, -1, -1):
+            if self.tag_stack[i] == tag:
+                for t in self.tag_stack[i:]:
+                    if t == "a":
+                        self.open_links.pop()
+                del self.tag_stack[i:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self.open_links and NON_TEXT_TAGS.isdisjoint(self.tag_stack):
+            for text in self.open_links:
+                text.append(data)
+
+    def get_links(self, base_url: Optional[str] = None) -> list[Link]:
+        """
+        Return the `Link` objects for the ``<a>`` tags with ``href`` attributes
+        found in the document, resolved relative to ``base_url`` and the
+        document's ``<base>`` href, if any
+        """
+        if self.base_href is not None:
+            base_url = basejoin(base_url, self.base_href)
+        links = []
+        for attrs, text in self.links:
+            href = attrs.get("href")
+            if href is not None:
+                assert isinstance(href, str)
+                links.append(
+                    Link(
+                        text="".join(text).strip(),
+                        url=basejoin(base_url, href),
+                        attrs=attrs,
+                    )
+                )
+        return links
+
+
 def parse_links_stream_response(
     r: requests.Response, chunk_size: int = 65535
 ) -> Iterator[Link]:
@@ -237,6 +330,27 @@ def iterhtmldecode(
             initblob += next(iterator)
         except StopIteration:
             break
+    initblob, enc = detect_html_encoding(initblob, http_charset, default_encoding)
+    return iterdecode(chain([initblob], iterator), enc, errors=errors)
+
+
+def detect_html_encoding(
+    initblob: bytes,
+    http_charset: Optional[str] = None,
+    default_encoding: str = "cp1252",
+) -> tuple[bytes, str]:
+    """
+    Determine the encoding of an HTML document from its first few bytes as
+    described in `iterhtmldecode()`.  Returns the initial bytes with any
+    byte-order mark stripped, along with the name of the encoding.
+
+    :param bytes initblob: the start of the HTML document
+    :param Optional[str] http_charset: the document's encoding as declared by
+        the transport layer, if any
+    :param str default_encoding: the default encoding to fall back to if none
+        of the other sources succeed in determining the encoding
+    :rtype: tuple[bytes, str]
+    """
     enc: Optional[str]
     initblob, enc = EncodingDetector.strip_byte_order_mark(initblob)
     if enc is None:
@@ -251,7 +365,7 @@ def iterhtmldecode(
             if enc is None:
                 enc = default_encoding
     assert isinstance(enc, str)
-    return iterdecode(chain([initblob], iterator), enc, errors=errors)
+    return (initblob, enc)
 
 
 def iterdecode(
@@ -0,0 +1,211 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from itertools import chain
+import json
+from typing import Any, AnyStr, Optional, cast
+from .html_stream import iterdecode
+from .pep691 import validate_meta
+from .util import check_repo_version
+
+WHITESPACE = " \t\n\r"
+
+
+class State(Enum):
+    START = 1
+    KEY = 2
+    FIRST_KEY = 3
+    COLON = 4
+    VALUE = 5
+    AFTER_VALUE = 6
+    PROJECTS_START = 7
+    PROJECT = 8
+    FIRST_PROJECT = 9
+    AFTER_PROJECT = 10
+    END = 11
+
+
+class ProjectNamesParser:
+    """
+    An incremental parser for :pep:`691` project list JSON documents that
+    extracts the names of the projects in the ``"projects"`` array as the
+    document is fed to it piece by piece.  Only one element of the array is
+    ever decoded at a time, so memory usage does not depend on the size of
+    the document.
+
+    The repository version in the ``"meta"`` field is checked as soon as the
+    field is parsed; if the field comes after the ``"projects"`` array in the
+    document, names will be returned before the version is checked.
+    """
+
+    def __init__(self) -> None:
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.state = State.START
+        self.key: Optional[str] = None
+        self.meta_seen = False
+
+    def feed(self, data: str) -> list[str]:
+        """
+        Feed the next piece of the document to the parser and return a list
+        of any project names that were completed by it
+        """
+        self.buf += data
+        return self._parse(final=False)
+
+    def close(self) -> list[str]:
+        """
+        Signal the end of the document to the parser and return any remaining
+        project names
+
+        :raises ValueError:
+            if the document is malformed or does not contain a ``"meta"``
+            field
+        """
+        names = self._parse(final=True)
+        if self.state is not State.END:
+            raise ValueError("Project list JSON document ended prematurely")
+        if not self.meta_seen:
+            raise ValueError('Project list JSON document lacks "meta" field')
+        return names
+
+    def _parse(self, final: bool) -> list[str]:
+        names: list[str] = []
+        buf = self.buf
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in WHITESPACE:
+                pos += 1
+            if pos >= len(buf):
+                break
+            c = buf[pos]
+            if self.state is State.START:
+                self._expect(c, "{")
+                pos += 1
+                self.state = State.FIRST_KEY
+            elif self.state in (State.KEY, State.FIRST_KEY):
+                if c == "}" and self.state is State.FIRST_KEY:
+                    pos += 1
+                    self.state = State.END
+                    continue
+                r = self._decode(buf, pos, final)
+                if r is None:
+                    break
+                self.key, pos = r
+                if not isinstance(self.key, str):
+                    raise ValueError("Expected string key in JSON object")
+                self.state = State.COLON
+            elif self.state is State.COLON:
+                self._expect(c, ":")
+                pos += 1
+                if self.key == "projects":
+                    self.state = State.PROJECTS_START
+                else:
+                    self.state = State.VALUE
+            elif self.state is State.VALUE:
+                r = self._decode(buf, pos, final)
+                if r is None:
+                    break
+                value, pos = r
+                if self.key == "meta":
+                    api_version, _ = validate_meta(value)
+                    check_repo_version(api_version)
+                    self.meta_seen = True
+                self.state = State.AFTER_VALUE
+            elif self.state is State.AFTER_VALUE:
+                if c == ",":
+                    self.state = State.KEY
+                else:
+                    self._expect(c, "}")
+                    self.state = State.END
+                pos += 1
+            elif self.state is State.PROJECTS_START:
+                self._expect(c, "[")
+                pos += 1
+                self.state = State.FIRST_PROJECT
+            elif self.state in (State.PROJECT, State.FIRST_PROJECT):
+                if c == "]" and self.state is State.FIRST_PROJECT:
+                    pos += 1
+                    self.state = State.AFTER_VALUE
+                    continue
+                r = self._decode(buf, pos, final)
+                if r is None:
+                    break
+                item, pos = r
+                if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+                    raise ValueError(
+                        f"Invalid entry in project list JSON document: {item!r}"
+                    )
+                names.append(item["name"])
+                self.state = State.AFTER_PROJECT
+            elif self.state is State.AFTER_PROJECT:
+                if c == ",":
+                    self.state = State.PROJECT
+                else:
+                    self._expect(c, "]")
+                    self.state = State.AFTER_VALUE
+                pos += 1
+            else:
+                assert self.state is State.END
+                raise ValueError("Extra data after end of JSON document")
+        self.buf = buf[pos:]
+        return names
+
+    def _decode(self, buf: str, pos: int, final: bool) -> Optional[tuple[Any, int]]:
+        """
+        Decode the JSON value starting at ``pos`` in ``buf``.  If the value may
+        be incomplete and more data is to come, return `None`.
+        """
+        try:
+            value, end = self.decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        if end >= len(buf) and not final and buf[end - 1] not in '"]}':
+            # The value may be a number or literal that continues in the next
+            # piece of the document.
+            return None
+        return (value, end)
+
+    @staticmethod
+    def _expect(c: str, expected: str) -> None:
+        if c != expected:
+            raise ValueError(
+                f"Expected {expected!r} in project list JSON document, got {c!r}"
+            )
+
+
+def parse_project_names_stream(jsonseq: Iterable[AnyStr]) -> Iterator[str]:
+    """
+    Parse a :pep:`691` project list JSON document given as an iterable of
+    `bytes` or `str` and yield the name of each project as it is encountered.
+    `bytes` are decoded as UTF-8.
+
+    :param Iterable[AnyStr] jsonseq: an iterable of either `bytes` or `str`
+        that, when joined together, form a JSON document to parse
+    :rtype: Iterator[str]
+    :raises ValueError: if the document is malformed
+    :raises UnsupportedRepoVersionError: if the repository version has a
+        greater major component than the supported repository version
+    """
+    parser = ProjectNamesParser()
+    for piece in iterjsondecode(jsonseq):
+        yield from parser.feed(piece)
+    yield from parser.close()
+
+
+def iterjsondecode(iterable: Iterable[AnyStr]) -> Iterator[str]:
+    """
+    Decode an iterable of `bytes` that together form a JSON document as UTF-8
+    one element at a time.  As a convenience, if an iterable of `str` objects
+    is passed, the elements of the iterable are yielded unmodified.
+    """
+    iterator = iter(iterable)
+    try:
+        initblob = next(iterator)
+    except StopIteration:
+        return iter(cast("list[str]", []))
+    if isinstance(initblob, str):
+        return chain([initblob], iterator)
+    return iterdecode(chain([initblob], iterator), "utf-8-sig")
@@ -0,0 +1,293 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from email.utils import formatdate, parsedate_to_datetime
+import io
+import mimetypes
+import os
+from pathlib import Path
+import re
+from typing import Any, Optional
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import HTTPResponse
+
+#: The files served for a request for a directory, in order of preference
+#: when the client accepts them equally, along with the content types they
+#: can be served as
+INDEX_FILES: list[tuple[str, list[str]]] = [
+    ("index.json", ["application/vnd.pypi.simple.v1+json"]),
+    ("index.html", ["application/vnd.pypi.simple.v1+html", "text/html"]),
+]
+
+REASONS = {
+    200: "OK",
+    206: "Partial Content",
+    301: "Moved Permanently",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    406: "Not Acceptable",
+    416: "Range Not Satisfiable",
+}
+
+
+class FileAdapter(BaseAdapter):
+    """
+    .. versionadded:: 1.1.0
+
+    A `requests` transport adapter that serves :samp:`file://{path}` URLs
+    from the local filesystem the way a static web server would serve a
+    simple repository such as one written by `Mirror`, so that a repository
+    on a local or network-mounted disk can be used without running an HTTP
+    server in front of it.  `PyPISimple` mounts one on its session when its
+    endpoint is a local directory.
+
+    - A request for a directory is answered with its :file:`index.json`
+      (as :pep:`691` JSON) or :file:`index.html`, whichever is preferred by
+      the request's :mailheader:`Accept` header; if neither is acceptable,
+      the response is a 406.  A request for a directory without a trailing
+      slash is redirected to the URL with one.
+    - Files are served with a :mailheader:`Content-Length` and a
+      :mailheader:`Last-Modified` header, the latter of which is used to
+      answer :mailheader:`If-Modified-Since` requests with a 304.
+    - Single byte ranges requested with a :mailheader:`Range` header are
+      honored.
+    - Missing files are answered with a 404, and methods other than ``GET``
+      and ``HEAD`` with a 405.
+
+    .. warning::
+
+        Mounting this adapter on a session used to talk to remote servers
+        allows those servers to read local files by redirecting to
+        ``file://`` URLs.
+    """
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        assert request.url is not None
+        method = (request.method or "GET").upper()
+        if method not in ("GET", "HEAD"):
+            return self._respond(request, 405, {"Allow": "GET, HEAD"})
+        parts = urlsplit(request.url)
+        if parts.netloc not in ("", "localhost"):
+            return self._respond(request, 400)
+        path = Path(url2pathname(parts.path))
+        content_type: Optional[str] = None
+        if path.is_dir():
+            if not parts.path.endswith("/"):
+                location = parts._replace(path=parts.path + "/").geturl()
+                return self._respond(request, 301, {"Location": location})
+            accept = request.headers.get("Accept")
+            candidates = [
+                (accept_quality(accept, ct), -i, -j, fname, ct)
+                for i, (fname, ctypes) in enumerate(INDEX_FILES)
+                if (path / fname).is_file()
+                for j, ct in enumerate(ctypes)
+            ]
+            if not candidates:
+                return self._respond(request, 404)
+            quality, _, _, fname, content_type = max(candidates)
+            if quality <= 0:
+                return self._respond(request, 406)
+            path = path / fname
+        try:
+            fp = path.open("rb")
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return self._respond(request, 404)
+        try:
+            st = os.fstat(fp.fileno())
+            if content_type is None:
+                content_type = (
+                    mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+                )
+            headers = {
+                "Content-Type": content_type,
+                "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+                "Accept-Ranges": "bytes",
+            }
+            if not_modified_since(
+                request.headers.get("If-Modified-Since"), st.st_mtime
+            ):
+                fp.close()
+                return self._respond(request, 304, headers)
+            size = st.st_size
+            status = 200
+            start, end = 0, size
+            byte_range = parse_range(request.headers.get("Range"), size)
+            if byte_range == "unsatisfiable":
+                fp.close()
+                headers["Content-Range"] = f"bytes */{size}"
+                return self._respond(request, 416, headers)
+            elif isinstance(byte_range, tuple):
+                status = 206
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            headers["Content-Length"] = str(end - start)
+            if method == "HEAD":
+                fp.close()
+                return self._respond(request, status, headers)
+            fp.seek(start)
+            body = FileRange(fp, end - start)
+        except BaseException:
+            fp.close()
+            raise
+        return self._respond(request, status, headers, body)
+
+    def close(self) -> None:
+        pass
+
+    def _respond(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        headers: Optional[dict[str, str]] = None,
+        body: Optional[io.RawIOBase] = None,
+    ) -> requests.Response:
+        """Construct a `requests.Response` for ``request``"""
+        hdrs: CaseInsensitiveDict[str] = CaseInsensitiveDict(headers or {})
+        hdrs.setdefault("Content-Length", "0")
+        r = requests.Response()
+        r.status_code = status
+        r.reason = REASONS.get(status, "")
+        r.headers = hdrs
+        r.encoding = get_encoding_from_headers(hdrs)
+        r.raw = HTTPResponse(
+            body=body if body is not None else io.BytesIO(),
+            headers=dict(hdrs),
+            status=status,
+            reason=r.reason,
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+        )
+        r.url = request.url or ""
+        r.request = request
+        r.connection = self  # type: ignore[assignment]
+        return r
+
+
+class FileRange(io.RawIOBase):
+    """
+    A readable stream of the next ``length`` bytes of the binary file ``fp``,
+    which is closed along with the stream
+    """
+
+    def __init__(self, fp: io.BufferedReader, length: int) -> None:
+        super().__init__()
+        self.fp = fp
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.fp.fileno()
+
+    def readinto(self, b: Any) -> int:
+        with memoryview(b) as view, view.cast("B") as out:
+            n = self.fp.readinto(out[: self.remaining])
+        self.remaining -= n
+        return n
+
+    def close(self) -> None:
+        self.fp.close()
+        super().close()
+
+
+def local_path(url: str) -> Optional[Path]:
+    """
+    If ``url`` is a :samp:`file://{path}` URL for the local host, return the
+    path it refers to; otherwise, return `None`
+    """
+    parts = urlsplit(url)
+    if parts.scheme.lower() == "file" and parts.netloc in ("", "localhost"):
+        return Path(url2pathname(parts.path))
+    else:
+        return None
+
+
+def accept_quality(accept: Optional[str], content_type: str) -> float:
+    """
+    Return the quality value that the :mailheader:`Accept` header value
+    ``accept`` assigns to ``content_type``, taking the most specific matching
+    media range; a missing header accepts everything
+    """
+    if accept is None:
+        return 1.0
+    maintype = content_type.partition("/")[0]
+    best: tuple[int, float] = (-1, 0.0)
+    for entry in accept.split(","):
+        media_range, *params = [p.strip() for p in entry.split(";")]
+        media_range = media_range.lower()
+        if media_range == content_type:
+            specificity = 2
+        elif media_range == f"{maintype}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if specificity > best[0]:
+            best = (specificity, q)
+    return best[1]
+
+
+def parse_range(value: Optional[str], size: int) -> tuple[int, int] | str | None:
+    """
+    Parse a :mailheader:`Range` header value requesting a single byte range
+    of a file of ``size`` bytes into a ``(start, end)`` pair, with ``end``
+    exclusive.  Returns ``"unsatisfiable"`` if the range lies outside the
+    file, or `None` if there is no header or it is not a single byte range,
+    in which case the header should be ignored.
+    """
+    if value is None:
+        return None
+    m = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", value, flags=re.I)
+    if m is None or not (m[1] or m[2]):
+        return None
+    if not m[1]:
+        suffix = int(m[2])
+        if suffix == 0:
+            return "unsatisfiable"
+        return (max(size - suffix, 0), size)
+    start = int(m[1])
+    end = int(m[2]) + 1 if m[2] else size
+    if m[2] and end <= start:
+        return None
+    elif start >= size:
+        return "unsatisfiable"
+    return (start, min(end, size))
+
+
+def not_modified_since(value: Optional[str], mtime: float) -> bool:
+    """
+    Test whether a file last modified at ``mtime`` is unchanged since the
+    time in the :mailheader:`If-Modified-Since` header value ``value``
+    """
+    if value is None:
+        return False
+    try:
+        since = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return False
+    return int(mtime) <= since.timestamp()
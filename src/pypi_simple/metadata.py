@@ -0,0 +1,62 @@
+from __future__ import annotations
+from email.parser import HeaderParser
+from email.policy import compat32
+from typing import Any
+
+#: Core Metadata fields that may occur more than once, per the `Core Metadata
+#: Specifications
+#: <https://packaging.python.org/en/latest/specifications/core-metadata/>`_
+MULTIPLE_USE_FIELDS = frozenset(
+    {
+        "classifier",
+        "dynamic",
+        "license_file",
+        "obsoletes",
+        "obsoletes_dist",
+        "platform",
+        "project_url",
+        "provides",
+        "provides_dist",
+        "provides_extra",
+        "requires",
+        "requires_dist",
+        "requires_external",
+        "supported_platform",
+    }
+)
+
+
+def parse_metadata(text: str) -> dict[str, Any]:
+    """
+    .. versionadded:: 1.1.0
+
+    Parse a Core Metadata document (such as a :file:`METADATA` or
+    :file:`PKG-INFO` file) into a `dict` following the JSON-compatible form
+    described in :pep:`566`:
+
+    - Field names are lowercased, and hyphens are replaced with underscores.
+    - The values of fields that may be used more than once are `list`\\s of
+      all values given for the field, in order.  Other fields are strings; if
+      one occurs more than once anyway, only its first value is kept.
+    - The value of ``Keywords`` is split on commas into a `list`.
+    - The message body, if nonempty, is stored under ``"description"``.
+
+    :param str text: the contents of a Core Metadata file
+    :rtype: dict[str, Any]
+    """
+    msg = HeaderParser(policy=compat32).parsestr(text)
+    data: dict[str, Any] = {}
+    for name, value in msg.items():
+        key = name.lower().replace("-", "_")
+        if key in MULTIPLE_USE_FIELDS:
+            data.setdefault(key, []).append(value)
+        elif key not in data:
+            data[key] = value
+    if "keywords" in data:
+        data["keywords"] = [
+            kw.strip() for kw in data["keywords"].split(",") if kw.strip()
+        ]
+    body = msg.get_payload()
+    if isinstance(body, str) and body.strip():
+        data["description"] = body
+    return data
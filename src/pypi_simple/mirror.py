@@ -0,0 +1,305 @@
+from __future__ import annotations
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from html import escape
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, AnyStr, Optional
+from urllib.parse import quote
+from packaging.utils import canonicalize_name as normalize
+from .classes import DistributionPackage, ProjectPage
+from .client import PyPISimple
+from .util import file_matches_digests
+
+
+@dataclass
+class SyncReport:
+    """
+    .. versionadded:: 1.1.0
+
+    The outcome of a call to `Mirror.sync()`.  All project names are
+    normalized.
+    """
+
+    #: Projects whose pages and files were updated
+    updated: list[str] = field(default_factory=list)
+
+    #: Projects whose serial had not changed since the last sync
+    unchanged: list[str] = field(default_factory=list)
+
+    #: Projects that could not be synced, mapped to the exception that
+    #: occurred.  These projects' mirrored pages are left as they were, so
+    #: they will be retried on the next sync.
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    #: The number of package files downloaded
+    downloaded: int = 0
+
+
+class Mirror:
+    """
+    .. versionadded:: 1.1.0
+
+    Maintains a local static mirror of a set of projects from a simple
+    repository, laid out so that it can be served by any static file server:
+
+    - :file:`{root}/simple/index.html` and :file:`{root}/simple/index.json`
+      list the mirrored projects.
+    - :file:`{root}/simple/{project}/index.html` and
+      :file:`{root}/simple/{project}/index.json` are the :pep:`503` HTML and
+      :pep:`691` JSON project pages, with links pointing to the local files.
+      The JSON page's ``meta`` records the page's last serial under
+      ``_last-serial``.
+    - :file:`{root}/packages/{project}/{filename}` are the package files.
+
+    Project pages are fetched concurrently with
+    `PyPISimple.get_project_pages()`, and only projects whose serial has
+    changed since they were last mirrored are rewritten.  The new package
+    files for each such project are downloaded concurrently with
+    `PyPISimple.download_packages()` and verified against their digests.
+    Each file is downloaded to a :file:`.part` file that is renamed into
+    place once it is complete, and the download of an interrupted
+    :file:`.part` file is resumed on the next sync.  Files that are already
+    present (and, if ``verify`` is true, match their digests) are not
+    downloaded again, as package files in a repository never change.  Files
+    no longer listed for a project are deleted.  A project's pages are only
+    written once all of its files have been downloaded, so a mirror that has
+    been interrupted or has encountered errors is always consistent and can
+    simply be synced again.
+
+    Core Metadata (:pep:`658`) and signature files are not mirrored.
+
+    :param PyPISimple client: the client to use for fetching pages & files
+    :param root: the directory in which to store the mirror
+    :param int max_workers: the number of pages or files to fetch
+        concurrently
+    :param bool verify: whether to verify downloaded files' digests
+    """
+
+    def __init__(
+        self,
+        client: PyPISimple,
+        root: AnyStr | os.PathLike[AnyStr],
+        max_workers: int = 10,
+        verify: bool = True,
+    ) -> None:
+        self.client = client
+        self.root = Path(os.fsdecode(root))
+        self.max_workers = max_workers
+        self.verify = verify
+
+    @property
+    def simple_dir(self) -> Path:
+        """The directory containing the mirror's simple API pages"""
+        return self.root / "simple"
+
+    @property
+    def packages_dir(self) -> Path:
+        """The directory containing the mirror's package files"""
+        return self.root / "packages"
+
+    def get_serial(self, project: str) -> Optional[str]:
+        """
+        Return the last serial of the mirrored copy of the given project, or
+        `None` if the project has not been mirrored or has no serial
+
+        :param str project: a project name; it need not be normalized
+        :rtype: Optional[str]
+        """
+        path = self.simple_dir / normalize(project) / "index.json"
+        try:
+            with path.open("r", encoding="utf-8") as fp:
+                serial = json.load(fp)["meta"]["_last-serial"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            return None
+        return None if serial is None else str(serial)
+
+    def sync(
+        self,
+        projects: Iterable[str],
+        serials: Optional[Mapping[str, str]] = None,
+    ) -> SyncReport:
+        """
+        Bring the mirror up to date for the given projects, and regenerate
+        the mirror's index to list all mirrored projects.
+
+        If ``serials`` is given, it should map normalized project names to
+        their current serials in the repository (as obtained from, e.g., the
+        repository's changelog); projects whose current serial equals that of
+        their mirrored copy are then skipped without fetching their pages at
+        all.  Otherwise, every project's page is fetched, and a project is
+        updated only if the page's `~ProjectPage.last_serial` differs from
+        that of the mirrored copy or either serial is unknown.  Pair the
+        client with a `PageCache` to make these fetches cheap conditional
+        requests.
+
+        :param Iterable[str] projects: the names of the projects to mirror;
+            they need not be normalized
+        :param serials: an optional mapping from normalized project names to
+            current serials
+        :type serials: Optional[Mapping[str, str]]
+        :rtype: SyncReport
+        """
+        report = SyncReport()
+        to_fetch: list[str] = []
+        for project in dict.fromkeys(str(normalize(p)) for p in projects):
+            if (
+                serials is not None
+                and serials.get(project) is not None
+                and serials.get(project) == self.get_serial(project)
+            ):
+                report.unchanged.append(project)
+            else:
+                to_fetch.append(project)
+        pages: dict[str, ProjectPage] = {}
+        for name, result in self.client.get_project_pages(
+            to_fetch, max_workers=self.max_workers
+        ):
+            if isinstance(result, Exception):
+                report.failed[name] = result
+            elif result.last_serial is not None and result.last_serial == (
+                self.get_serial(name)
+            ):
+                report.unchanged.append(name)
+            else:
+                pages[name] = result
+        for name, page in pages.items():
+            try:
+                missing = [
+                    pkg for pkg in page.packages if not self._is_present(name, pkg)
+                ]
+            except ValueError as e:
+                report.failed[name] = e
+                continue
+            for _, outcome in self.client.download_packages(
+                missing,
+                self.packages_dir / name,
+                max_workers=self.max_workers,
+                verify=self.verify,
+                resume=True,
+            ):
+                if isinstance(outcome, Exception):
+                    report.failed.setdefault(name, outcome)
+                else:
+                    report.downloaded += 1
+        for name, page in pages.items():
+            if name not in report.failed:
+                self._write_project(name, page)
+                report.updated.append(name)
+        self._write_index()
+        return report
+
+    def _is_present(self, project: str, pkg: DistributionPackage) -> bool:
+        """
+        Test whether ``pkg`` has already been downloaded into the mirror.  If
+        ``verify`` is true, an existing file only counts if it matches the
+        package's digests.
+        """
+        path = self._package_path(project, pkg)
+        if not path.is_file():
+            return False
+        return not self.verify or file_matches_digests(path, pkg.digests)
+
+    def _package_path(self, project: str, pkg: DistributionPackage) -> Path:
+        if (
+            not pkg.filename
+            or pkg.filename != os.path.basename(pkg.filename)
+            or pkg.filename in (".", "..")
+        ):
+            raise ValueError(f"Refusing to mirror unsafe filename {pkg.filename!r}")
+        return self.packages_dir / project / pkg.filename
+
+    def _write_project(self, project: str, page: ProjectPage) -> None:
+        """
+        Write the HTML & JSON pages for ``project`` and delete any package
+        files no longer listed on its page
+        """
+        files: list[dict[str, Any]] = []
+        links: list[str] = []
+        for pkg in page.packages:
+            url = f"../../packages/{quote(project)}/{quote(pkg.filename)}"
+            sha256 = pkg.digests.get("sha256")
+            href = url + (f"#sha256={sha256}" if sha256 else "")
+            attrs = [f'href="{escape(href)}"']
+            if pkg.requires_python is not None:
+                attrs.append(f'data-requires-python="{escape(pkg.requires_python)}"')
+            if pkg.is_yanked:
+                attrs.append(f'data-yanked="{escape(pkg.yanked_reason or "")}"')
+            links.append(f"    <a {' '.join(attrs)}>{escape(pkg.filename)}</a><br/>")
+            files.append(
+                {
+                    "filename": pkg.filename,
+                    "url": url,
+                    "hashes": pkg.digests,
+                    "requires-python": pkg.requires_python,
+                    "yanked": ((pkg.yanked_reason or True) if pkg.is_yanked else False),
+                }
+            )
+        html = (
+            "<!DOCTYPE html>\n<html>\n  <head>\n"
+            '    <meta name="pypi:repository-version" content="1.0">\n'
+            f"    <title>Links for {escape(page.project)}</title>\n"
+            "  </head>\n  <body>\n"
+            f"    <h1>Links for {escape(page.project)}</h1>\n"
+            + "".join(link + "\n" for link in links)
+            + "  </body>\n</html>\n"
+        )
+        data = {
+            "meta": {"api-version": "1.0", "_last-serial": page.last_serial},
+            "name": project,
+            "files": files,
+        }
+        pagedir = self.simple_dir / project
+        write_atomic(pagedir / "index.html", html)
+        write_atomic(pagedir / "index.json", json.dumps(data))
+        listed = {pkg.filename for pkg in page.packages}
+        pkgdir = self.packages_dir / project
+        if pkgdir.exists():
+            for p in pkgdir.iterdir():
+                if p.name not in listed and p.is_file():
+                    p.unlink()
+
+    def _write_index(self) -> None:
+        """Write the mirror's index pages listing all mirrored projects"""
+        if self.simple_dir.exists():
+            projects = sorted(
+                p.name for p in self.simple_dir.iterdir() if (p / "index.json").exists()
+            )
+        else:
+            projects = []
+        html = (
+            "<!DOCTYPE html>\n<html>\n  <head>\n"
+            '    <meta name="pypi:repository-version" content="1.0">\n'
+            "    <title>Simple index</title>\n"
+            "  </head>\n  <body>\n"
+            + "".join(
+                f'    <a href="{quote(p)}/">{escape(p)}</a><br/>\n' for p in projects
+            )
+            + "  </body>\n</html>\n"
+        )
+        data = {
+            "meta": {"api-version": "1.0"},
+            "projects": [{"name": p} for p in projects],
+        }
+        write_atomic(self.simple_dir / "index.html", html)
+        write_atomic(self.simple_dir / "index.json", json.dumps(data))
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """
+    Write ``text`` to ``path`` via a temporary file so that readers never see
+    a partially-written file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmpname = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8") as fp:
+            fp.write(text)
+        os.replace(tmpname, path)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
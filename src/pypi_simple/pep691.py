@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Union
+from collections import deque
+from decimal import Decimal
+from types import GeneratorType
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, StrictBool
 
 
@@ -68,3 +71,72 @@ class ProjectItem(BaseModel):
 class ProjectList(BaseModel):
     projects: List[ProjectItem]
     meta: Meta
+
+
+# Hand-written equivalents of the above models for use on large documents.
+# These accept & reject the same inputs as pydantic (including its coercions,
+# e.g., of numbers to strings) but skip pydantic's per-field machinery.  Each
+# validator raises a `ValueError` naming the offending field.
+
+SEQUENCE_TYPES = (list, tuple, set, frozenset, GeneratorType, deque)
+
+
+def validate_str(v: Any, loc: str) -> str:
+    if isinstance(v, str):
+        return v
+    elif isinstance(v, (float, int, Decimal)):
+        return str(v)
+    elif isinstance(v, (bytes, bytearray)):
+        return v.decode()
+    else:
+        raise ValueError(f"{loc}: str type expected")
+
+
+def validate_optional_str(v: Any, loc: str) -> Optional[str]:
+    return None if v is None else validate_str(v, loc)
+
+
+def validate_dict(v: Any, loc: str) -> dict:
+    if isinstance(v, dict):
+        return v
+    try:
+        return dict(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{loc}: value is not a valid dict")
+
+
+def validate_str_dict(v: Any, loc: str) -> dict[str, str]:
+    d = validate_dict(v, loc)
+    if all(type(k) is str and type(x) is str for k, x in d.items()):
+        return dict(d)
+    return {validate_str(k, loc): validate_str(x, loc) for k, x in d.items()}
+
+
+def validate_list(v: Any, loc: str) -> list:
+    if isinstance(v, list):
+        return v
+    elif isinstance(v, SEQUENCE_TYPES):
+        return list(v)
+    else:
+        raise ValueError(f"{loc}: value is not a valid list")
+
+
+def require(obj: dict, key: str) -> Any:
+    try:
+        return obj[key]
+    except KeyError:
+        raise ValueError(f"{key}: field required")
+
+
+def validate_meta(data: Any, loc: str = "meta") -> tuple[str, Optional[str]]:
+    """
+    Validate a ``"meta"`` object and return its ``api-version`` and
+    ``_last-serial`` fields
+    """
+    obj = validate_dict(data, loc)
+    if obj.get("api-version") is None:
+        raise ValueError(f"{loc}.api-version: field required")
+    return (
+        validate_str(obj["api-version"], f"{loc}.api-version"),
+        validate_optional_str(obj.get("_last-serial"), f"{loc}._last-serial"),
+    )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+import io
+import re
+from typing import Optional
+import zipfile
+import requests
+from .errors import NoMetadataError
+from .util import parse_content_range
+
+#: How many bytes to fetch from the end of a wheel in the first request; this
+#: is enough to cover the central directory of most wheels
+TAIL_SIZE = 64 * 1024
+
+#: The minimum number of bytes to request at a time
+MIN_FETCH_SIZE = 16 * 1024
+
+#: The size of a zip local file header, excluding the filename and "extra"
+#: field
+LOCAL_HEADER_SIZE = 30
+
+
+class HTTPRangeReader(io.RawIOBase):
+    """
+    A read-only, seekable binary file that fetches the parts of a remote file
+    that are actually read via HTTP range requests, keeping every fetched
+    range in memory.  Reads are always filled completely unless they extend
+    past the end of the file.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        timeout: float | tuple[float, float] | None = None,
+    ) -> None:
+        super().__init__()
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.pos = 0
+        #: Fetched ranges of the file as a list of ``(start, data)`` pairs
+        self.segments: list[tuple[int, bytes]] = []
+        # Request the tail of the file with a suffix range; the response tells
+        # us the total size.
+        r = self.session.get(
+            url, timeout=timeout, headers={"Range": f"bytes=-{TAIL_SIZE}"}
+        )
+        r.raise_for_status()
+        crange = parse_content_range(r.headers.get("Content-Range"))
+        if r.status_code != 206 or crange is None or crange[0] is None:
+            r.close()
+            raise ValueError(f"Server did not honor range request for {url}")
+        total = crange[2]
+        if total is None:
+            raise ValueError(f"Server did not report size of {url}")
+        self.size: int = total
+        self.segments.append((crange[0], r.content))
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence!r}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self.pos = pos
+        return pos
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # type: ignore[override]
+        with memoryview(b) as view, view.cast("B") as out:
+            want = min(len(out), max(self.size - self.pos, 0))
+            filled = 0
+            while filled < want:
+                blob = self._cached(self.pos + filled, want - filled)
+                if blob is None:
+                    self.prefetch(
+                        self.pos + filled,
+                        self.pos + filled + max(want - filled, MIN_FETCH_SIZE),
+                    )
+                    continue
+                out[filled : filled + len(blob)] = blob
+                filled += len(blob)
+            self.pos += filled
+            return filled
+
+    def prefetch(self, start: int, end: int) -> None:
+        """
+        Fetch the bytes from ``start`` up to (but not including) ``end`` if
+        they have not been fetched already
+        """
+        end = min(end, self.size)
+        if start >= end or self._cached(start, end - start) is not None:
+            return
+        r = self.session.get(
+            self.url,
+            timeout=self.timeout,
+            headers={"Range": f"bytes={start}-{end - 1}"},
+        )
+        r.raise_for_status()
+        crange = parse_content_range(r.headers.get("Content-Range"))
+        if (
+            r.status_code != 206
+            or crange is None
+            or crange[0] != start
+            or not r.content
+        ):
+            r.close()
+            raise ValueError(f"Server did not honor range request for {self.url}")
+        self.segments.append((start, r.content))
+
+    def _cached(self, start: int, length: int) -> Optional[bytes]:
+        """
+        Return as many bytes as possible, up to ``length``, starting at
+        ``start`` from a single fetched segment, or `None` if no segment
+        contains ``start``
+        """
+        for seg_start, data in self.segments:
+            if seg_start <= start < seg_start + len(data):
+                offset = start - seg_start
+                return data[offset : offset + length]
+        return None
+
+
+def read_wheel_metadata(
+    session: requests.Session,
+    url: str,
+    filename: str,
+    timeout: float | tuple[float, float] | None = None,
+) -> bytes:
+    """
+    Read the :file:`*.dist-info/METADATA` file from the remote wheel at
+    ``url`` using HTTP range requests for just the zip central directory and
+    the member itself
+
+    :raises NoMetadataError: if the wheel does not contain a METADATA file
+    :raises ValueError:
+        if the server does not honor range requests or the wheel contains
+        more than one METADATA file
+    :raises zipfile.BadZipFile: if the file is not a valid zip file
+    """
+    reader = HTTPRangeReader(session, url, timeout)
+    with zipfile.ZipFile(reader) as zf:
+        names = [
+            name
+            for name in zf.namelist()
+            if re.fullmatch(r"[^/]+\.dist-info/METADATA", name)
+        ]
+        if not names:
+            raise NoMetadataError(filename)
+        elif len(names) > 1:
+            raise ValueError(f"Multiple METADATA files found in {filename}")
+        return read_member(reader, zf, zf.getinfo(names[0]))
+
+
+def read_member(
+    reader: HTTPRangeReader, zf: zipfile.ZipFile, info: zipfile.ZipInfo
+) -> bytes:
+    """
+    Read the member ``info`` of the remote zip file ``zf`` opened on
+    ``reader``, fetching its local header and compressed data in a single
+    request where possible
+    """
+    # The local header's "extra" field can differ in length from the central
+    # directory's, so allow some slack; any shortfall just costs another
+    # request.
+    reader.prefetch(
+        info.header_offset,
+        info.header_offset
+        + LOCAL_HEADER_SIZE
+        + len(info.orig_filename.encode("utf-8"))
+        + len(info.extra)
+        + info.compress_size
+        + 1024,
+    )
+    return zf.read(info)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from pathlib import PurePosixPath
+import tarfile
+from typing import Optional
+import zipfile
+import requests
+from .errors import DownloadTooLargeError, NoMetadataError
+from .remote_wheel import HTTPRangeReader, read_member
+
+#: The maximum size in bytes of a :file:`PKG-INFO` file that
+#: `read_sdist_pkg_info()` will read
+MAX_PKG_INFO_SIZE = 1 << 20
+
+
+def pkg_info_rank(name: str) -> Optional[int]:
+    """
+    If the archive member ``name`` is a :file:`PKG-INFO` file, return 0 if it
+    is the one in the sdist's top-level directory or 1 if it is inside an
+    :file:`*.egg-info` directory; otherwise, return `None`
+    """
+    parts = [p for p in PurePosixPath(name).parts if p != "."]
+    if not parts or parts[-1] != "PKG-INFO":
+        return None
+    elif len(parts) == 2:
+        return 0
+    elif len(parts) > 2 and parts[-2].endswith(".egg-info"):
+        return 1
+    else:
+        return None
+
+
+def read_sdist_pkg_info(
+    session: requests.Session,
+    url: str,
+    filename: str,
+    timeout: float | tuple[float, float] | None = None,
+) -> bytes:
+    """
+    Read the :file:`PKG-INFO` file from the remote sdist at ``url``.
+
+    Tar archives (compressed or not) are decompressed as they are downloaded,
+    and the transfer is stopped as soon as the top-level :file:`PKG-INFO` has
+    been read.  Zip archives store their directory at the end, so they are
+    instead read with HTTP range requests like wheels.
+
+    :raises NoMetadataError: if the sdist does not contain a PKG-INFO file
+    :raises DownloadTooLargeError:
+        if the PKG-INFO file is larger than `MAX_PKG_INFO_SIZE`
+    :raises ValueError:
+        if the sdist is a zip file and the server does not honor range requests
+    """
+    if filename.lower().endswith(".zip"):
+        reader = HTTPRangeReader(session, url, timeout)
+        with zipfile.ZipFile(reader) as zf:
+            candidates = []
+            for info in zf.infolist():
+                rank = pkg_info_rank(info.filename)
+                if rank is not None:
+                    candidates.append((rank, info.filename, info))
+            if not candidates:
+                raise NoMetadataError(filename)
+            info = min(candidates)[2]
+            if info.file_size > MAX_PKG_INFO_SIZE:
+                raise DownloadTooLargeError(url, MAX_PKG_INFO_SIZE)
+            # ZipFile stops decompressing at the declared size, so this is
+            # bounded even if the declared size is a lie.
+            return read_member(reader, zf, info)
+    fallback: Optional[bytes] = None
+    with session.get(url, stream=True, timeout=timeout) as r:
+        r.raise_for_status()
+        # Undo any Content-Encoding applied in transit, but not the
+        # archive's own compression, which tarfile handles.
+        r.raw.decode_content = True
+        with tarfile.open(fileobj=r.raw, mode="r|*") as tf:
+            for member in tf:
+                rank = pkg_info_rank(member.name)
+                if rank is None or not member.isfile():
+                    continue
+                fp = tf.extractfile(member)
+                assert fp is not None
+                blob = fp.read(MAX_PKG_INFO_SIZE + 1)
+                if len(blob) > MAX_PKG_INFO_SIZE:
+                    raise DownloadTooLargeError(url, MAX_PKG_INFO_SIZE)
+                if rank == 0:
+                    return blob
+                elif fallback is None:
+                    fallback = blob
+    if fallback is None:
+        raise NoMetadataError(filename)
+    return fallback
@@ -0,0 +1,296 @@
+from __future__ import annotations
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+import heapq
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import IO, AnyStr, Optional, cast
+from packaging.utils import canonicalize_name as normalize
+from .classes import IndexPage
+
+#: The maximum number of project names that `sort_projects()` sorts in memory
+#: at once
+SORT_RUN_SIZE = 100_000
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    .. versionadded:: 1.1.0
+
+    The differences between an `IndexSnapshot` and a newer list of project
+    names.  Both lists are sorted by normalized name.
+    """
+
+    #: Projects in the newer list but not in the snapshot
+    added: list[str] = field(default_factory=list)
+
+    #: Projects in the snapshot but not in the newer list
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+@dataclass
+class IndexSnapshot:
+    """
+    .. versionadded:: 1.1.0
+
+    A list of the project names in a repository's index, stored on disk in
+    sorted order along with the index's last serial, for finding the
+    projects added & removed since the snapshot was taken without holding
+    both lists in memory at once.
+
+    Snapshots are created with `write()`, `from_page()`, or `update()`, and
+    existing snapshot files are opened with `load()`.  The file consists of a
+    JSON header line followed by one project name per line, sorted (and
+    deduplicated) by normalized name.  Project names are compared by their
+    normalized forms, but they are stored and reported as given.
+    """
+
+    #: The path to the snapshot file
+    path: Path
+
+    #: The :mailheader:`X-PyPI-Last-Serial` of the index at the time of the
+    #: snapshot, if known
+    last_serial: Optional[str]
+
+    #: The repository version of the index at the time of the snapshot, if
+    #: known
+    repository_version: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: AnyStr | os.PathLike[AnyStr]) -> IndexSnapshot:
+        """
+        Open an existing snapshot file, reading only its header
+
+        :param path: the path to the snapshot file
+        :rtype: IndexSnapshot
+        :raises ValueError: if the file does not start with a valid header
+        """
+        p = Path(os.fsdecode(path))
+        with p.open("r", encoding="utf-8") as fp:
+            try:
+                header = json.loads(fp.readline())
+                last_serial = header["last_serial"]
+                repository_version = header["repository_version"]
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"{p}: invalid snapshot header") from None
+        return cls(
+            path=p, last_serial=last_serial, repository_version=repository_version
+        )
+
+    @classmethod
+    def write(
+        cls,
+        path: AnyStr | os.PathLike[AnyStr],
+        projects: Iterable[str],
+        last_serial: Optional[str] = None,
+        repository_version: Optional[str] = None,
+    ) -> IndexSnapshot:
+        """
+        Write a snapshot of the given project names to ``path``, atomically
+        replacing any existing file
+
+        :param path: the path to write the snapshot to
+        :param Iterable[str] projects: the project names to store
+        :param Optional[str] last_serial: the index's last serial
+        :param Optional[str] repository_version: the index's repository
+            version
+        :rtype: IndexSnapshot
+        """
+        snapshot = cls(
+            path=Path(os.fsdecode(path)),
+            last_serial=last_serial,
+            repository_version=repository_version,
+        )
+        with snapshot._writer() as fp:
+            for _, name in sort_projects(projects):
+                print(name, file=fp)
+        return snapshot
+
+    @classmethod
+    def from_page(
+        cls, path: AnyStr | os.PathLike[AnyStr], page: IndexPage
+    ) -> IndexSnapshot:
+        """
+        Write a snapshot of the given `IndexPage` to ``path``
+
+        :param path: the path to write the snapshot to
+        :param IndexPage page: the index page to snapshot
+        :rtype: IndexSnapshot
+        """
+        return cls.write(
+            path,
+            page.projects,
+            last_serial=page.last_serial,
+            repository_version=page.repository_version,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """Stream the project names in the snapshot file, in sorted order"""
+        with self.path.open("r", encoding="utf-8") as fp:
+            fp.readline()
+            for line in fp:
+                name = line.rstrip("\n")
+                if name:
+                    yield name
+
+    def diff(self, projects: Iterable[str]) -> SnapshotDiff:
+        """
+        Compare the snapshot against a newer list of project names, such as
+        the output of `PyPISimple.stream_project_names()`.  The snapshot is
+        streamed from disk, and ``projects`` is sorted in bounded runs that
+        are spilled to temporary files, so neither list is held in memory in
+        full.
+
+        :param Iterable[str] projects: the current project names
+        :rtype: SnapshotDiff
+        """
+        diff = SnapshotDiff()
+        for status, name in self._merge(sort_projects(projects)):
+            if status == "+":
+                diff.added.append(name)
+            elif status == "-":
+                diff.removed.append(name)
+        return diff
+
+    def update(
+        self,
+        projects: Iterable[str],
+        last_serial: Optional[str] = None,
+        repository_version: Optional[str] = None,
+    ) -> SnapshotDiff:
+        """
+        Compare the snapshot against a newer list of project names like
+        `diff()`, and at the same time replace the snapshot file with a
+        snapshot of the new list.  The snapshot's `last_serial` and
+        `repository_version` are updated to the given values.
+
+        :param Iterable[str] projects: the current project names
+        :param Optional[str] last_serial: the index's new last serial
+        :param Optional[str] repository_version: the index's new repository
+            version
+        :rtype: SnapshotDiff
+        """
+        diff = SnapshotDiff()
+        new = IndexSnapshot(
+            path=self.path,
+            last_serial=last_serial,
+            repository_version=repository_version,
+        )
+        with new._writer() as fp:
+            for status, name in self._merge(sort_projects(projects)):
+                if status == "+":
+                    diff.added.append(name)
+                elif status == "-":
+                    diff.removed.append(name)
+                    continue
+                print(name, file=fp)
+        self.last_serial = last_serial
+        self.repository_version = repository_version
+        return diff
+
+    def _merge(self, new: Iterable[tuple[str, str]]) -> Iterator[tuple[str, str]]:
+        """
+        Merge the snapshot with ``new`` (an iterable of ``(normalized name,
+        name)`` pairs sorted by normalized name), yielding ``(status, name)``
+        pairs in sorted order, where ``status`` is ``"+"`` for names only in
+        ``new``, ``"-"`` for names only in the snapshot, or ``"="`` for names
+        in both (in which case the name from ``new`` is yielded)
+        """
+        old_iter = ((normalize(name), name) for name in self)
+        old = next(old_iter, None)
+        for key, name in new:
+            while old is not None and old[0] < key:
+                yield ("-", old[1])
+                old = next(old_iter, None)
+            if old is not None and old[0] == key:
+                yield ("=", name)
+                old = next(old_iter, None)
+            else:
+                yield ("+", name)
+        while old is not None:
+            yield ("-", old[1])
+            old = next(old_iter, None)
+
+    @contextmanager
+    def _writer(self) -> Iterator[IO[str]]:
+        """
+        Write a snapshot file with this snapshot's header to a temporary file
+        that is moved into place at `path` on success
+        """
+        header = {
+            "last_serial": self.last_serial,
+            "repository_version": self.repository_version,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as fp:
+                print(json.dumps(header), file=fp)
+                yield fp
+            os.replace(tmpname, self.path)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+
+
+def sort_projects(
+    projects: Iterable[str], run_size: Optional[int] = None
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield ``(normalized name, name)`` pairs for the given project names,
+    sorted and deduplicated by normalized name; for duplicates, the first
+    name given is kept.
+
+    The names are sorted in runs of at most ``run_size`` (default:
+    `SORT_RUN_SIZE`) names at a time.  If there is more than one run, each
+    run is written to a temporary file, and the runs are then merged, so that
+    no more than one run is ever held in memory.
+    """
+    if run_size is None:
+        run_size = SORT_RUN_SIZE
+    with ExitStack() as stack:
+        runs: list[Iterator[tuple[str, int, str]]] = []
+        run: list[tuple[str, int, str]] = []
+        for i, name in enumerate(projects):
+            # The index is included so that the first of several names with
+            # the same normalized form sorts first.
+            run.append((normalize(name), i, name))
+            if len(run) >= run_size:
+                runs.append(spill_run(stack, run))
+                run = []
+        run.sort()
+        merged: Iterable[tuple[str, int, str]]
+        if runs:
+            runs.append(iter(run))
+            merged = heapq.merge(*runs)
+        else:
+            merged = run
+        prev: Optional[str] = None
+        for key, _, name in merged:
+            if key != prev:
+                yield (key, name)
+                prev = key
+
+
+def spill_run(
+    stack: ExitStack, run: list[tuple[str, int, str]]
+) -> Iterator[tuple[str, int, str]]:
+    """
+    Sort ``run``, write it to a temporary file that is closed when ``stack``
+    is, and return an iterator that reads the entries back
+    """
+    run.sort()
+    fp = stack.enter_context(
+        tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n")
+    )
+    for entry in run:
+        print(json.dumps(entry), file=fp)
+    fp.seek(0)
+    return (cast("tuple[str, int, str]", tuple(json.loads(line))) for line in fp)
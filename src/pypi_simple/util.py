@@ -1,18 +1,42 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import errno
 import hashlib
-from typing import Any, Optional
+from io import BytesIO
+import mmap
+import os
+from pathlib import Path
+from queue import Queue
+import re
+import threading
+from typing import IO, Any, Callable, Iterable, Optional
 from urllib.parse import urljoin
 import warnings
 from packaging.version import Version
 from . import SUPPORTED_REPOSITORY_VERSION
 from .errors import (
     DigestMismatchError,
+    DownloadTooLargeError,
     NoDigestsError,
     UnexpectedRepoVersionWarning,
     UnsupportedRepoVersionError,
 )
 
+#: How many bytes `copy_file_data()` copies at a time
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+#: `errno` values indicating that a kernel copy function cannot be used for a
+#: given pair of files
+KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    errno.ENOTSOCK,
+    errno.EOPNOTSUPP,
+    errno.ETXTBSY,
+}
+
 
 def check_repo_version(
     declared_version: str,
@@ -43,9 +67,31 @@ def basejoin(base_url: Optional[str], url: str) -> str:
         return urljoin(base_url, url)
 
 
+def parse_content_range(
+    value: Optional[str],
+) -> Optional[tuple[Optional[int], Optional[int], Optional[int]]]:
+    """
+    Parse a :mailheader:`Content-Range` header value of the form ``bytes
+    START-END/TOTAL`` or ``bytes */TOTAL`` into a triple of the start, end, and
+    total length, any of which may be `None`.  Returns `None` if the value is
+    `None` or cannot be parsed.
+    """
+    if value is None:
+        return None
+    m = re.fullmatch(r"\s*bytes\s+(?:(\d+)-(\d+)|\*)/(\d+|\*)\s*", value)
+    if not m:
+        return None
+    start, end, total = m.groups()
+    return (
+        int(start) if start is not None else None,
+        int(end) if end is not None else None,
+        int(total) if total != "*" else None,
+    )
+
+
 class AbstractDigestChecker(ABC):
     @abstractmethod
-    def update(self, blob: bytes) -> None:
+    def update(self, blob: bytes | memoryview) -> None:
         ...
 
     @abstractmethod
@@ -54,7 +100,7 @@ class AbstractDigestChecker(ABC):
 
 
 class NullDigestChecker(AbstractDigestChecker):
-    def update(self, blob: bytes) -> None:
+    def update(self, blob: bytes | memoryview) -> None:
         pass
 
     def finalize(self) -> None:
@@ -76,7 +122,7 @@ class DigestChecker(AbstractDigestChecker):
         if not self.digesters:
             raise NoDigestsError("No digests with known algorithms available")
 
-    def update(self, blob: bytes) -> None:
+    def update(self, blob: bytes | memoryview) -> None:
         for d in self.digesters.values():
             d.update(blob)
 
@@ -89,3 +135,179 @@ class DigestChecker(AbstractDigestChecker):
                     expected_digest=self.expected[alg],
                     actual_digest=actual,
                 )
+
+
+def file_matches_digests(path: Path, digests: dict[str, str]) -> bool:
+    """
+    Test whether the contents of the file at ``path`` match all of the digests
+    in ``digests`` with known algorithms.  The file is memory-mapped instead
+    of being read into Python buffers.  Returns `False` if none of the
+    algorithms are known.
+    """
+    try:
+        checker = DigestChecker(digests)
+    except NoDigestsError:
+        return False
+    digest_file(path, checker)
+    try:
+        checker.finalize()
+    except DigestMismatchError:
+        return False
+    return True
+
+
+def digest_file(path: Path, digester: AbstractDigestChecker) -> None:
+    """
+    Feed the contents of the file at ``path`` to ``digester`` via a memory
+    map
+    """
+    with path.open("rb") as fp:
+        if os.fstat(fp.fileno()).st_size > 0:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    digester.update(view)
+
+
+def copy_file_data(
+    infp: IO[bytes],
+    outfp: IO[bytes],
+    callback: Optional[Callable[[int], Any]] = None,
+    chunk_size: int = COPY_CHUNK_SIZE,
+) -> int:
+    """
+    Copy the remainder of ``infp`` to ``outfp`` (both of which must be real
+    files) starting at their current positions, letting the kernel move the
+    data with :func:`os.copy_file_range` where supported (which allows
+    filesystems like NFS 4.2 or Btrfs to copy on the server or share
+    extents) or else :func:`os.sendfile`, and falling back to ordinary reads
+    & writes.  ``callback`` is called with the size of each chunk copied.
+    Returns the number of bytes copied.
+    """
+    infd = infp.fileno()
+    outfd = outfp.fileno()
+    outfp.flush()
+    in_offset = infp.tell()
+    out_offset = outfp.tell()
+    copied = 0
+    for name in ("copy_file_range", "sendfile"):
+        func = getattr(os, name, None)
+        if func is None:
+            continue
+        try:
+            while True:
+                if name == "copy_file_range":
+                    n = func(
+                        infd, outfd, chunk_size, in_offset + copied, out_offset + copied
+                    )
+                else:
+                    os.lseek(outfd, out_offset + copied, os.SEEK_SET)
+                    n = func(outfd, infd, in_offset + copied, chunk_size)
+                if n == 0:
+                    break
+                copied += n
+                if callback is not None:
+                    callback(n)
+        except OSError as e:
+            if copied == 0 and e.errno in KERNEL_COPY_UNSUPPORTED:
+                continue
+            raise
+        infp.seek(in_offset + copied)
+        outfp.seek(out_offset + copied)
+        return copied
+    while True:
+        blob = infp.read(chunk_size)
+        if not blob:
+            break
+        outfp.write(blob)
+        copied += len(blob)
+        if callback is not None:
+            callback(len(blob))
+    return copied
+
+
+def pipeline(
+    chunks: Iterable[bytes], *sinks: Callable[[bytes], Any], depth: int = 2
+) -> None:
+    """
+    Feed each element of ``chunks`` to each of ``sinks``, with each sink
+    running in its own thread and receiving chunks through a queue holding at
+    most ``depth`` chunks, so that producing the chunks (e.g., reading from
+    the network) overlaps with consuming them.  If iterating over ``chunks``
+    or any sink raises an exception, the other threads are stopped and the
+    first exception is re-raised.
+    """
+    queues: list[Queue[Optional[bytes]]] = [Queue(maxsize=depth) for _ in sinks]
+    errors: list[Exception] = []
+    failed = threading.Event()
+
+    def consume(sink: Callable[[bytes], Any], q: Queue[Optional[bytes]]) -> None:
+        while True:
+            chunk = q.get()
+            if chunk is None:
+                return
+            if failed.is_set():
+                # Keep draining so that the producer never blocks on a full
+                # queue.
+                continue
+            try:
+                sink(chunk)
+            except Exception as e:
+                errors.append(e)
+                failed.set()
+
+    threads = [
+        threading.Thread(target=consume, args=(sink, q), daemon=True)
+        for sink, q in zip(sinks, queues)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for chunk in chunks:
+            if failed.is_set():
+                break
+            for q in queues:
+                q.put(chunk)
+    finally:
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+
+
+def preallocate(fp: IO[bytes], length: int) -> bool:
+    """
+    Reserve disk space for ``length`` bytes of ``fp`` starting at its current
+    position using :func:`os.posix_fallocate` where available, extending the
+    file if necessary.  Returns `False` if the platform or filesystem does not
+    support preallocation or ``fp`` is not backed by a file descriptor.
+    """
+    if length <= 0 or not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        fd = fp.fileno()
+        fp.flush()
+        os.posix_fallocate(fd, fp.tell(), length)
+    except (OSError, ValueError):
+        # `io.UnsupportedOperation` (raised by in-memory streams) is a
+        # subclass of both.
+        return False
+    return True
+
+
+class CappedBytesIO(BytesIO):
+    """
+    A `BytesIO` that raises `DownloadTooLargeError` when a write would cause
+    it to contain more than ``max_size`` bytes
+    """
+
+    def __init__(self, max_size: int, url: str) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.url = url
+
+    def write(self, b: Any) -> int:
+        if self.tell() + len(b) > self.max_size:
+            raise DownloadTooLargeError(self.url, self.max_size)
+        return super().write(b)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from collections.abc import Callable
+import hashlib
+import re
+from typing import Any, Optional
+import requests
+from pypi_simple import DistributionPackage, UnparsableFilenameError, parse_filename
+
+
+def mkpkg(
+    filename: str,
+    body: Optional[bytes] = None,
+    digests: Optional[dict[str, str]] = None,
+    **kwargs: Any,
+) -> DistributionPackage:
+    """
+    Construct a `DistributionPackage` for the file ``filename``, served under
+    ``https://test.nil/packages/`` unless a ``url`` is given.  The project,
+    version, and package type are parsed from the filename.  ``digests``
+    defaults to the SHA256 digest of ``body`` if that is given; other keyword
+    arguments are passed to `DistributionPackage`.
+    """
+    parsed: tuple[Optional[str], Optional[str], Optional[str]]
+    try:
+        parsed = parse_filename(filename)
+    except UnparsableFilenameError:
+        parsed = (None, None, None)
+    project, version, package_type = parsed
+    if digests is None:
+        digests = (
+            {"sha256": hashlib.sha256(body).hexdigest()} if body is not None else {}
+        )
+    fields: dict[str, Any] = {
+        "url": f"https://test.nil/packages/{filename}",
+        "project": project,
+        "version": version,
+        "package_type": package_type,
+        "requires_python": None,
+        "has_sig": None,
+        "has_metadata": kwargs.get("metadata_digests") is not None,
+    }
+    fields.update(kwargs)
+    return DistributionPackage(filename=filename, digests=digests, **fields)
+
+
+def range_callback(
+    body: bytes, served: Optional[list[int]] = None
+) -> Callable[[requests.PreparedRequest], tuple[int, dict[str, str], bytes]]:
+    """
+    Return a ``responses`` callback that serves ``body``, honoring single byte
+    ranges (including suffix ranges) in :mailheader:`Range` headers.  If
+    ``served`` is given, the number of bytes sent in each response is appended
+    to it.
+    """
+
+    def callback(
+        request: requests.PreparedRequest,
+    ) -> tuple[int, dict[str, str], bytes]:
+        spec = request.headers.get("Range", "")
+        suffix = re.fullmatch(r"bytes=-(\d+)", spec)
+        span = re.fullmatch(r"bytes=(\d+)-(\d+)", spec)
+        if suffix:
+            start = max(len(body) - int(suffix[1]), 0)
+            end = len(body) - 1
+        elif span:
+            start, end = int(span[1]), min(int(span[2]), len(body) - 1)
+        else:
+            if served is not None:
+                served.append(len(body))
+            return (200, {}, body)
+        if served is not None:
+            served.append(end + 1 - start)
+        return (
+            206,
+            {"Content-Range": f"bytes {start}-{end}/{len(body)}"},
+            body[start : end + 1],
+        )
+
+    return callback
@@ -0,0 +1,207 @@
+from __future__ import annotations
+import asyncio
+from collections.abc import Callable
+import json
+from pathlib import Path
+from conftest import mkpkg
+import httpx
+import pytest
+from pypi_simple import (
+    AsyncPyPISimple,
+    DigestMismatchError,
+    IndexPage,
+    NoSuchProjectError,
+    ProjectPage,
+    UnsupportedContentTypeError,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def mkclient(handler: Handler) -> AsyncPyPISimple:
+    return AsyncPyPISimple(
+        "https://test.nil/simple/",
+        session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def session_handler(request: httpx.Request) -> httpx.Response:
+    session_dir = DATA_DIR / "session01"
+    if request.url.path == "/simple/":
+        return httpx.Response(
+            200,
+            content=(session_dir / "simple.html").read_bytes(),
+            headers={"Content-Type": "text/html", "X-PyPI-Last-Serial": "12345"},
+        )
+    elif request.url.path == "/simple/in-place/":
+        return httpx.Response(
+            200,
+            content=(session_dir / "in-place.html").read_bytes(),
+            headers={"Content-Type": "text/html", "X-PyPI-Last-Serial": "54321"},
+        )
+    else:
+        return httpx.Response(404, text="Does not exist")
+
+
+def test_session() -> None:
+    async def run() -> None:
+        async with mkclient(session_handler) as simple:
+            assert await simple.get_index_page() == IndexPage(
+                projects=["in_place", "foo", "BAR"],
+                last_serial="12345",
+                repository_version="1.0",
+            )
+            page = await simple.get_project_page("IN.PLACE")
+            assert page.project == "IN.PLACE"
+            assert page.last_serial == "54321"
+            assert page.repository_version == "1.0"
+            assert [pkg.filename for pkg in page.packages] == [
+                "in_place-0.1.1-py2.py3-none-any.whl",
+                "in_place-0.1.1.tar.gz",
+                "in_place-0.2.0-py2.py3-none-any.whl",
+                "in_place-0.2.0.tar.gz",
+                "in_place-0.3.0-py2.py3-none-any.whl",
+                "in_place-0.3.0.tar.gz",
+            ]
+            with pytest.raises(NoSuchProjectError) as excinfo:
+                await simple.get_project_page("nonexistent")
+            assert excinfo.value.url == "https://test.nil/simple/nonexistent/"
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("chunk_size", [10, 65535])
+def test_stream_project_names(chunk_size: int) -> None:
+    async def run() -> list[str]:
+        async with mkclient(session_handler) as simple:
+            return [name async for name in simple.stream_project_names(chunk_size)]
+
+    assert asyncio.run(run()) == ["in_place", "foo", "BAR"]
+
+
+def test_json_session() -> None:
+    with (DATA_DIR / "argset.json").open() as fp:
+        argset = json.load(fp)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"Content-Type": "application/vnd.pypi.simple.v1+json"}
+        if request.url.path == "/simple/":
+            return httpx.Response(
+                200,
+                json={
+                    "meta": {"_last-serial": 14267765, "api-version": "1.0"},
+                    "projects": [{"name": "argset"}, {"name": "banana"}],
+                },
+                headers=headers,
+            )
+        else:
+            return httpx.Response(200, json=argset, headers=headers)
+
+    async def run() -> None:
+        async with mkclient(handler) as simple:
+            assert await simple.get_index_page() == IndexPage(
+                projects=["argset", "banana"],
+                last_serial="14267765",
+                repository_version="1.0",
+            )
+            assert [n async for n in simple.stream_project_names()] == [
+                "argset",
+                "banana",
+            ]
+            page = await simple.get_project_page("ARGSET")
+            assert page == ProjectPage.from_json_data(
+                argset, "https://test.nil/simple/argset/"
+            )
+
+    asyncio.run(run())
+
+
+def test_unsupported_content_type() -> None:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"projects": []})
+
+    async def run() -> None:
+        async with mkclient(handler) as simple:
+            with pytest.raises(UnsupportedContentTypeError) as excinfo:
+                await simple.get_index_page()
+            assert excinfo.value.content_type == "application/json"
+
+    asyncio.run(run())
+
+
+def test_download(tmp_path: Path) -> None:
+    src_file = DATA_DIR / "click_loglevel-0.4.0.post1-py3-none-any.whl"
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=src_file.read_bytes())
+
+    pkg = mkpkg(
+        "click_loglevel-0.4.0.post1-py3-none-any.whl",
+        digests={
+            "sha256": "f3449b5d28d6cba5bfbeed371ad59950aba035730d5cc28a32b4e7632e17ed6c"
+        },
+    )
+    dest = tmp_path / "click-loglevel" / pkg.filename
+
+    async def run() -> None:
+        async with mkclient(handler) as simple:
+            await simple.download_package(pkg, dest)
+
+    asyncio.run(run())
+    assert dest.read_bytes() == src_file.read_bytes()
+
+
+def test_download_bad_digests(tmp_path: Path) -> None:
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"\0\1\2\3\4\5")
+
+    pkg = mkpkg(
+        "click_loglevel-0.4.0.post1-py3-none-any.whl",
+        digests={
+            "sha256": "f3449b5d28d6cba5bfbeed371ad59950aba035730d5cc28a32b4e7632e17ed6c"
+        },
+    )
+    dest = tmp_path / pkg.filename
+
+    async def run() -> None:
+        async with mkclient(handler) as simple:
+            await simple.download_package(pkg, dest)
+
+    with pytest.raises(DigestMismatchError):
+        asyncio.run(run())
+    assert not dest.exists()
+
+
+@pytest.mark.parametrize(
+    "timeout,expected",
+    [
+        (None, 7.0),
+        (3.0, 3.0),
+    ],
+)
+def test_timeout(timeout: float | None, expected: float) -> None:
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return session_handler(request)
+
+    async def run() -> None:
+        async with AsyncPyPISimple(
+            "https://test.nil/simple/",
+            session=httpx.AsyncClient(
+                transport=httpx.MockTransport(handler), timeout=7.0
+            ),
+        ) as simple:
+            await simple.get_index_page(timeout=timeout)
+
+    asyncio.run(run())
+    assert timeouts == [expected]
+
+
+def test_default_no_timeout() -> None:
+    simple = AsyncPyPISimple()
+    assert simple.s.timeout.read is None
+    asyncio.run(simple.s.aclose())
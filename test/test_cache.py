@@ -0,0 +1,304 @@
+from __future__ import annotations
+from collections import OrderedDict
+import json
+import os
+from pathlib import Path
+import threading
+import time
+import pytest
+from pytest_mock import MockerFixture
+import responses
+from responses.matchers import header_matcher
+from pypi_simple import (
+    CachedPage,
+    DirectoryPageCache,
+    IndexPage,
+    MemoryPageCache,
+    PageCache,
+    ProjectPage,
+    PyPISimple,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def mkentry(name: str) -> CachedPage:
+    return CachedPage(
+        page=IndexPage(projects=[name], repository_version=None, last_serial=None),
+        etag=f'"{name}"',
+        last_modified=None,
+    )
+
+
+def test_memory_page_cache_lru() -> None:
+    cache = MemoryPageCache(maxsize=2)
+    foo = mkentry("foo")
+    bar = mkentry("bar")
+    baz = mkentry("baz")
+    cache.set("foo", foo)
+    cache.set("bar", bar)
+    assert cache.get("foo") is foo
+    cache.set("baz", baz)
+    assert cache.get("bar") is None
+    assert cache.get("foo") is foo
+    assert cache.get("baz") is baz
+
+
+def test_memory_page_cache_concurrent_eviction() -> None:
+    cache = MemoryPageCache(maxsize=1)
+    foo = mkentry("foo")
+    bar = mkentry("bar")
+    cache.set("foo", foo)
+    threads: list[threading.Thread] = []
+
+    class EvictingDict(OrderedDict):
+        # Store another page from a second thread right after each lookup,
+        # evicting the page just looked up unless the cache prevents it
+        def __getitem__(self, key: str) -> CachedPage:
+            value: CachedPage = super().__getitem__(key)
+            t = threading.Thread(target=cache.set, args=("bar", bar))
+            t.start()
+            threads.append(t)
+            t.join(0.1)
+            return value
+
+    cache.data = EvictingDict(cache.data)
+    assert cache.get("foo") is foo
+    for t in threads:
+        t.join()
+    assert cache.get("foo") is None
+    assert cache.get("bar") is bar
+
+
+def test_conditional_headers() -> None:
+    entry = CachedPage(
+        page=IndexPage(projects=[], repository_version=None, last_serial=None),
+        etag='"abc"',
+        last_modified="Wed, 21 Oct 2015 07:28:00 GMT",
+    )
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    entry.last_modified = None
+    assert entry.conditional_headers() == {"If-None-Match": '"abc"'}
+
+
+@responses.activate
+def test_revalidate_project_page(mocker: MockerFixture) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/in-place/",
+        status=304,
+        match=[header_matcher({"If-None-Match": '"v1"'})],
+    )
+    with (DATA_DIR / "session01" / "in-place.html").open() as fp:
+        responses.add(
+            method=responses.GET,
+            url="https://test.nil/simple/in-place/",
+            body=fp.read(),
+            content_type="text/html",
+            headers={"ETag": '"v1"', "X-PyPI-Last-Serial": "54321"},
+        )
+    cache = MemoryPageCache()
+    with PyPISimple("https://test.nil/simple/", page_cache=cache) as simple:
+        page = simple.get_project_page("in_place")
+        entry = cache.get("in-place")
+        assert entry is not None
+        assert entry.page is page
+        assert entry.etag == '"v1"'
+        spy = mocker.spy(ProjectPage, "from_response")
+        assert simple.get_project_page("IN.PLACE") is page
+        spy.assert_not_called()
+    assert len(responses.calls) == 2
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@responses.activate
+def test_revalidate_index_page_changed() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/",
+        json={"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}]},
+        content_type="application/vnd.pypi.simple.v1+json",
+        headers={"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/",
+        json={"meta": {"api-version": "1.0"}, "projects": [{"name": "bar"}]},
+        content_type="application/vnd.pypi.simple.v1+json",
+        headers={"Last-Modified": "Thu, 22 Oct 2015 07:28:00 GMT"},
+    )
+    cache = MemoryPageCache()
+    with PyPISimple("https://test.nil/simple/", page_cache=cache) as simple:
+        assert simple.get_index_page().projects == ["foo"]
+        assert simple.get_index_page().projects == ["bar"]
+    assert (
+        responses.calls[1].request.headers["If-Modified-Since"]
+        == "Wed, 21 Oct 2015 07:28:00 GMT"
+    )
+    entry = cache.get(":index:")
+    assert entry is not None
+    assert entry.last_modified == "Thu, 22 Oct 2015 07:28:00 GMT"
+
+
+@responses.activate
+def test_no_validators_not_cached() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/",
+        json={"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}]},
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+    cache = MemoryPageCache()
+    with PyPISimple("https://test.nil/simple/", page_cache=cache) as simple:
+        simple.get_index_page()
+    assert cache.get(":index:") is None
+
+
+def test_protocol() -> None:
+    assert isinstance(MemoryPageCache(), PageCache)
+
+
+def test_directory_page_cache_roundtrip(tmp_path: Path) -> None:
+    with (DATA_DIR / "argset.json").open() as fp:
+        page = ProjectPage.from_json_data(json.load(fp), "https://test.nil/simple/")
+    index = IndexPage(
+        projects=["argset", "foo"], repository_version="1.0", last_serial="42"
+    )
+    cache = DirectoryPageCache(tmp_path / "cache")
+    assert cache.get("argset") is None
+    assert cache.get_last_serial("argset") is None
+    cache.set(
+        "argset",
+        CachedPage(
+            page=page,
+            etag='"v1"',
+            last_modified=None,
+            url="https://test.nil/simple/argset/",
+        ),
+    )
+    cache.set(":index:", CachedPage(page=index, etag=None, last_modified="yes"))
+    assert (tmp_path / "cache" / "projects" / "argset.json").exists()
+    assert (tmp_path / "cache" / "index.json").exists()
+    cache2 = DirectoryPageCache(tmp_path / "cache")
+    assert cache2.get("argset") == CachedPage(
+        page=page,
+        etag='"v1"',
+        last_modified=None,
+        url="https://test.nil/simple/argset/",
+    )
+    assert cache2.get(":index:") == CachedPage(
+        page=index, etag=None, last_modified="yes"
+    )
+    assert cache2.get_last_serial("argset") == "10562871"
+    assert cache2.get_last_serial(":index:") == "42"
+
+
+@pytest.mark.parametrize("key", ["", "../foo", ".hidden", "foo/bar"])
+def test_directory_page_cache_bad_key(tmp_path: Path, key: str) -> None:
+    cache = DirectoryPageCache(tmp_path)
+    cache.set(key, mkentry("foo"))
+    assert sorted(p.relative_to(tmp_path) for p in tmp_path.rglob("*")) == [
+        Path("projects")
+    ]
+    assert cache.get(key) is None
+    assert cache.get_last_serial(key) is None
+
+
+def test_directory_page_cache_max_age(tmp_path: Path) -> None:
+    cache = DirectoryPageCache(tmp_path, max_age=60)
+    cache.set("foo", mkentry("foo"))
+    cache.set("bar", mkentry("bar"))
+    old = time.time() - 120
+    os.utime(tmp_path / "projects" / "foo.json", (old, old))
+    assert cache.get("foo") is None
+    assert not (tmp_path / "projects" / "foo.json").exists()
+    assert cache.get("bar") == mkentry("bar")
+
+
+def test_directory_page_cache_prune(tmp_path: Path) -> None:
+    cache = DirectoryPageCache(tmp_path)
+    now = time.time()
+    for i, name in enumerate(["foo", "bar", "baz", "quux"]):
+        cache.set(name, mkentry(name))
+        t = now - 100 + i
+        os.utime(tmp_path / "projects" / f"{name}.json", (t, t))
+    size = (tmp_path / "projects" / "foo.json").stat().st_size
+    cache.max_size = 2 * size + size // 2
+    cache.prune()
+    assert sorted(p.name for p in (tmp_path / "projects").iterdir()) == [
+        "baz.json",
+        "quux.json",
+    ]
+    cache.max_age = 97.5
+    cache.prune()
+    assert [p.name for p in (tmp_path / "projects").iterdir()] == ["quux.json"]
+
+
+@responses.activate
+def test_directory_page_cache_client(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/in-place/",
+        status=304,
+        match=[header_matcher({"If-None-Match": '"v1"'})],
+    )
+    with (DATA_DIR / "session01" / "in-place.html").open() as fp:
+        responses.add(
+            method=responses.GET,
+            url="https://test.nil/simple/in-place/",
+            body=fp.read(),
+            content_type="text/html",
+            headers={"ETag": '"v1"', "X-PyPI-Last-Serial": "54321"},
+        )
+    with PyPISimple(
+        "https://test.nil/simple/", page_cache=DirectoryPageCache(tmp_path)
+    ) as simple:
+        page = simple.get_project_page("in_place")
+    cache = DirectoryPageCache(tmp_path)
+    assert cache.get_last_serial("in-place") == "54321"
+    with PyPISimple("https://test.nil/simple/", page_cache=cache) as simple:
+        assert simple.get_project_page("in_place") == page
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+@responses.activate
+def test_shared_cache_multiple_repositories(tmp_path: Path, persistent: bool) -> None:
+    for host, filename in [("a.nil", "foo-1.0.tar.gz"), ("b.nil", "foo-2.0.tar.gz")]:
+        responses.add(
+            method=responses.GET,
+            url=f"https://{host}/simple/foo/",
+            status=304,
+            match=[header_matcher({"If-Modified-Since": host})],
+        )
+        responses.add(
+            method=responses.GET,
+            url=f"https://{host}/simple/foo/",
+            body=f'<a href="/packages/{filename}">{filename}</a>',
+            content_type="text/html",
+            headers={"Last-Modified": host},
+        )
+    cache: PageCache
+    if persistent:
+        cache = DirectoryPageCache(tmp_path)
+    else:
+        cache = MemoryPageCache()
+    with PyPISimple("https://a.nil/simple/", page_cache=cache) as a:
+        page_a = a.get_project_page("foo")
+        assert [p.url for p in page_a.packages] == [
+            "https://a.nil/packages/foo-1.0.tar.gz"
+        ]
+    with PyPISimple("https://b.nil/simple/", page_cache=cache) as b:
+        page_b = b.get_project_page("foo")
+        assert [p.url for p in page_b.packages] == [
+            "https://b.nil/packages/foo-2.0.tar.gz"
+        ]
+        # Now cached for b
+        assert b.get_project_page("foo") == page_b
+    assert "If-Modified-Since" not in responses.calls[1].request.headers
+    assert responses.calls[2].request.headers["If-Modified-Since"] == "b.nil"
+    assert len(responses.calls) == 3
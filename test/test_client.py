@@ -315,8 +315,9 @@ def test_redirected_project_page() -> None:
         ),
     ],
 )
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
 @responses.activate
-def test_utf8_declarations(content_type: str, body_decl: bytes) -> None:
+def test_utf8_declarations(content_type: str, body_decl: bytes, parser: str) -> None:
     responses.add(
         method=responses.GET,
         url="https://test.nil/simple/project/",
@@ -324,7 +325,7 @@ def test_utf8_declarations(content_type: str, body_decl: bytes) -> None:
         + b'<a href="../files/project-0.1.0-p\xC3\xBF42-none-any.whl">project-0.1.0-p\xC3\xBF42-none-any.whl</a>',
         content_type=content_type,
     )
-    with PyPISimple("https://test.nil/simple/") as simple:
+    with PyPISimple("https://test.nil/simple/", parser=parser) as simple:
         assert simple.get_project_page("project") == ProjectPage(
             project="project",
             packages=[
@@ -359,8 +360,9 @@ def test_utf8_declarations(content_type: str, body_decl: bytes) -> None:
         ),
     ],
 )
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
 @responses.activate
-def test_latin2_declarations(content_type: str, body_decl: bytes) -> None:
+def test_latin2_declarations(content_type: str, body_decl: bytes, parser: str) -> None:
     # This test is deliberately weird in order to make sure the code is
     # actually paying attention to the encoding declarations and not just
     # assuming UTF-8 because the input happens to be valid UTF-8.
@@ -371,7 +373,7 @@ def test_latin2_declarations(content_type: str, body_decl: bytes) -> None:
         + b'<a href="../files/project-0.1.0-p\xC3\xBF42-none-any.whl">project-0.1.0-p\xC3\xBF42-none-any.whl</a>',
         content_type=content_type,
     )
-    with PyPISimple("https://test.nil/simple/") as simple:
+    with PyPISimple("https://test.nil/simple/", parser=parser) as simple:
         assert simple.get_project_page("project") == ProjectPage(
             project="project",
             packages=[
@@ -805,8 +807,9 @@ class SpyingProgressTracker:
         self.updates.append(increment)
 
 
+@pytest.mark.parametrize("pipelined", [False, True])
 @responses.activate
-def test_download_progress(tmp_path: Path) -> None:
+def test_download_progress(tmp_path: Path, pipelined: bool) -> None:
     size = 1 << 20
     responses.add(
         method=responses.GET,
@@ -839,8 +842,50 @@ def test_download_progress(tmp_path: Path) -> None:
             spy.content_length = content_length
             return spy
 
-        simple.download_package(pkg, dest, progress=progress_cb)
+        simple.download_package(
+            pkg, dest, progress=progress_cb, pipelined=pipelined
+        )
         assert spy.content_length == size
         assert spy.enter_called
         assert spy.exit_called
         assert spy.updates == [65535] * (size // 65535) + [size % 65535]
+
+
+@responses.activate
+def test_get_project_pages() -> None:
+    session_dir = DATA_DIR / "session01"
+    with (session_dir / "in-place.html").open() as fp:
+        responses.add(
+            method=responses.GET,
+            url="https://test.nil/simple/in-place/",
+            body=fp.read(),
+            content_type="text/html",
+            headers={"X-PyPI-Last-Serial": "54321"},
+        )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/nonexistent/",
+        body="Does not exist",
+        status=404,
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/broken/",
+        body="Internal error",
+        status=500,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        results = dict(
+            simple.get_project_pages(
+                ["in_place", "nonexistent", "broken"], max_workers=20
+            )
+        )
+        assert simple.s.get_adapter("https://test.nil/")._pool_maxsize == 20  # type: ignore[attr-defined]
+    assert results.keys() == {"in_place", "nonexistent", "broken"}
+    page = results["in_place"]
+    assert isinstance(page, ProjectPage)
+    assert page.project == "in_place"
+    assert page.last_serial == "54321"
+    assert len(page.packages) == 6
+    assert isinstance(results["nonexistent"], NoSuchProjectError)
+    assert isinstance(results["broken"], requests.HTTPError)
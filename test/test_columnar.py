@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import Any
+from conftest import mkpkg
+import pytest
+from pypi_simple import ColumnarProjectPage, ProjectPage
+
+PAGE = ProjectPage(
+    project="foo",
+    packages=[
+        mkpkg("foo-1.0.tar.gz", digests={"sha256": "a1"}),
+        mkpkg("foo-1.0-py2.py3-none-any.whl", digests={"sha256": "a2"}),
+        mkpkg("foo-2.0.tar.gz", requires_python=">=3.8", is_yanked=True),
+        mkpkg("foo-2.0-py3-none-any.whl", requires_python=">=3.8", is_yanked=True),
+        mkpkg("foo-2.1.tar.gz", requires_python=">=3.8"),
+        mkpkg("foo-2.1-py3-none-any.whl", requires_python=">=3.8"),
+        mkpkg("foo-3.0-py3-none-any.whl", requires_python=">=3.10,<4"),
+        mkpkg("foo-3.1-py3-none-any.whl", requires_python="not a specifier"),
+        mkpkg("foo.txt"),
+    ],
+    repository_version="1.0",
+    last_serial="42",
+)
+
+
+@pytest.fixture(params=[False, True], ids=["lists", "numpy"])
+def use_numpy(request: pytest.FixtureRequest) -> bool:
+    if request.param:
+        pytest.importorskip("numpy")
+    return bool(request.param)
+
+
+def filenames(page: ColumnarProjectPage) -> list[str]:
+    return list(page.filenames)
+
+
+def test_to_columns(use_numpy: bool) -> None:
+    cols = PAGE.to_columns(use_numpy=use_numpy)
+    assert len(cols) == 9
+    assert cols.use_numpy is use_numpy
+    assert filenames(cols) == [p.filename for p in PAGE.packages]
+    assert list(cols.versions) == [
+        "1.0",
+        "1.0",
+        "2.0",
+        "2.0",
+        "2.1",
+        "2.1",
+        "3.0",
+        "3.1",
+        None,
+    ]
+    assert list(cols.sha256) == ["a1", "a2"] + [None] * 7
+    assert [bool(y) for y in cols.is_yanked] == [p.is_yanked for p in PAGE.packages]
+    assert cols.to_page() == PAGE
+    assert all(a is b for a, b in zip(cols, PAGE.packages))
+
+
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        ({}, list(range(9))),
+        ({"package_types": ["sdist"]}, [0, 2, 4]),
+        ({"package_types": ["wheel"], "yanked": False}, [1, 5, 6, 7]),
+        ({"yanked": True}, [2, 3]),
+        ({"python_version": "3.7"}, [0, 1, 7, 8]),
+        ({"python_version": "3.9.1"}, [0, 1, 2, 3, 4, 5, 7, 8]),
+        (
+            {"python_version": "3.11", "yanked": False, "package_types": {"wheel"}},
+            [1, 5, 6, 7],
+        ),
+    ],
+)
+def test_filter(use_numpy: bool, kwargs: dict[str, Any], expected: list[int]) -> None:
+    cols = PAGE.to_columns(use_numpy=use_numpy)
+    assert [bool(m) for m in cols.mask(**kwargs)] == [i in expected for i in range(9)]
+    filtered = cols.filter(**kwargs)
+    assert filenames(filtered) == [PAGE.packages[i].filename for i in expected]
+    assert list(filtered.urls) == [PAGE.packages[i].url for i in expected]
+    assert all(filtered.packages[j] is PAGE.packages[i] for j, i in enumerate(expected))
+
+
+def test_filter_chained(use_numpy: bool) -> None:
+    cols = PAGE.to_columns(use_numpy=use_numpy)
+    sdists = cols.filter(package_types=["sdist"])
+    assert filenames(sdists.filter(yanked=False)) == [
+        "foo-1.0.tar.gz",
+        "foo-2.1.tar.gz",
+    ]
+    assert filenames(sdists.where([False, True, False])) == ["foo-2.0.tar.gz"]
+
+
+def test_where_bad_length(use_numpy: bool) -> None:
+    cols = PAGE.to_columns(use_numpy=use_numpy)
+    with pytest.raises(ValueError) as excinfo:
+        cols.where([True, False])
+    assert str(excinfo.value) == "Mask length (2) does not match number of rows (9)"
+
+
+def test_select() -> None:
+    cols = PAGE.to_columns(use_numpy=False).filter(package_types=["sdist"])
+    fnames, shas = cols.select("filenames", "sha256")
+    assert fnames == ["foo-1.0.tar.gz", "foo-2.0.tar.gz", "foo-2.1.tar.gz"]
+    assert shas == ["a1", None, None]
+    with pytest.raises(ValueError):
+        cols.select("digests")
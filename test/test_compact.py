@@ -0,0 +1,112 @@
+from __future__ import annotations
+from dataclasses import FrozenInstanceError, fields
+import json
+from pathlib import Path
+import pickle
+import pytest
+from pypi_simple import (
+    CompactDistributionPackage,
+    CompactIndexPage,
+    CompactLink,
+    CompactProjectPage,
+    IndexPage,
+    Link,
+    ProjectPage,
+)
+
+DATA_DIR = Path(__file__).with_name("data")
+
+
+def load_page(filename: str) -> ProjectPage:
+    with (DATA_DIR / filename).open() as fp:
+        return ProjectPage.from_json_data(json.load(fp))
+
+
+@pytest.mark.parametrize("filename", ["argset.json", "yanked.json"])
+def test_compact_project_page_roundtrip(filename: str) -> None:
+    page = load_page(filename)
+    compact = CompactProjectPage.from_page(page)
+    assert isinstance(compact.packages, tuple)
+    assert compact.to_page() == page
+    for pkg, cpkg in zip(page.packages, compact.packages):
+        assert cpkg.sig_url == pkg.sig_url
+        assert cpkg.metadata_url == pkg.metadata_url
+
+
+def test_compact_index_page_roundtrip() -> None:
+    page = IndexPage(
+        projects=["argset", "banana"], repository_version="1.0", last_serial="42"
+    )
+    compact = CompactIndexPage.from_page(page)
+    assert compact.projects == ("argset", "banana")
+    assert compact.to_page() == page
+    assert hash(compact) == hash(CompactIndexPage.from_page(page))
+
+
+def test_compact_link_roundtrip() -> None:
+    link = Link(
+        text="foo-1.0.tar.gz",
+        url="https://test.nil/foo-1.0.tar.gz",
+        attrs={"href": "foo-1.0.tar.gz", "class": ["a", "b"]},
+    )
+    compact = CompactLink.from_link(link)
+    assert compact.to_link() == link
+    assert compact == CompactLink.from_link(link)
+    assert hash(compact) == hash(CompactLink.from_link(link))
+
+
+def test_compact_slotted_frozen() -> None:
+    page = CompactProjectPage.from_page(load_page("argset.json"))
+    pkg = page.packages[0]
+    assert not hasattr(pkg, "__dict__")
+    assert not hasattr(page, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        pkg.url = "https://test.nil/"  # type: ignore[misc]
+    assert len({page, CompactProjectPage.from_page(load_page("argset.json"))}) == 1
+
+
+def test_compact_interned() -> None:
+    page1 = CompactProjectPage.from_page(load_page("argset.json"))
+    page2 = CompactProjectPage.from_page(load_page("argset.json"))
+    pkg1, pkg2 = page1.packages[0], page2.packages[0]
+    assert pkg1.requires_python is pkg2.requires_python
+    assert pkg1.project is pkg2.project
+    (alg1,) = pkg1.digests
+    (alg2,) = pkg2.digests
+    assert alg1 is alg2
+
+
+def test_compact_pickle() -> None:
+    page = CompactProjectPage.from_page(load_page("yanked.json"))
+    assert pickle.loads(pickle.dumps(page)) == page
+
+
+def test_compact_defaults() -> None:
+    pkg = CompactDistributionPackage(
+        filename="foo-1.0.tar.gz",
+        url="https://test.nil/foo-1.0.tar.gz",
+        project="foo",
+        version="1.0",
+        package_type="sdist",
+        sha256=None,
+        requires_python=None,
+        has_sig=None,
+    )
+    assert not pkg.is_yanked
+    assert pkg.yanked_reason is None
+    assert pkg.has_metadata is None
+    assert pkg.metadata_digests is None
+    assert pkg.other_digests == ()
+    assert pkg.digests == {}
+
+
+def test_compact_digests() -> None:
+    page = load_page("argset.json")
+    page.packages[0].digests["md5"] = "0123456789abcdef0123456789abcdef"
+    compact = CompactProjectPage.from_page(page)
+    pkg = compact.packages[0]
+    assert pkg.sha256 == page.packages[0].digests["sha256"]
+    assert pkg.other_digests == (("md5", "0123456789abcdef0123456789abcdef"),)
+    assert pkg.digests == page.packages[0].digests
+    assert "digests" not in {f.name for f in fields(CompactDistributionPackage)}
+    assert compact.to_page() == page
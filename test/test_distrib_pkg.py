@@ -1,7 +1,13 @@
 from __future__ import annotations
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields, replace
+import pickle
+import threading
+import time
+from typing import Any, Optional
 import pytest
-from pypi_simple import DistributionPackage, Link
+from pytest_mock import MockerFixture
+from pypi_simple import DistributionPackage, Link, classes, parse_filename
 
 
 @pytest.mark.parametrize("fragment", ["", "#", "#sha256", "#sha256="])
@@ -222,10 +228,12 @@ def test_from_json_data_no_metadata() -> None:
         ({"sha256": "abc123"}, True, {"sha256": "abc123"}),
     ],
 )
+@pytest.mark.parametrize("use_pydantic", [False, True])
 def test_from_json_data_metadata(
     dist_info_metadata: bool | dict[str, str],
     has_metadata: bool,
     metadata_digests: Optional[dict[str, str]],
+    use_pydantic: bool,
 ) -> None:
     pkg = DistributionPackage.from_json_data(
         {
@@ -237,7 +245,161 @@ def test_from_json_data_metadata(
             "url": "https://files.pythonhosted.org/packages/b5/2b/7aa284f345e37f955d86e4cd57b1039b573552b0fc29d1a522ec05c1ee41/argset-0.1.0-py3-none-any.whl",
             "yanked": False,
             "dist-info-metadata": dist_info_metadata,
-        }
+        },
+        use_pydantic=use_pydantic,
     )
     assert pkg.has_metadata == has_metadata
     assert pkg.metadata_digests == metadata_digests
+
+
+BASE_FILE = {
+    "filename": "argset-0.1.0-py3-none-any.whl",
+    "hashes": {"sha256": "107a632c"},
+    "url": "https://test.nil/argset-0.1.0-py3-none-any.whl",
+}
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        {"filename": 42},
+        {"filename": 1.5},
+        {"filename": True},
+        {"filename": None},
+        {"filename": ["foo"]},
+        {"filename": {"foo": "bar"}},
+        {"url": None},
+        {"url": "../argset-0.1.0-py3-none-any.whl"},
+        {"hashes": None},
+        {"hashes": []},
+        {"hashes": [["sha256", "abc"]]},
+        {"hashes": "ab"},
+        {"hashes": {"sha256": 123}},
+        {"hashes": {"sha256": None}},
+        {"requires-python": None},
+        {"requires-python": 3},
+        {"requires-python": [">=3"]},
+        {"requires_python": ">=3"},
+        {"dist-info-metadata": None},
+        {"dist-info-metadata": False},
+        {"dist-info-metadata": "true"},
+        {"dist-info-metadata": 1},
+        {"dist-info-metadata": []},
+        {"dist-info-metadata": {"sha256": 5}},
+        {"dist-info-metadata": {"sha256": []}},
+        {"gpg-sig": None},
+        {"gpg-sig": True},
+        {"gpg-sig": False},
+        {"gpg-sig": 1},
+        {"gpg-sig": "true"},
+        {"yanked": None},
+        {"yanked": True},
+        {"yanked": ""},
+        {"yanked": "Broken"},
+        {"yanked": 0},
+        {"yanked": []},
+        {"extra-field": "ignored"},
+    ],
+)
+def test_from_json_data_fast_matches_pydantic(changes: dict[str, Any]) -> None:
+    data = {**BASE_FILE, **changes}
+    try:
+        expected = DistributionPackage.from_json_data(
+            data, "argset", "https://test.nil/simple/argset/", use_pydantic=True
+        )
+    except ValueError:
+        with pytest.raises(ValueError):
+            DistributionPackage.from_json_data(
+                data, "argset", "https://test.nil/simple/argset/"
+            )
+    else:
+        assert (
+            DistributionPackage.from_json_data(
+                data, "argset", "https://test.nil/simple/argset/"
+            )
+            == expected
+        )
+
+
+@pytest.mark.parametrize("key", ["filename", "url", "hashes"])
+def test_from_json_data_missing_field(key: str) -> None:
+    data = dict(BASE_FILE)
+    del data[key]
+    with pytest.raises(ValueError) as excinfo:
+        DistributionPackage.from_json_data(data)
+    assert str(excinfo.value) == f"file.{key}: field required"
+
+
+@pytest.mark.parametrize("data", [None, 42, "foo", ["foo"]])
+def test_from_json_data_not_dict(data: Any) -> None:
+    with pytest.raises(ValueError):
+        DistributionPackage.from_json_data(data)
+
+
+def test_lazy_filename_parsing(mocker: MockerFixture) -> None:
+    spy = mocker.spy(classes, "parse_filename")
+    pkg = DistributionPackage.from_link(
+        Link(
+            text="Foo-Bar-1.0.tar.gz",
+            url="https://test.nil/Foo-Bar-1.0.tar.gz#sha256=abc",
+            attrs={},
+        ),
+        "foo-bar",
+    )
+    assert pkg.digests == {"sha256": "abc"}
+    spy.assert_not_called()
+    assert pkg.version == "1.0"
+    spy.assert_called_once_with("Foo-Bar-1.0.tar.gz", "foo-bar")
+    assert pkg.project == "Foo-Bar"
+    assert pkg.package_type == "sdist"
+    assert spy.call_count == 1
+
+
+def test_lazy_filename_parsing_dataclass() -> None:
+    pkg = DistributionPackage.from_json_data(BASE_FILE, "argset")
+    assert [f.name for f in fields(DistributionPackage)][:5] == [
+        "filename",
+        "url",
+        "project",
+        "version",
+        "package_type",
+    ]
+    assert asdict(pickle.loads(pickle.dumps(pkg)))["version"] == "0.1.0"
+    pkg2 = DistributionPackage.from_json_data(BASE_FILE, "argset")
+    pkg2.version = "0.2.0"
+    assert replace(pkg2, filename="foo") == replace(
+        pkg, version="0.2.0", filename="foo"
+    )
+    assert pkg2.project == "argset"
+    assert pkg2.version == "0.2.0"
+    assert "version='0.1.0'" in repr(pkg)
+    with pytest.raises(TypeError):
+        DistributionPackage(filename="foo", url="bar")  # type: ignore[call-arg]
+
+
+def test_lazy_filename_parsing_threads(mocker: MockerFixture) -> None:
+    def slow_parse_filename(*args: Any) -> tuple[str, str, str]:
+        time.sleep(0.05)
+        return parse_filename(*args)
+
+    mocker.patch.object(classes, "parse_filename", side_effect=slow_parse_filename)
+    pkg = DistributionPackage.from_json_data(
+        {**BASE_FILE, "filename": "walt-node-0.4-1.tar.gz"}, "walt-node"
+    )
+    barrier = threading.Barrier(8)
+
+    def get_fields() -> tuple[Optional[str], Optional[str]]:
+        barrier.wait()
+        return (pkg.project, pkg.version)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: get_fields(), range(8)))
+    assert results == [("walt-node", "0.4-1")] * 8
+
+
+def test_lazy_filename_parsing_unparsable() -> None:
+    pkg = DistributionPackage.from_json_data({**BASE_FILE, "filename": "foo.txt"})
+    assert pkg.project is None
+    assert pkg.version is None
+    assert pkg.package_type is None
@@ -0,0 +1,562 @@
+from __future__ import annotations
+import gzip
+from io import BytesIO
+from pathlib import Path
+from conftest import mkpkg, range_callback
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    DigestMismatchError,
+    DownloadTooLargeError,
+    PyPISimple,
+)
+
+
+@responses.activate
+def test_download_packages(tmp_path: Path) -> None:
+    good = {f"good-{i}.tar.gz": bytes([i]) * (1000 * i) for i in range(1, 6)}
+    pkgs = []
+    for filename, body in good.items():
+        responses.add(
+            method=responses.GET,
+            url=f"https://test.nil/packages/{filename}",
+            body=body,
+        )
+        pkgs.append(mkpkg(filename, body))
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/bad-digest.tar.gz",
+        body=b"corrupted",
+    )
+    pkgs.append(mkpkg("bad-digest.tar.gz", b"", {"sha256": "0" * 64}))
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/missing.tar.gz",
+        status=404,
+    )
+    pkgs.append(mkpkg("missing.tar.gz", b""))
+    pkgs.append(mkpkg("../escape.tar.gz", b""))
+    with PyPISimple("https://test.nil/simple/") as simple:
+        results = {
+            pkg.filename: r
+            for pkg, r in simple.download_packages(
+                pkgs, tmp_path / "dest", max_workers=3
+            )
+        }
+    assert results.keys() == {pkg.filename for pkg in pkgs}
+    for filename, body in good.items():
+        assert results[filename] == tmp_path / "dest" / filename
+        assert (tmp_path / "dest" / filename).read_bytes() == body
+    assert isinstance(results["bad-digest.tar.gz"], DigestMismatchError)
+    assert isinstance(results["missing.tar.gz"], requests.HTTPError)
+    assert isinstance(results["../escape.tar.gz"], ValueError)
+    assert sorted(p.name for p in (tmp_path / "dest").iterdir()) == sorted(good)
+    assert not (tmp_path / "escape.tar.gz").exists()
+
+
+@responses.activate
+def test_download_packages_keep_on_error(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/bad-digest.tar.gz",
+        body=b"corrupted",
+    )
+    pkg = mkpkg("bad-digest.tar.gz", b"", {"sha256": "0" * 64})
+    with PyPISimple("https://test.nil/simple/") as simple:
+        ((rpkg, r),) = simple.download_packages([pkg], tmp_path, keep_on_error=True)
+    assert rpkg is pkg
+    assert isinstance(r, DigestMismatchError)
+    assert (tmp_path / "bad-digest.tar.gz").read_bytes() == b"corrupted"
+    with PyPISimple("https://test.nil/simple/") as simple:
+        ((rpkg, r),) = simple.download_packages([pkg], tmp_path, verify=False)
+    assert r == tmp_path / "bad-digest.tar.gz"
+
+
+BODY = bytes(range(256)) * 400
+
+
+@responses.activate
+def test_download_resume_partial(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(BODY[:30000])
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY[30000:],
+        status=206,
+        headers={"Content-Range": f"bytes 30000-{len(BODY) - 1}/{len(BODY)}"},
+        auto_calculate_content_length=True,
+        match=[responses.matchers.header_matcher({"Range": "bytes=30000-"})],
+    )
+    totals: list[int | None] = []
+    updates: list[int] = []
+
+    class Tracker:
+        def __enter__(self) -> Tracker:
+            return self
+
+        def __exit__(self, *_exc: object) -> None:
+            pass
+
+        def update(self, increment: int) -> None:
+            updates.append(increment)
+
+    def progress(total: int | None) -> Tracker:
+        totals.append(total)
+        return Tracker()
+
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            resume=True,
+            progress=progress,
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+    assert not (tmp_path / "foo-1.0.tar.gz.part").exists()
+    assert totals == [len(BODY)]
+    assert sum(updates) == len(BODY)
+    assert updates[0] == 30000
+
+
+@responses.activate
+def test_download_resume_no_part(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+        )
+    assert "Range" not in responses.calls[0].request.headers
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+    assert not (tmp_path / "foo-1.0.tar.gz.part").exists()
+
+
+@responses.activate
+def test_download_resume_range_ignored(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(b"garbage")
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+        )
+    assert responses.calls[0].request.headers["Range"] == "bytes=7-"
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_resume_complete(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(BODY)
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        status=416,
+        headers={"Content-Range": f"bytes */{len(BODY)}"},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+    assert not (tmp_path / "foo-1.0.tar.gz.part").exists()
+
+
+@responses.activate
+def test_download_resume_unsatisfiable_restarts(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(BODY + b"extra")
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        status=416,
+        headers={"Content-Range": f"bytes */{len(BODY)}"},
+        match=[responses.matchers.header_matcher({"Range": f"bytes={len(BODY) + 5}-"})],
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+        )
+    assert len(responses.calls) == 2
+    assert "Range" not in responses.calls[1].request.headers
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_resume_bad_digest(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(b"x" * 100)
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY[100:],
+        status=206,
+        headers={"Content-Range": f"bytes 100-{len(BODY) - 1}/{len(BODY)}"},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(DigestMismatchError):
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+            )
+    assert list(tmp_path.iterdir()) == []
+
+
+@responses.activate
+def test_download_resume_connection_error(tmp_path: Path) -> None:
+    (tmp_path / "foo-1.0.tar.gz.part").write_bytes(BODY[:100])
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=requests.ConnectionError("Connection reset"),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(requests.ConnectionError):
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz", resume=True
+            )
+    assert (tmp_path / "foo-1.0.tar.gz.part").read_bytes() == BODY[:100]
+    assert not (tmp_path / "foo-1.0.tar.gz").exists()
+
+
+@pytest.mark.parametrize("segments", [2, 3, 7])
+@responses.activate
+def test_download_segmented(tmp_path: Path, segments: int) -> None:
+    responses.add(
+        method=responses.HEAD,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        headers={"Accept-Ranges": "bytes", "Content-Length": str(len(BODY))},
+    )
+    responses.add_callback(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        callback=range_callback(BODY),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            segments=segments,
+            segment_threshold=1024,
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+    ranges = sorted(
+        c.request.headers["Range"] for c in responses.calls if c.request.method == "GET"
+    )
+    assert len(ranges) == segments
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"Content-Length": str(len(BODY))},
+        {"Accept-Ranges": "none", "Content-Length": str(len(BODY))},
+        {"Accept-Ranges": "bytes", "Content-Length": "1024"},
+    ],
+)
+@responses.activate
+def test_download_segmented_not_applicable(
+    tmp_path: Path, headers: dict[str, str]
+) -> None:
+    responses.add(
+        method=responses.HEAD,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        headers=headers,
+    )
+    responses.add_callback(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        callback=range_callback(BODY),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            segments=4,
+            segment_threshold=1024,
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+    (get,) = [c for c in responses.calls if c.request.method == "GET"]
+    assert "Range" not in get.request.headers
+
+
+@responses.activate
+def test_download_segmented_bad_digest(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.HEAD,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        headers={"Accept-Ranges": "bytes", "Content-Length": str(len(BODY))},
+    )
+    responses.add_callback(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        callback=range_callback(BODY),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(DigestMismatchError):
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY, {"sha256": "0" * 64}),
+                tmp_path / "foo-1.0.tar.gz",
+                segments=4,
+                segment_threshold=1024,
+            )
+    assert not (tmp_path / "foo-1.0.tar.gz").exists()
+
+
+@responses.activate
+def test_download_segmented_range_ignored(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.HEAD,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        headers={"Accept-Ranges": "bytes", "Content-Length": str(len(BODY))},
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(ValueError) as excinfo:
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY),
+                tmp_path / "foo-1.0.tar.gz",
+                segments=4,
+                segment_threshold=1024,
+            )
+    assert str(excinfo.value) == (
+        "Server did not honor range request for"
+        " https://test.nil/packages/foo-1.0.tar.gz"
+    )
+    assert not (tmp_path / "foo-1.0.tar.gz").exists()
+
+
+@responses.activate
+def test_download_if_exists_verify(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    (tmp_path / "foo-1.0.tar.gz").write_bytes(BODY)
+    (tmp_path / "bar-1.0.tar.gz").write_bytes(b"")
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            if_exists="verify",
+        )
+        assert len(responses.calls) == 0
+        simple.download_package(
+            mkpkg("bar-1.0.tar.gz", b""),
+            tmp_path / "bar-1.0.tar.gz",
+            if_exists="verify",
+        )
+        assert len(responses.calls) == 0
+        (tmp_path / "foo-1.0.tar.gz").write_bytes(b"stale")
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            if_exists="verify",
+        )
+        assert len(responses.calls) == 1
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_if_exists_verify_no_digests(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    (tmp_path / "foo-1.0.tar.gz").write_bytes(BODY)
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY, {}),
+            tmp_path / "foo-1.0.tar.gz",
+            verify=False,
+            if_exists="verify",
+        )
+    assert len(responses.calls) == 1
+
+
+def test_download_if_exists_invalid(tmp_path: Path) -> None:
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(ValueError) as excinfo:
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY),
+                tmp_path / "foo-1.0.tar.gz",
+                if_exists="skip",
+            )
+    assert str(excinfo.value) == "Unknown if_exists value: 'skip'"
+
+
+@responses.activate
+def test_download_pipelined(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY),
+            tmp_path / "foo-1.0.tar.gz",
+            pipelined=True,
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_pipelined_bad_digest(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(DigestMismatchError):
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY, {"sha256": "0" * 64}),
+                tmp_path / "foo-1.0.tar.gz",
+                pipelined=True,
+            )
+    assert not (tmp_path / "foo-1.0.tar.gz").exists()
+
+
+@responses.activate
+def test_download_content_encoding(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=gzip.compress(BODY),
+        headers={"Content-Encoding": "gzip"},
+        auto_calculate_content_length=True,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package(
+            mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz"
+        )
+    assert (tmp_path / "foo-1.0.tar.gz").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_truncated_body(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY[:50000],
+        headers={"Content-Length": str(len(BODY))},
+        auto_calculate_content_length=False,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(requests.RequestException):
+            simple.download_package(
+                mkpkg("foo-1.0.tar.gz", BODY), tmp_path / "foo-1.0.tar.gz"
+            )
+    assert not (tmp_path / "foo-1.0.tar.gz").exists()
+
+
+@responses.activate
+def test_download_package_fileobj() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    fp = BytesIO()
+    fp.write(b"header:")
+    with PyPISimple("https://test.nil/simple/") as simple:
+        simple.download_package_fileobj(mkpkg("foo-1.0.tar.gz", BODY), fp)
+    assert fp.getvalue() == b"header:" + BODY
+
+
+@responses.activate
+def test_download_package_fileobj_real_file(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+        auto_calculate_content_length=True,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with (tmp_path / "out.dat").open("wb") as fp:
+            simple.download_package_fileobj(mkpkg("foo-1.0.tar.gz", BODY), fp)
+    assert (tmp_path / "out.dat").read_bytes() == BODY
+
+
+@responses.activate
+def test_download_package_fileobj_append(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+        auto_calculate_content_length=True,
+    )
+    path = tmp_path / "out.dat"
+    path.write_bytes(b"HEADER")
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with path.open("ab") as fp:
+            simple.download_package_fileobj(mkpkg("foo-1.0.tar.gz", BODY), fp)
+    assert path.read_bytes() == b"HEADER" + BODY
+
+
+@responses.activate
+def test_download_package_fileobj_mid_file(tmp_path: Path) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+        auto_calculate_content_length=True,
+    )
+    path = tmp_path / "out.dat"
+    path.write_bytes(b"HEADER" + b"x" * len(BODY) + b"TRAILER")
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with path.open("r+b") as fp:
+            fp.seek(6)
+            simple.download_package_fileobj(mkpkg("foo-1.0.tar.gz", BODY), fp)
+            assert fp.tell() == 6 + len(BODY)
+    assert path.read_bytes() == b"HEADER" + BODY + b"TRAILER"
+
+
+@pytest.mark.parametrize("auto_length", [False, True])
+@responses.activate
+def test_download_package_bytes(auto_length: bool) -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+        auto_calculate_content_length=auto_length,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        pkg = mkpkg("foo-1.0.tar.gz", BODY)
+        assert simple.download_package_bytes(pkg) == BODY
+        assert simple.download_package_bytes(pkg, max_size=len(BODY)) == BODY
+        with pytest.raises(DownloadTooLargeError) as excinfo:
+            simple.download_package_bytes(pkg, max_size=len(BODY) - 1)
+    assert str(excinfo.value) == (
+        "File at https://test.nil/packages/foo-1.0.tar.gz exceeds maximum size"
+        f" of {len(BODY) - 1} bytes"
+    )
+
+
+@responses.activate
+def test_download_package_bytes_bad_digest() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=BODY,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        pkg = mkpkg("foo-1.0.tar.gz", BODY, {"sha256": "0" * 64})
+        with pytest.raises(DigestMismatchError):
+            simple.download_package_bytes(pkg)
+        assert simple.download_package_bytes(pkg, verify=False) == BODY
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Any
 import pytest
 from pypi_simple import (
     SUPPORTED_REPOSITORY_VERSION,
@@ -110,9 +111,10 @@ def test_from_html_empty() -> None:
         ),
     ],
 )
-def test_from_html(filename: str, encoding: str, page: IndexPage) -> None:
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
+def test_from_html(filename: str, encoding: str, page: IndexPage, parser: str) -> None:
     html = (DATA_DIR / filename).read_bytes()
-    assert IndexPage.from_html(html, encoding) == page
+    assert IndexPage.from_html(html, encoding, parser=parser) == page
 
 
 def test_from_html_unsupported_version() -> None:
@@ -153,12 +155,14 @@ def test_from_json_data_empty() -> None:
     )
 
 
-def test_from_json_data() -> None:
+@pytest.mark.parametrize("use_pydantic", [False, True])
+def test_from_json_data(use_pydantic: bool) -> None:
     assert IndexPage.from_json_data(
         {
             "meta": {"_last-serial": 14267765, "api-version": "1.0"},
             "projects": [{"name": "apple"}, {"name": "banana"}, {"name": "coconut"}],
-        }
+        },
+        use_pydantic=use_pydantic,
     ) == IndexPage(
         projects=[
             "apple",
@@ -184,3 +188,28 @@ def test_from_json_data_unsupported_version() -> None:
         "Repository's version (42.0) has greater major component than"
         f" supported version ({SUPPORTED_REPOSITORY_VERSION})"
     )
+
+
+@pytest.mark.parametrize(
+    "data,msg",
+    [
+        ("foo", "project list: value is not a valid dict"),
+        ({"meta": {"api-version": "1.0"}}, "projects: field required"),
+        ({"projects": []}, "meta: field required"),
+        ({"meta": {}, "projects": []}, "meta.api-version: field required"),
+        (
+            {"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}, "bar"]},
+            "projects.1: value is not a valid dict",
+        ),
+        (
+            {"meta": {"api-version": "1.0"}, "projects": [{"name": None}]},
+            "projects.0.name: str type expected",
+        ),
+    ],
+)
+def test_from_json_data_invalid(data: Any, msg: str) -> None:
+    with pytest.raises(ValueError) as excinfo:
+        IndexPage.from_json_data(data)
+    assert str(excinfo.value) == msg
+    with pytest.raises(ValueError):
+        IndexPage.from_json_data(data, use_pydantic=True)
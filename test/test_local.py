@@ -0,0 +1,332 @@
+from __future__ import annotations
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Optional
+import zipfile
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    ACCEPT_HTML_ONLY,
+    ACCEPT_JSON_ONLY,
+    DigestMismatchError,
+    DistributionPackage,
+    FileAdapter,
+    MemoryPageCache,
+    NoSuchProjectError,
+    PyPISimple,
+)
+from pypi_simple.local import accept_quality, parse_range
+
+METADATA = (
+    b"Metadata-Version: 2.1\n"
+    b"Name: foo\n"
+    b"Version: 1.0\n"
+    b"Requires-Dist: bar\n"
+    b"\n"
+    b"A description\n"
+)
+
+
+def make_repo(root: Path, json_pages: bool = True) -> Path:
+    """
+    Write a small static repository under ``root`` with one project, ``foo``,
+    which has an sdist and a wheel, and return the path to the simple API
+    """
+    (root / "packages" / "foo").mkdir(parents=True)
+    sdist = bytes(range(256)) * 400
+    (root / "packages" / "foo" / "foo-1.0.tar.gz").write_bytes(sdist)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("foo/__init__.py", os.urandom(100000))
+        zf.writestr("foo-1.0.dist-info/METADATA", METADATA)
+    wheel = buf.getvalue()
+    (root / "packages" / "foo" / "foo-1.0-py3-none-any.whl").write_bytes(wheel)
+    simple = root / "simple"
+    (simple / "foo").mkdir(parents=True)
+    (simple / "index.html").write_text(
+        '<html><body><a href="foo/">foo</a></body></html>\n'
+    )
+    files = [
+        ("foo-1.0.tar.gz", hashlib.sha256(sdist).hexdigest()),
+        ("foo-1.0-py3-none-any.whl", hashlib.sha256(wheel).hexdigest()),
+    ]
+    (simple / "foo" / "index.html").write_text(
+        "<html><body>\n"
+        + "".join(
+            f'<a href="../../packages/foo/{fn}#sha256={sha}">{fn}</a>\n'
+            for fn, sha in files
+        )
+        + "</body></html>\n"
+    )
+    if json_pages:
+        (simple / "index.json").write_text(
+            json.dumps({"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}]})
+        )
+        (simple / "foo" / "index.json").write_text(
+            json.dumps(
+                {
+                    "meta": {"api-version": "1.0"},
+                    "name": "foo",
+                    "files": [
+                        {
+                            "filename": fn,
+                            "url": f"../../packages/foo/{fn}",
+                            "hashes": {"sha256": sha},
+                            "yanked": fn.endswith(".tar.gz"),
+                        }
+                        for fn, sha in files
+                    ],
+                }
+            )
+        )
+    return simple
+
+
+@pytest.fixture
+def session() -> requests.Session:
+    s = requests.Session()
+    s.mount("file://", FileAdapter())
+    return s
+
+
+@pytest.mark.parametrize("as_url", [False, True])
+def test_local_endpoint(tmp_path: Path, as_url: bool) -> None:
+    simple = make_repo(tmp_path)
+    endpoint = simple.as_uri() if as_url else str(simple)
+    with PyPISimple(endpoint) as client:
+        assert client.endpoint == simple.as_uri() + "/"
+        assert client.get_index_page().projects == ["foo"]
+        assert list(client.stream_project_names()) == ["foo"]
+        page = client.get_project_page("FOO")
+        assert page.repository_version == "1.0"
+        assert [pkg.url for pkg in page.packages] == [
+            (tmp_path / "packages" / "foo" / "foo-1.0.tar.gz").as_uri(),
+            (tmp_path / "packages" / "foo" / "foo-1.0-py3-none-any.whl").as_uri(),
+        ]
+        assert page.packages[0].is_yanked
+        html_page = client.get_project_page("foo", accept=ACCEPT_HTML_ONLY)
+        assert html_page.repository_version is None
+        assert [pkg.url for pkg in html_page.packages] == [
+            pkg.url for pkg in page.packages
+        ]
+        assert not html_page.packages[0].is_yanked
+        with pytest.raises(NoSuchProjectError):
+            client.get_project_page("bar")
+
+
+def test_local_endpoint_pathlike(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path)
+    with PyPISimple(simple) as client:
+        assert client.endpoint == simple.as_uri() + "/"
+        assert client.get_index_page().projects == ["foo"]
+
+
+def test_local_endpoint_html_only(tmp_path: Path) -> None:
+    make_repo(tmp_path, json_pages=False)
+    with PyPISimple(tmp_path / "simple") as client:
+        assert len(client.get_project_page("foo").packages) == 2
+        with pytest.raises(requests.HTTPError) as excinfo:
+            client.get_project_page("foo", accept=ACCEPT_JSON_ONLY)
+        assert excinfo.value.response is not None
+        assert excinfo.value.response.status_code == 406
+
+
+def test_local_page_cache(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path)
+    with PyPISimple(simple, page_cache=MemoryPageCache()) as client:
+        page = client.get_project_page("foo")
+        assert client.get_project_page("foo") is page
+        # Make the file's modification time later than the cached one.
+        st = (simple / "foo" / "index.json").stat()
+        os.utime(simple / "foo" / "index.json", (st.st_atime, st.st_mtime + 10))
+        assert client.get_project_page("foo") is not page
+
+
+@responses.activate
+def test_remote_endpoint_no_file_access(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path / "repo")
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/foo/",
+        status=302,
+        headers={"Location": (simple / "foo").as_uri() + "/"},
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/simple/bar/",
+        body=(simple / "foo" / "index.html")
+        .read_text()
+        .replace("../../packages/", (tmp_path / "repo" / "packages").as_uri() + "/"),
+        content_type="text/html",
+    )
+    with PyPISimple("https://test.nil/simple/") as client:
+        assert "file://" not in client.s.adapters
+        with pytest.raises(requests.exceptions.InvalidSchema):
+            client.get_project_page("foo")
+        pkg, _ = client.get_project_page("bar").packages
+        assert pkg.url.startswith("file://")
+        dest = tmp_path / "dest" / pkg.filename
+        for hardlink in (False, True):
+            with pytest.raises(requests.exceptions.InvalidSchema):
+                client.download_package(pkg, dest, hardlink=hardlink)
+            assert not dest.exists()
+
+
+def test_session_only_mounted_for_local_endpoint(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path)
+    s = requests.Session()
+    PyPISimple("https://test.nil/simple/", session=s)
+    assert "file://" not in s.adapters
+    with PyPISimple(simple, session=s) as client:
+        assert isinstance(s.adapters["file://"], FileAdapter)
+        assert client.get_index_page().projects == ["foo"]
+
+
+def test_file_adapter_redirect(tmp_path: Path, session: requests.Session) -> None:
+    simple = make_repo(tmp_path)
+    r = session.get(simple.as_uri() + "/foo")
+    assert r.status_code == 200
+    assert r.url == simple.as_uri() + "/foo/"
+    assert r.history[0].status_code == 301
+
+
+def test_file_adapter_ranges(tmp_path: Path, session: requests.Session) -> None:
+    make_repo(tmp_path)
+    path = tmp_path / "packages" / "foo" / "foo-1.0.tar.gz"
+    url = path.as_uri()
+    data = path.read_bytes()
+    r = session.get(url)
+    assert r.status_code == 200
+    assert r.headers["Content-Length"] == str(len(data))
+    assert r.headers["Accept-Ranges"] == "bytes"
+    assert r.content == data
+    r = session.get(url, headers={"Range": "bytes=100-199"})
+    assert r.status_code == 206
+    assert r.headers["Content-Range"] == f"bytes 100-199/{len(data)}"
+    assert r.content == data[100:200]
+    r = session.get(url, headers={"Range": "bytes=-50"})
+    assert r.status_code == 206
+    assert r.content == data[-50:]
+    r = session.get(url, headers={"Range": f"bytes={len(data)}-"})
+    assert r.status_code == 416
+    assert r.headers["Content-Range"] == f"bytes */{len(data)}"
+    r = session.head(url)
+    assert r.status_code == 200
+    assert r.headers["Content-Length"] == str(len(data))
+    assert r.content == b""
+    assert session.post(url).status_code == 405
+    assert session.get(url + ".missing").status_code == 404
+    assert session.get("file://example.com/foo").status_code == 400
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=900-2000", (900, 1000)),
+        ("bytes=-100", (900, 1000)),
+        ("bytes=-2000", (0, 1000)),
+        ("bytes=1000-", "unsatisfiable"),
+        ("bytes=-0", "unsatisfiable"),
+        ("bytes=99-0", None),
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(
+    value: Optional[str], expected: tuple[int, int] | str | None
+) -> None:
+    assert parse_range(value, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "accept,content_type,quality",
+    [
+        (None, "text/html", 1.0),
+        ("text/html;q=0.01", "text/html", 0.01),
+        ("application/json", "text/html", 0.0),
+        ("text/*;q=0.5, text/html;q=0.2", "text/html", 0.2),
+        ("text/*;q=0.5, */*;q=0.1", "text/html", 0.5),
+        ("*/*", "application/vnd.pypi.simple.v1+json", 1.0),
+        ("text/html;q=bad", "text/html", 0.0),
+    ],
+)
+def test_accept_quality(
+    accept: Optional[str], content_type: str, quality: float
+) -> None:
+    assert accept_quality(accept, content_type) == quality
+
+
+def get_package(client: PyPISimple, filename: str) -> DistributionPackage:
+    (pkg,) = [
+        pkg
+        for pkg in client.get_project_page("foo").packages
+        if pkg.filename == filename
+    ]
+    return pkg
+
+
+@pytest.mark.parametrize("hardlink", [False, True])
+def test_download_local(tmp_path: Path, hardlink: bool) -> None:
+    simple = make_repo(tmp_path / "repo")
+    source = tmp_path / "repo" / "packages" / "foo" / "foo-1.0.tar.gz"
+    with PyPISimple(simple) as client:
+        pkg = get_package(client, "foo-1.0.tar.gz")
+        dest = tmp_path / "dest" / pkg.filename
+        client.download_package(pkg, dest, hardlink=hardlink)
+        assert dest.read_bytes() == source.read_bytes()
+        assert os.path.samefile(source, dest) == hardlink
+        # Downloading again over the existing file must not truncate the
+        # repository's copy through a hard link.
+        client.download_package(pkg, dest)
+        assert dest.read_bytes() == source.read_bytes()
+        # Downloading onto the repository's own file leaves it alone.
+        client.download_package(pkg, source)
+        assert source.read_bytes() == bytes(range(256)) * 400
+
+
+@pytest.mark.parametrize("hardlink", [False, True])
+@pytest.mark.parametrize("keep_on_error", [False, True])
+def test_download_local_bad_digest(
+    tmp_path: Path, hardlink: bool, keep_on_error: bool
+) -> None:
+    simple = make_repo(tmp_path / "repo")
+    source = tmp_path / "repo" / "packages" / "foo" / "foo-1.0.tar.gz"
+    with PyPISimple(simple) as client:
+        pkg = get_package(client, "foo-1.0.tar.gz")
+        pkg.digests = {"sha256": "0" * 64}
+        dest = tmp_path / "dest" / pkg.filename
+        with pytest.raises(DigestMismatchError):
+            client.download_package(
+                pkg, dest, hardlink=hardlink, keep_on_error=keep_on_error
+            )
+        assert dest.exists() == keep_on_error
+        assert source.read_bytes() == bytes(range(256)) * 400
+
+
+def test_download_local_other_formats(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path)
+    source = tmp_path / "packages" / "foo" / "foo-1.0.tar.gz"
+    with PyPISimple(simple) as client:
+        pkg = get_package(client, "foo-1.0.tar.gz")
+        assert client.download_package_bytes(pkg) == source.read_bytes()
+        buf = io.BytesIO()
+        client.download_package_fileobj(pkg, buf)
+        assert buf.getvalue() == source.read_bytes()
+        ((_, result),) = client.download_packages([pkg], tmp_path / "dest")
+        assert result == tmp_path / "dest" / pkg.filename
+        assert isinstance(result, Path)
+        assert result.read_bytes() == source.read_bytes()
+
+
+def test_local_wheel_metadata(tmp_path: Path) -> None:
+    simple = make_repo(tmp_path)
+    with PyPISimple(simple) as client:
+        pkg = get_package(client, "foo-1.0-py3-none-any.whl")
+        assert client.get_package_metadata_bytes(pkg) == METADATA
@@ -0,0 +1,364 @@
+from __future__ import annotations
+import hashlib
+from io import BytesIO
+import tarfile
+import zipfile
+from conftest import mkpkg, range_callback
+import pytest
+import requests
+import responses
+from pypi_simple import (
+    DigestMismatchError,
+    DistributionPackage,
+    DownloadTooLargeError,
+    NoDigestsError,
+    NoMetadataError,
+    PyPISimple,
+    parse_metadata,
+)
+
+METADATA = b"""\
+Metadata-Version: 2.1
+Name: foo
+Version: 1.0
+Summary: A package that foos
+Keywords: foo, bar,baz
+Classifier: Programming Language :: Python :: 3
+Classifier: License :: OSI Approved :: MIT License
+Requires-Python: >=3.7
+Requires-Dist: requests (>=2.20)
+Requires-Dist: tomli ; python_version < "3.11"
+Provides-Extra: dev
+Project-URL: Source, https://example.com/foo
+Description-Content-Type: text/markdown
+
+# foo
+
+This is foo.
+"""
+
+
+def test_parse_metadata() -> None:
+    assert parse_metadata(METADATA.decode("utf-8")) == {
+        "metadata_version": "2.1",
+        "name": "foo",
+        "version": "1.0",
+        "summary": "A package that foos",
+        "keywords": ["foo", "bar", "baz"],
+        "classifier": [
+            "Programming Language :: Python :: 3",
+            "License :: OSI Approved :: MIT License",
+        ],
+        "requires_python": ">=3.7",
+        "requires_dist": ["requests (>=2.20)", 'tomli ; python_version < "3.11"'],
+        "provides_extra": ["dev"],
+        "project_url": ["Source, https://example.com/foo"],
+        "description_content_type": "text/markdown",
+        "description": "# foo\n\nThis is foo.\n",
+    }
+
+
+def test_parse_metadata_no_body() -> None:
+    assert parse_metadata("Metadata-Version: 1.0\nName: foo\nVersion: 1.0\n") == {
+        "metadata_version": "1.0",
+        "name": "foo",
+        "version": "1.0",
+    }
+
+
+GOOD_SHA256 = hashlib.sha256(METADATA).hexdigest()
+
+
+@responses.activate
+def test_get_package_metadata() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0-py3-none-any.whl.metadata",
+        body=METADATA,
+    )
+    # Parsed metadata is cached by the package's SHA256 digest, so the
+    # package needs one.
+    pkg = mkpkg(
+        "foo-1.0-py3-none-any.whl",
+        b"wheel",
+        metadata_digests={"sha256": GOOD_SHA256},
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.get_package_metadata_bytes(pkg) == METADATA
+        md = simple.get_package_metadata(pkg)
+        assert md["name"] == "foo"
+        assert md["requires_dist"] == [
+            "requests (>=2.20)",
+            'tomli ; python_version < "3.11"',
+        ]
+        assert len(responses.calls) == 2
+        md["requires_dist"].append("mutated")
+        assert simple.get_package_metadata(pkg) == parse_metadata(
+            METADATA.decode("utf-8")
+        )
+        assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_package_metadata_errors() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0-py3-none-any.whl.metadata",
+        body=METADATA,
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz.metadata",
+        status=404,
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0-py2-none-any.whl.metadata",
+        status=500,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(DigestMismatchError):
+            simple.get_package_metadata(
+                mkpkg("foo-1.0-py3-none-any.whl", metadata_digests={"sha256": "0" * 64})
+            )
+        with pytest.raises(NoDigestsError):
+            simple.get_package_metadata(
+                mkpkg("foo-1.0-py3-none-any.whl", metadata_digests={})
+            )
+        md = simple.get_package_metadata(
+            mkpkg("foo-1.0-py3-none-any.whl", metadata_digests={}), verify=False
+        )
+        assert md["version"] == "1.0"
+        with pytest.raises(NoMetadataError) as excinfo:
+            simple.get_package_metadata(
+                mkpkg("foo-1.0.tar.gz", metadata_digests={"sha256": GOOD_SHA256})
+            )
+        assert str(excinfo.value) == "No distribution metadata found for foo-1.0.tar.gz"
+        with pytest.raises(requests.HTTPError):
+            simple.get_package_metadata(
+                mkpkg(
+                    "foo-1.0-py2-none-any.whl", metadata_digests={"sha256": GOOD_SHA256}
+                )
+            )
+
+
+@responses.activate
+def test_get_packages_metadata() -> None:
+    good = [f"foo-1.{i}-py3-none-any.whl" for i in range(5)]
+    for filename in good:
+        responses.add(
+            method=responses.GET,
+            url=f"https://test.nil/packages/{filename}.metadata",
+            body=METADATA,
+        )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/missing-1.0.tar.gz.metadata",
+        status=404,
+    )
+    pkgs = [mkpkg(fn, metadata_digests={"sha256": GOOD_SHA256}) for fn in good]
+    pkgs.append(mkpkg("missing-1.0.tar.gz", metadata_digests={"sha256": GOOD_SHA256}))
+    with PyPISimple("https://test.nil/simple/") as simple:
+        results = {
+            pkg.filename: r
+            for pkg, r in simple.get_packages_metadata(pkgs, max_workers=3)
+        }
+    assert results.keys() == {pkg.filename for pkg in pkgs}
+    for filename in good:
+        md = results[filename]
+        assert isinstance(md, dict)
+        assert md["name"] == "foo"
+    assert isinstance(results["missing-1.0.tar.gz"], NoMetadataError)
+
+
+def make_wheel(padding: int) -> bytes:
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("foo/__init__.py", "")
+        # Incompressible filler, stored, to make the wheel large
+        zf.writestr(
+            "foo/data.bin",
+            hashlib.shake_256(b"filler").digest(padding),
+            compress_type=zipfile.ZIP_STORED,
+        )
+        zf.writestr(
+            "foo-1.0.dist-info/METADATA",
+            METADATA,
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        zf.writestr("foo-1.0.dist-info/RECORD", "")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("padding", [0, 1 << 20])
+@responses.activate
+def test_get_package_metadata_range_fallback(padding: int) -> None:
+    wheel = make_wheel(padding)
+    served: list[int] = []
+    responses.add_callback(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0-py3-none-any.whl",
+        callback=range_callback(wheel, served),
+    )
+    pkg = DistributionPackage(
+        filename="foo-1.0-py3-none-any.whl",
+        project="foo",
+        version="1.0",
+        package_type="wheel",
+        url="https://test.nil/packages/foo-1.0-py3-none-any.whl",
+        digests={"sha256": hashlib.sha256(wheel).hexdigest()},
+        requires_python=None,
+        has_sig=None,
+        has_metadata=None,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.get_package_metadata_bytes(pkg) == METADATA
+        assert simple.get_package_metadata(pkg)["name"] == "foo"
+        with pytest.raises(NoDigestsError):
+            simple.get_package_metadata_bytes(pkg, range_fallback=False)
+    assert sum(served) < 2 * len(wheel) + 200_000
+    if padding:
+        assert max(served) < 100_000
+
+
+@responses.activate
+def test_get_package_metadata_range_unsupported() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0-py3-none-any.whl",
+        body=make_wheel(0),
+    )
+    pkg = mkpkg("foo-1.0-py3-none-any.whl", metadata_digests={})
+    pkg.has_metadata = False
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(ValueError) as excinfo:
+            simple.get_package_metadata_bytes(pkg)
+    assert str(excinfo.value) == (
+        "Server did not honor range request for"
+        " https://test.nil/packages/foo-1.0-py3-none-any.whl"
+    )
+
+
+FILLER = hashlib.shake_256(b"filler").digest(1 << 20)
+
+
+def make_tar(members: list[tuple[str, bytes]], mode: str = "w:gz") -> bytes:
+    buf = BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tf:  # type: ignore[call-overload]
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize(
+    "filename,mode",
+    [
+        ("foo-1.0.tar.gz", "w:gz"),
+        ("foo-1.0.tar.bz2", "w:bz2"),
+        ("foo-1.0.tar", "w"),
+    ],
+)
+@responses.activate
+def test_get_sdist_pkg_info_tar(filename: str, mode: str) -> None:
+    body = make_tar(
+        [
+            ("foo-1.0/PKG-INFO", METADATA),
+            ("foo-1.0/foo.egg-info/PKG-INFO", b"wrong"),
+            ("foo-1.0/filler.bin", FILLER),
+        ],
+        mode,
+    )
+    # Cut the archive off near the end of the filler; reading past PKG-INFO
+    # to the end would fail.
+    responses.add(
+        method=responses.GET,
+        url=f"https://test.nil/packages/{filename}",
+        body=body[:-1000],
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.get_sdist_pkg_info_bytes(mkpkg(filename)) == METADATA
+
+
+@responses.activate
+def test_get_sdist_pkg_info_egg_info_only() -> None:
+    body = make_tar(
+        [
+            ("./foo-1.0/setup.py", b""),
+            ("./foo-1.0/src/foo.egg-info/PKG-INFO", METADATA),
+            ("./foo-1.0/src/foo/PKG-INFO", b"not metadata"),
+        ]
+    )
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=body,
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.get_sdist_pkg_info_bytes(mkpkg("foo-1.0.tar.gz")) == METADATA
+
+
+@responses.activate
+def test_get_sdist_pkg_info_missing() -> None:
+    responses.add(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.tar.gz",
+        body=make_tar([("foo-1.0/setup.py", b"")]),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(NoMetadataError):
+            simple.get_sdist_pkg_info_bytes(mkpkg("foo-1.0.tar.gz"))
+
+
+@responses.activate
+def test_get_sdist_pkg_info_zip() -> None:
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("foo-1.0/filler.bin", FILLER, compress_type=zipfile.ZIP_STORED)
+        zf.writestr("foo-1.0/foo.egg-info/PKG-INFO", b"wrong")
+        zf.writestr("foo-1.0/PKG-INFO", METADATA)
+    body = buf.getvalue()
+    served: list[int] = []
+    responses.add_callback(
+        method=responses.GET,
+        url="https://test.nil/packages/foo-1.0.zip",
+        callback=range_callback(body, served),
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        assert simple.get_sdist_pkg_info_bytes(mkpkg("foo-1.0.zip")) == METADATA
+    assert sum(served) < len(FILLER) // 4
+
+
+@pytest.mark.parametrize("filename", ["foo-1.0.tar.gz", "foo-1.0.zip"])
+@responses.activate
+def test_get_sdist_pkg_info_too_large(filename: str) -> None:
+    members = [("foo-1.0/PKG-INFO", FILLER + b"x")]
+    if filename.endswith(".zip"):
+        buf = BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for name, data in members:
+                zf.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED)
+        body = buf.getvalue()
+        responses.add_callback(
+            method=responses.GET,
+            url=f"https://test.nil/packages/{filename}",
+            callback=range_callback(body, []),
+        )
+    else:
+        responses.add(
+            method=responses.GET,
+            url=f"https://test.nil/packages/{filename}",
+            body=make_tar(members),
+        )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(DownloadTooLargeError) as excinfo:
+            simple.get_sdist_pkg_info_bytes(mkpkg(filename))
+    assert excinfo.value.max_size == 1 << 20
+
+
+def test_get_sdist_pkg_info_not_sdist() -> None:
+    with PyPISimple("https://test.nil/simple/") as simple:
+        with pytest.raises(ValueError) as excinfo:
+            simple.get_sdist_pkg_info_bytes(mkpkg("foo-1.0-py3-none-any.whl"))
+    assert str(excinfo.value) == "foo-1.0-py3-none-any.whl is not an sdist"
@@ -0,0 +1,171 @@
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+import responses
+from pypi_simple import Mirror, ProjectPage, PyPISimple, SyncReport
+
+
+def file_entry(filename: str, body: bytes, **kwargs: Any) -> dict[str, Any]:
+    return {
+        "filename": filename,
+        "url": f"https://files.test.nil/{filename}",
+        "hashes": {"sha256": hashlib.sha256(body).hexdigest()},
+        **kwargs,
+    }
+
+
+def add_project(name: str, serial: str, files: dict[str, bytes], **kwargs: Any) -> None:
+    responses.add(
+        method=responses.GET,
+        url=f"https://test.nil/simple/{name}/",
+        json={
+            "meta": {"api-version": "1.0"},
+            "name": name,
+            "files": [
+                file_entry(fn, body, **kwargs.get(fn, {})) for fn, body in files.items()
+            ],
+        },
+        content_type="application/vnd.pypi.simple.v1+json",
+        headers={"X-PyPI-Last-Serial": serial},
+    )
+    for fn, body in files.items():
+        responses.add(
+            method=responses.GET, url=f"https://files.test.nil/{fn}", body=body
+        )
+
+
+def downloads() -> list[str]:
+    return sorted(
+        c.request.url
+        for c in responses.calls
+        if c.request.url is not None and c.request.url.startswith("https://files.")
+    )
+
+
+@responses.activate
+def test_mirror_sync(tmp_path: Path) -> None:
+    add_project(
+        "foo",
+        "10",
+        {"foo-1.0.tar.gz": b"foo 1.0", "foo-1.0-py3-none-any.whl": b"wheel"},
+        **{"foo-1.0.tar.gz": {"yanked": "Broken", "requires-python": ">=3.7"}},
+    )
+    add_project("bar", "20", {"bar-2.0.tar.gz": b"bar 2.0"})
+    responses.add(
+        method=responses.GET, url="https://test.nil/simple/missing/", status=404
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        mirror = Mirror(simple, tmp_path, max_workers=3)
+        report = mirror.sync(["Foo", "bar", "missing"])
+    assert sorted(report.updated) == ["bar", "foo"]
+    assert report.unchanged == []
+    assert list(report.failed) == ["missing"]
+    assert report.downloaded == 3
+    assert (tmp_path / "packages" / "foo" / "foo-1.0.tar.gz").read_bytes() == (
+        b"foo 1.0"
+    )
+    assert mirror.get_serial("FOO") == "10"
+    index = json.loads((tmp_path / "simple" / "index.json").read_text())
+    assert index["projects"] == [{"name": "bar"}, {"name": "foo"}]
+    # The mirrored pages parse back to the same packages, pointing at the
+    # local files.
+    html = (tmp_path / "simple" / "foo" / "index.html").read_text()
+    page = ProjectPage.from_html("foo", html, base_url="https://mirror.nil/simple/foo/")
+    jpage = ProjectPage.from_json_data(
+        json.loads((tmp_path / "simple" / "foo" / "index.json").read_text()),
+        base_url="https://mirror.nil/simple/foo/",
+    )
+    for p in (page, jpage):
+        assert [pkg.url for pkg in p.packages] == [
+            "https://mirror.nil/packages/foo/foo-1.0.tar.gz",
+            "https://mirror.nil/packages/foo/foo-1.0-py3-none-any.whl",
+        ]
+        assert p.packages[0].is_yanked
+        assert p.packages[0].yanked_reason == "Broken"
+        assert p.packages[0].requires_python == ">=3.7"
+        assert p.packages[0].digests == {
+            "sha256": hashlib.sha256(b"foo 1.0").hexdigest()
+        }
+        assert not p.packages[1].is_yanked
+
+
+@responses.activate
+def test_mirror_resync(tmp_path: Path) -> None:
+    add_project("foo", "10", {"foo-1.0.tar.gz": b"foo 1.0"})
+    add_project("bar", "20", {"bar-1.0.tar.gz": b"bar 1.0"})
+    with PyPISimple("https://test.nil/simple/") as simple:
+        mirror = Mirror(simple, tmp_path)
+        mirror.sync(["foo", "bar"])
+        responses.calls.reset()
+        # Unchanged serials with a serials map: nothing is fetched
+        report = mirror.sync(["foo", "bar"], serials={"foo": "10", "bar": "20"})
+        assert report == SyncReport(unchanged=["foo", "bar"])
+        assert len(responses.calls) == 0
+        # Without a serials map, pages are fetched but nothing is rewritten
+        report = mirror.sync(["foo", "bar"])
+        assert sorted(report.unchanged) == ["bar", "foo"]
+        assert downloads() == []
+        # A new release removes an old file and adds a new one
+        responses.calls.reset()
+        responses.replace(
+            responses.GET,
+            "https://test.nil/simple/foo/",
+            json={
+                "meta": {"api-version": "1.0"},
+                "name": "foo",
+                "files": [file_entry("foo-2.0.tar.gz", b"foo 2.0")],
+            },
+            content_type="application/vnd.pypi.simple.v1+json",
+            headers={"X-PyPI-Last-Serial": "11"},
+        )
+        responses.add(
+            method=responses.GET,
+            url="https://files.test.nil/foo-2.0.tar.gz",
+            body=b"foo 2.0",
+        )
+        report = mirror.sync(["foo", "bar"], serials={"foo": "11", "bar": "20"})
+    assert report == SyncReport(updated=["foo"], unchanged=["bar"], downloaded=1)
+    assert downloads() == ["https://files.test.nil/foo-2.0.tar.gz"]
+    assert sorted(p.name for p in (tmp_path / "packages" / "foo").iterdir()) == [
+        "foo-2.0.tar.gz"
+    ]
+    assert mirror.get_serial("foo") == "11"
+
+
+@responses.activate
+def test_mirror_failed_download(tmp_path: Path) -> None:
+    add_project("foo", "10", {"foo-1.0.tar.gz": b"foo 1.0"})
+    responses.replace(
+        responses.GET, "https://files.test.nil/foo-1.0.tar.gz", body=b"corrupt"
+    )
+    with PyPISimple("https://test.nil/simple/") as simple:
+        mirror = Mirror(simple, tmp_path)
+        report = mirror.sync(["foo"])
+    assert list(report.failed) == ["foo"]
+    assert report.updated == []
+    assert mirror.get_serial("foo") is None
+    assert not (tmp_path / "simple" / "foo").exists()
+    assert not (tmp_path / "packages" / "foo" / "foo-1.0.tar.gz").exists()
+    assert (
+        json.loads((tmp_path / "simple" / "index.json").read_text())["projects"] == []
+    )
+
+
+@responses.activate
+def test_mirror_truncated_file(tmp_path: Path) -> None:
+    add_project("foo", "10", {"foo-1.0.tar.gz": b"foo 1.0"})
+    # A file left behind by an interrupted download is not trusted.
+    (tmp_path / "packages" / "foo").mkdir(parents=True)
+    (tmp_path / "packages" / "foo" / "foo-1.0.tar.gz").write_bytes(b"foo")
+    with PyPISimple("https://test.nil/simple/") as simple:
+        mirror = Mirror(simple, tmp_path)
+        report = mirror.sync(["foo"])
+    assert report == SyncReport(updated=["foo"], downloaded=1)
+    assert (tmp_path / "packages" / "foo" / "foo-1.0.tar.gz").read_bytes() == (
+        b"foo 1.0"
+    )
+    assert sorted(p.name for p in (tmp_path / "packages" / "foo").iterdir()) == [
+        "foo-1.0.tar.gz"
+    ]
@@ -1,6 +1,13 @@
 from __future__ import annotations
+from typing import Optional
 import pytest
-from pypi_simple import UnparsableFilenameError, parse_filename
+from pypi_simple import (
+    ParsedFilenames,
+    UnparsableFilenameError,
+    parse_filename,
+    parse_filenames,
+)
+from pypi_simple.filenames import project_hint_regex
 
 #: Filenames that can be parsed correctly with or without a ``project_hint``
 SIMPLE_FILENAMES = [
@@ -428,3 +435,65 @@ def test_unparsable_filename_project_hint(filename: str, project_hint: str) -> N
         parse_filename(filename, project_hint=project_hint)
     assert excinfo.value.filename == filename
     assert str(excinfo.value) == f"Cannot parse package filename: {filename!r}"
+
+
+def test_project_hint_regex_cache() -> None:
+    project_hint_regex.cache_clear()
+    for filename in ["foo-bar-1.0.tar.gz", "foo-bar-1.1.tar.gz", "foo-bar-1.2.zip"]:
+        assert parse_filename(filename, "Foo.Bar")[0] == "foo-bar"
+    info = project_hint_regex.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert project_hint_regex("Foo.Bar").match("FOO_bar-1.0.tar.gz")
+    assert not project_hint_regex("Foo.Bar").match("foo-bar.tar.gz")
+
+
+def test_parse_filenames() -> None:
+    cases: list[tuple[str, Optional[str]]] = [
+        (filename, None) for filename, _, _ in SIMPLE_FILENAMES
+    ]
+    cases.extend((filename, hint) for filename, hint, _ in SIMPLE_FILENAMES)
+    cases.extend(INVALID_FILENAMES)
+    cases.extend((filename, None) for filename, _ in INVALID_FILENAMES)
+    cases.extend(
+        [
+            ("foo-1.0.tar.gz\n", None),
+            ("foo-1.0.exe", None),
+            ("foo", None),
+            ("", None),
+            (".whl", None),
+        ]
+    )
+    for filename, hint in cases:
+        parsed = parse_filenames([filename], hint)
+        assert len(parsed) == 1
+        try:
+            expected = parse_filename(filename, hint)
+        except UnparsableFilenameError:
+            assert parsed[0] is None
+            assert parsed.projects == parsed.versions == parsed.package_types == [None]
+        else:
+            assert parsed[0] == expected
+
+
+def test_parse_filenames_columns() -> None:
+    parsed = parse_filenames(
+        [
+            "walt-node-0.4-1.tar.gz",
+            "not-a-package.txt",
+            "walt_node-0.5-py3-none-any.whl",
+        ],
+        project_hint="walt.node",
+    )
+    assert parsed == ParsedFilenames(
+        filenames=[
+            "walt-node-0.4-1.tar.gz",
+            "not-a-package.txt",
+            "walt_node-0.5-py3-none-any.whl",
+        ],
+        projects=["walt-node", None, "walt_node"],
+        versions=["0.4-1", None, "0.5"],
+        package_types=["sdist", None, "wheel"],
+    )
+    assert parsed[1] is None
+    assert parsed[2] == ("walt_node", "0.5", "wheel")
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import json
+from typing import Any
+import pytest
+from pypi_simple import UnexpectedRepoVersionWarning, UnsupportedRepoVersionError
+from pypi_simple.json_stream import parse_project_names_stream
+
+
+def chunked(s: str, size: int) -> list[str]:
+    return [s[i : i + size] for i in range(0, len(s), size)]
+
+
+@pytest.mark.parametrize(
+    "doc,names",
+    [
+        (
+            {
+                "meta": {"_last-serial": 14267765, "api-version": "1.0"},
+                "projects": [{"name": "argset"}, {"name": "banana"}],
+            },
+            ["argset", "banana"],
+        ),
+        (
+            {
+                "projects": [
+                    {"name": "argset", "extra": [1, 2.5, None, True]},
+                    {"name": 'Bänänä \\ "quoted"'},
+                ],
+                "other": 12345,
+                "meta": {"api-version": "1.0"},
+            },
+            ["argset", 'Bänänä \\ "quoted"'],
+        ),
+        ({"meta": {"api-version": "1.0"}, "projects": []}, []),
+    ],
+)
+@pytest.mark.parametrize("size", [1, 2, 7, 65535])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parse_project_names_stream(
+    doc: Any, names: list[str], size: int, indent: int | None
+) -> None:
+    s = json.dumps(doc, indent=indent)
+    assert list(parse_project_names_stream(chunked(s, size))) == names
+    b = s.encode("utf-8")
+    bchunks = [b[i : i + size] for i in range(0, len(b), size)]
+    assert list(parse_project_names_stream(bchunks)) == names
+
+
+def test_parse_project_names_stream_incremental() -> None:
+    pieces = [
+        '{"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}, ',
+        '{"name": "bar"}, {"na',
+        'me": "baz"}]}',
+    ]
+    names = parse_project_names_stream(iter(pieces))
+    assert next(names) == "foo"
+    assert next(names) == "bar"
+    assert list(names) == ["baz"]
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "",
+        "[]",
+        '{"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}]',
+        '{"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"}]} x',
+        '{"meta": {"api-version": "1.0"}, "projects": [{"name": 42}]}',
+        '{"meta": {"api-version": "1.0"}, "projects": ["foo"]}',
+        '{"meta": {"api-version": "1.0"}, "projects": [{"name": "foo"},]}',
+        '{"projects": [{"name": "foo"}]}',
+        '{"meta": {}, "projects": [{"name": "foo"}]}',
+        '{"meta": {"api-version": "1.0"} "projects": []}',
+    ],
+)
+def test_parse_project_names_stream_invalid(s: str) -> None:
+    with pytest.raises(ValueError):
+        list(parse_project_names_stream(chunked(s, 3)))
+
+
+def test_parse_project_names_stream_unsupported_version() -> None:
+    s = '{"meta": {"api-version": "42.0"}, "projects": [{"name": "foo"}]}'
+    names = parse_project_names_stream([s])
+    with pytest.raises(UnsupportedRepoVersionError):
+        next(names)
+
+
+def test_parse_project_names_stream_unexpected_version() -> None:
+    s = '{"meta": {"api-version": "1.42"}, "projects": [{"name": "foo"}]}'
+    with pytest.warns(UnexpectedRepoVersionWarning):
+        assert list(parse_project_names_stream([s])) == ["foo"]
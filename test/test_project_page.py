@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from typing import Any
 import pytest
 from pypi_simple import (
     PYPI_SIMPLE_ENDPOINT,
@@ -539,11 +540,17 @@ def test_from_html_empty() -> None:
         ),
     ],
 )
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
 def test_from_html(
-    project: str, filename: str, base_url: str, encoding: str, page: ProjectPage
+    project: str,
+    filename: str,
+    base_url: str,
+    encoding: str,
+    page: ProjectPage,
+    parser: str,
 ) -> None:
     html = (DATA_DIR / filename).read_bytes()
-    assert ProjectPage.from_html(project, html, base_url, encoding) == page
+    assert ProjectPage.from_html(project, html, base_url, encoding, parser) == page
 
 
 def test_from_html_unsupported_version() -> None:
@@ -674,10 +681,11 @@ def test_from_json_data_empty() -> None:
         ),
     ],
 )
-def test_from_json_data(filename: str, page: ProjectPage) -> None:
+@pytest.mark.parametrize("use_pydantic", [False, True])
+def test_from_json_data(filename: str, page: ProjectPage, use_pydantic: bool) -> None:
     with (DATA_DIR / filename).open() as fp:
         data = json.load(fp)
-    assert ProjectPage.from_json_data(data) == page
+    assert ProjectPage.from_json_data(data, use_pydantic=use_pydantic) == page
 
 
 def test_from_json_data_relative_urls() -> None:
@@ -741,3 +749,38 @@ def test_from_json_data_unsupported_version() -> None:
         "Repository's version (42.0) has greater major component than"
         f" supported version ({SUPPORTED_REPOSITORY_VERSION})"
     )
+
+
+@pytest.mark.parametrize(
+    "data,msg",
+    [
+        (42, "project: value is not a valid dict"),
+        ({"files": [], "meta": {"api-version": "1.0"}}, "name: field required"),
+        (
+            {"name": "foo", "files": {}, "meta": {"api-version": "1.0"}},
+            "files: value is not a valid list",
+        ),
+        ({"name": "foo", "files": []}, "meta: field required"),
+        (
+            {"name": "foo", "files": [], "meta": {"_last-serial": 1}},
+            "meta.api-version: field required",
+        ),
+        (
+            {
+                "name": "foo",
+                "files": [
+                    {"filename": "foo-1.0.tar.gz", "url": "foo-1.0.tar.gz", "hashes": {}},
+                    {"filename": "foo-1.1.tar.gz", "url": "foo-1.1.tar.gz"},
+                ],
+                "meta": {"api-version": "1.0"},
+            },
+            "files.1.hashes: field required",
+        ),
+    ],
+)
+def test_from_json_data_invalid(data: Any, msg: str) -> None:
+    with pytest.raises(ValueError) as excinfo:
+        ProjectPage.from_json_data(data)
+    assert str(excinfo.value) == msg
+    with pytest.raises(ValueError):
+        ProjectPage.from_json_data(data, use_pydantic=True)
@@ -495,11 +495,49 @@ from pypi_simple import (
         ),
     ],
 )
-def test_from_html(html: str, base_url: Optional[str], page: RepositoryPage) -> None:
-    assert RepositoryPage.from_html(html, base_url) == page
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
+def test_from_html(
+    html: str, base_url: Optional[str], page: RepositoryPage, parser: str
+) -> None:
+    assert RepositoryPage.from_html(html, base_url, parser=parser) == page
 
 
-def test_from_html_unsupported_version() -> None:
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<a href="x" class="foo  bar" rel="" rev="a b" id="c d">text</a>',
+        '<a href="outer">one<a href="inner">two</a>three</a><a href=last/>',
+        '<a href="x">unclosed <b>bold <a href="y">nested',
+        '<a href="x">one</a><base href="https://test.nil/base/"><a href="y">two</a>',
+        '<base><base href="/a/"><base href="/b/"><a href="x">x</a>',
+        '<a>no href</a><a href>empty href</a><a href="x" href="y">dupe</a>',
+        '<a href="x">char &amp; entity &#x80; refs</a><!-- comment -->',
+        '<meta name="other" content="2.0"><meta name="pypi:repository-version">'
+        '<meta name="pypi:repository-version" content="1.0">'
+        '<meta name="pypi:repository-version" content="99.0">',
+        '<p><a href="x">in para</p> after</a> <br/></br>',
+        b'<meta charset="latin-2"><a href="\xe1">\xe1\xbe</a>',
+        b'<a href="\xc3\xa1">\xc3\xa1</a>',
+        b'\xef\xbb\xbf<a href="x">bom</a>',
+        '<a href="x"><script>foo</script>t</a>',
+        '<a href="x"><style>s</style>t<template>tt<b>q</b></template>u</a>',
+        '<a href="x"><template><script>z</script>w</template>v</a>',
+    ],
+)
+@pytest.mark.parametrize("base_url", [None, "https://test.nil/simple/"])
+def test_from_html_fast_matches_bs4(html: str | bytes, base_url: Optional[str]) -> None:
+    fast = RepositoryPage.from_html(html, base_url, parser="fast")
+    assert fast == RepositoryPage.from_html(html, base_url, parser="bs4")
+
+
+def test_from_html_bad_parser() -> None:
+    with pytest.raises(ValueError) as excinfo:
+        RepositoryPage.from_html("<a href='x'>x</a>", parser="lxml")
+    assert str(excinfo.value) == "Unknown HTML parser: 'lxml'"
+
+
+@pytest.mark.parametrize("parser", ["bs4", "fast"])
+def test_from_html_unsupported_version(parser: str) -> None:
     with pytest.raises(UnsupportedRepoVersionError) as excinfo:
         RepositoryPage.from_html(
             """
@@ -514,7 +552,8 @@ def test_from_html_unsupported_version() -> None:
             <span href="zero.html">not-a-link</span>
             </body>
             </html>
-        """
+        """,
+            parser=parser,
         )
     assert excinfo.value.declared_version == "42.0"
     assert excinfo.value.supported_version == SUPPORTED_REPOSITORY_VERSION
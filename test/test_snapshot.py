@@ -0,0 +1,98 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import json
+from pathlib import Path
+import pytest
+from pypi_simple import IndexPage, IndexSnapshot, SnapshotDiff, snapshot
+from pypi_simple.snapshot import sort_projects
+
+
+@pytest.fixture(autouse=True, params=[None, 2])
+def run_size(monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest) -> None:
+    # Run every test both with the names sorted entirely in memory and with
+    # them spilled to disk in tiny runs
+    if request.param is not None:
+        monkeypatch.setattr(snapshot, "SORT_RUN_SIZE", request.param)
+
+
+def test_snapshot_roundtrip(tmp_path: Path) -> None:
+    page = IndexPage(
+        projects=["Zope", "aardvark", "Foo_Bar", "foo-bar", "baz"],
+        repository_version="1.0",
+        last_serial="42",
+    )
+    path = tmp_path / "snapshots" / "index.txt"
+    snap = IndexSnapshot.from_page(path, page)
+    assert snap.last_serial == "42"
+    assert list(snap) == ["aardvark", "baz", "Foo_Bar", "Zope"]
+    loaded = IndexSnapshot.load(path)
+    assert loaded == snap
+    assert path.read_text(encoding="utf-8").splitlines()[0] == json.dumps(
+        {"last_serial": "42", "repository_version": "1.0"}
+    )
+
+
+def test_snapshot_diff(tmp_path: Path) -> None:
+    path = tmp_path / "index.txt"
+    snap = IndexSnapshot.write(path, ["alpha", "beta", "delta", "omega"], "1")
+    diff = snap.diff(iter(["Beta", "gamma", "Alpha", "zeta", "epsilon"]))
+    assert diff == SnapshotDiff(
+        added=["epsilon", "gamma", "zeta"], removed=["delta", "omega"]
+    )
+    assert diff
+    assert not snap.diff(["omega", "delta", "beta", "alpha"])
+    assert list(snap) == ["alpha", "beta", "delta", "omega"]
+
+
+def test_snapshot_diff_empty(tmp_path: Path) -> None:
+    snap = IndexSnapshot.write(tmp_path / "index.txt", [])
+    assert list(snap) == []
+    assert snap.diff(["foo"]) == SnapshotDiff(added=["foo"], removed=[])
+    snap = IndexSnapshot.write(tmp_path / "index.txt", ["foo"])
+    assert snap.diff([]) == SnapshotDiff(added=[], removed=["foo"])
+
+
+def test_snapshot_update(tmp_path: Path) -> None:
+    path = tmp_path / "index.txt"
+    snap = IndexSnapshot.write(path, ["alpha", "beta", "delta"], "1", "1.0")
+    diff = snap.update(["alpha", "Delta", "gamma"], "2", "1.1")
+    assert diff == SnapshotDiff(added=["gamma"], removed=["beta"])
+    assert snap.last_serial == "2"
+    assert snap.repository_version == "1.1"
+    assert IndexSnapshot.load(path) == snap
+    assert list(snap) == ["alpha", "Delta", "gamma"]
+    assert [p.name for p in tmp_path.iterdir()] == ["index.txt"]
+
+
+def test_snapshot_update_error(tmp_path: Path) -> None:
+    path = tmp_path / "index.txt"
+    snap = IndexSnapshot.write(path, ["alpha", "beta"], "1")
+
+    def projects() -> Iterator[str]:
+        yield "gamma"
+        raise RuntimeError("Network failure")
+
+    with pytest.raises(RuntimeError):
+        snap.update(projects(), "2")
+    assert IndexSnapshot.load(path).last_serial == "1"
+    assert list(snap) == ["alpha", "beta"]
+    assert [p.name for p in tmp_path.iterdir()] == ["index.txt"]
+
+
+def test_snapshot_load_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "index.txt"
+    path.write_text("alpha\nbeta\n", encoding="utf-8")
+    with pytest.raises(ValueError) as excinfo:
+        IndexSnapshot.load(path)
+    assert str(excinfo.value) == f"{path}: invalid snapshot header"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 100])
+def test_sort_projects(size: int) -> None:
+    names = ["Zope", "foo-bar", "aardvark", "Foo_Bar", "baz", "FOO.BAR", "zope"]
+    assert list(sort_projects(names, run_size=size)) == [
+        ("aardvark", "aardvark"),
+        ("baz", "baz"),
+        ("foo-bar", "foo-bar"),
+        ("zope", "Zope"),
+    ]
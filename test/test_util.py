@@ -1,6 +1,18 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import errno
+import os
+from pathlib import Path
+from typing import Optional
 import pytest
 from pypi_simple import UnexpectedRepoVersionWarning
-from pypi_simple.util import check_repo_version
+from pypi_simple.util import (
+    check_repo_version,
+    copy_file_data,
+    parse_content_range,
+    pipeline,
+    preallocate,
+)
 
 
 def test_check_repo_version_greater_minor() -> None:
@@ -11,3 +23,110 @@ def test_check_repo_version_greater_minor() -> None:
         "Repository's version (1.3) has greater minor component than supported"
         " version (1.2)"
     )
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("bytes 0-99/1000", (0, 99, 1000)),
+        ("bytes 100-199/*", (100, 199, None)),
+        ("bytes */1000", (None, None, 1000)),
+        ("bytes 0-99", None),
+        ("items 0-99/1000", None),
+        (None, None),
+    ],
+)
+def test_parse_content_range(
+    value: Optional[str], expected: Optional[tuple[Optional[int], ...]]
+) -> None:
+    assert parse_content_range(value) == expected
+
+
+def test_pipeline() -> None:
+    chunks = [bytes([i]) * 100 for i in range(50)]
+    a: list[bytes] = []
+    b: list[bytes] = []
+    pipeline(iter(chunks), a.append, b.append)
+    assert a == chunks
+    assert b == chunks
+
+
+def test_pipeline_sink_error() -> None:
+    received: list[bytes] = []
+
+    def failing(chunk: bytes) -> None:
+        if len(received) == 3:
+            raise RuntimeError("Sink failed")
+        received.append(chunk)
+
+    with pytest.raises(RuntimeError, match="^Sink failed$"):
+        pipeline((b"x" for _ in range(1000)), failing, lambda _: None)
+    assert len(received) == 3
+
+
+def test_pipeline_producer_error() -> None:
+    received: list[bytes] = []
+
+    def chunks() -> Iterator[bytes]:
+        yield b"a"
+        yield b"b"
+        raise OSError("Connection reset")
+
+    with pytest.raises(OSError, match="^Connection reset$"):
+        pipeline(chunks(), received.append)
+    assert received == [b"a", b"b"]
+
+
+def test_preallocate(tmp_path: Path) -> None:
+    path = tmp_path / "file.dat"
+    with path.open("wb") as fp:
+        fp.write(b"abc")
+        allocated = preallocate(fp, 1000)
+        assert fp.tell() == 3
+    if not hasattr(os, "posix_fallocate"):
+        assert not allocated
+    assert path.stat().st_size == (1003 if allocated else 3)
+    assert path.read_bytes()[:3] == b"abc"
+
+
+@pytest.mark.parametrize(
+    "disabled", [(), ("copy_file_range",), ("copy_file_range", "sendfile")]
+)
+def test_copy_file_data(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, disabled: tuple[str, ...]
+) -> None:
+    for name in disabled:
+        monkeypatch.delattr(os, name, raising=False)
+    data = bytes(range(256)) * 1000
+    src = tmp_path / "src.dat"
+    src.write_bytes(data)
+    dest = tmp_path / "dest.dat"
+    updates: list[int] = []
+    with src.open("rb") as infp, dest.open("wb") as outfp:
+        infp.seek(1000)
+        outfp.write(b"header")
+        assert copy_file_data(infp, outfp, updates.append, chunk_size=100000) == (
+            len(data) - 1000
+        )
+        assert infp.tell() == len(data)
+        assert outfp.tell() == len(data) - 1000 + 6
+        outfp.write(b"trailer")
+    assert dest.read_bytes() == b"header" + data[1000:] + b"trailer"
+    assert sum(updates) == len(data) - 1000
+    assert all(0 < n <= 100000 for n in updates)
+
+
+def test_copy_file_data_unsupported(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def unsupported(*_args: object) -> int:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+    src = tmp_path / "src.dat"
+    src.write_bytes(b"0123456789")
+    dest = tmp_path / "dest.dat"
+    with src.open("rb") as infp, dest.open("wb") as outfp:
+        assert copy_file_data(infp, outfp) == 10
+    assert dest.read_bytes() == b"0123456789"